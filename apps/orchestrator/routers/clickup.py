@@ -13,9 +13,13 @@ from __future__ import annotations
 
 import hashlib
 import hmac
+import json
 import os
+import string
 import time
 from collections import OrderedDict
+from collections.abc import Callable
+from functools import lru_cache
 from typing import Any
 
 import httpx
@@ -52,27 +56,41 @@ def _parse_int_env(key: str, default: int) -> int:
 # In production with multiple instances, use Redis instead.
 
 class _DedupeCache:
-    """Bounded in-memory cache for webhook deduplication."""
+    """Bounded in-memory cache for webhook deduplication.
 
-    def __init__(self, max_size: int = 1000, ttl_seconds: int = 3600) -> None:
-        self._cache: OrderedDict[str, float] = OrderedDict()
+    Entries store their expiry as integer ``time.monotonic_ns()`` ticks, so TTL
+    checks are plain int comparisons and immune to wall-clock adjustments.
+    ``clock`` is injectable so tests can drive TTL expiry without patching ``time``.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1000,
+        ttl_seconds: int = 3600,
+        clock: Callable[[], int] = time.monotonic_ns,
+    ) -> None:
+        self._cache: OrderedDict[str, int] = OrderedDict()
         self._max_size = max_size
-        self._ttl = ttl_seconds
+        self._ttl_ns = ttl_seconds * 1_000_000_000
+        self._clock = clock
 
     def is_duplicate(self, key: str) -> bool:
-        now = time.time()
-        if key in self._cache:
-            if now - self._cache[key] < self._ttl:
-                return True
-            # Expired — remove it
-            del self._cache[key]
+        expiry_ns = self._cache.get(key)
+        if expiry_ns is None:
+            return False
+        if self._clock() < expiry_ns:
+            # Retries cluster in time; keep a key that is still being hit away from eviction
+            self._cache.move_to_end(key)
+            return True
+        # Expired — remove it
+        del self._cache[key]
         return False
 
     def mark_seen(self, key: str) -> None:
-        now = time.time()
-        self._cache[key] = now
-        self._cache.move_to_end(key)
-        # Evict oldest entries if over capacity
+        if key in self._cache:
+            self._cache.move_to_end(key)
+        self._cache[key] = self._clock() + self._ttl_ns
+        # Evict least recently used entries if over capacity — O(1) per eviction
         while len(self._cache) > self._max_size:
             self._cache.popitem(last=False)
 
@@ -126,8 +144,10 @@ async def clickup_webhook(
         )
 
     # ── Parse payload ──────────────────────────────────────────────────────────
+    # Parse the bytes already read for the signature check; filtering below works
+    # on the plain dict — AgentTask is only built for dispatched tasks.
     try:
-        payload: dict[str, Any] = await request.json()
+        payload: dict[str, Any] = json.loads(raw_body)
     except (ValueError, UnicodeDecodeError) as exc:
         logger.error("clickup_webhook_parse_error", error=str(exc))
         raise HTTPException(
@@ -323,18 +343,36 @@ async def _dispatch_to_github(
 
 
 # ── Utilities ──────────────────────────────────────────────────────────────────
+# Hex-encoded SHA-256 digest length of a valid X-Signature header.
+_SIGNATURE_HEX_LEN = hashlib.sha256().digest_size * 2
+
+
+@lru_cache(maxsize=4)
+def _hmac_template(secret: str) -> hmac.HMAC:
+    """Return an HMAC-SHA256 object pre-keyed with *secret*, for ``.copy()`` per request.
+
+    Keyed on the secret value itself, so rotating CLICKUP_WEBHOOK_SECRET (still
+    read at call time) simply produces a new entry — no invalidation needed.
+    """
+    return hmac.new(secret.encode(), digestmod=hashlib.sha256)
+
+
 def _verify_clickup_signature(body: bytes, provided_signature: str, secret: str) -> bool:
     """
     Verify HMAC-SHA256 signature from ClickUp webhook.
-    ClickUp sends the hex digest in X-Signature header.
+    ClickUp sends the hex digest in X-Signature header. Anything other than
+    exactly 64 hex characters (wrong length, whitespace, non-hex) is rejected;
+    hex case is not significant.
     """
-    if not provided_signature:
+    if len(provided_signature) != _SIGNATURE_HEX_LEN or not all(
+        c in string.hexdigits for c in provided_signature
+    ):
         return False
 
-    expected = hmac.new(
-        secret.encode(),
-        body,
-        hashlib.sha256,
-    ).hexdigest()
+    # Compare the 32 raw digest bytes rather than 64 hex chars
+    provided = bytes.fromhex(provided_signature)
+
+    mac = _hmac_template(secret).copy()
+    mac.update(body)
 
-    return hmac.compare_digest(expected, provided_signature)
+    return hmac.compare_digest(mac.digest(), provided)
@@ -97,6 +97,10 @@ class AuditLog:
         """Get all events for a task."""
         return [e for e in self.events if e.task_id == task_id]
 
+    def has_action(self, task_id: str, action: str) -> bool:
+        """Return True if the task has recorded ``action``; stops at the first match."""
+        return any(e.task_id == task_id and e.action == action for e in self.events)
+
     def clear(self) -> None:
         """Clear all in-memory events."""
         self.events.clear()
@@ -20,6 +20,9 @@ from apps.runner.sandbox import SandboxConfig, build_docker_cmd
 
 logger = structlog.get_logger()
 
+# Aider's end-of-run summary, e.g. "Tokens: 12.3k sent, 4.5k received. Cost: $0.05"
+_COST_RE = re.compile(r"Cost:\s*\$([0-9]+\.?[0-9]*)")
+
 
 def _get_env(key: str, default: str = "") -> str:
     """Read env var at call time."""
@@ -99,7 +102,7 @@ class AiderAdapter:
             if key_value:
                 env_overrides[provider_config.api_key_env] = key_value
 
-        workspace = task.workspace_path if hasattr(task, "workspace_path") else None
+        workspace = task.workspace_path
         if workspace is None:
             return RunnerResult(
                 task_id=task.task_id,
@@ -191,7 +194,7 @@ def _parse_aider_cost(stdout: str) -> float:
     Returns:
         Extracted cost in USD, or 0.0 if not found.
     """
-    match = re.search(r"Cost:\s*\$([0-9]+\.?[0-9]*)", stdout)
+    match = _COST_RE.search(stdout)
     if match:
         try:
             return float(match.group(1))
@@ -85,7 +85,7 @@ class CodexAdapter:
         if base_url:
             env_overrides["OPENAI_BASE_URL"] = base_url
 
-        workspace = task.workspace_path if hasattr(task, "workspace_path") else None
+        workspace = task.workspace_path
         if workspace is None:
             return RunnerResult(
                 task_id=task.task_id,
@@ -96,7 +96,7 @@ class GeminiCliAdapter:
             if value:
                 env_overrides[env_key] = value
 
-        workspace = task.workspace_path if hasattr(task, "workspace_path") else None
+        workspace = task.workspace_path
         if workspace is None:
             return RunnerResult(
                 task_id=task.task_id,
@@ -20,6 +20,7 @@ import os
 import time
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
+from dataclasses import replace
 from typing import Literal, cast
 
 import structlog
@@ -418,9 +419,8 @@ async def _execute_task(state: TaskState, github_token: str | None = None) -> No
         }, log)
         log.info("task.engine.selected", engine=engine.name)
 
-        # Inject workspace path into task for the engine
-        # (RunnerTask is frozen, so we use object.__setattr__)
-        object.__setattr__(task, "workspace_path", repo_path)
+        # Hand the engine a copy of the task that points at the workspace
+        task = replace(task, workspace_path=repo_path)
 
         # 3. Run engine with cancel_event
         result = await engine.run(task, cancel_event=state.cancel_event)
@@ -53,6 +53,8 @@ class RunnerTask:
         max_cost_usd:     Cost ceiling (0.0 = unlimited).
         sandbox_mode:     Run engine in Docker sandbox.
         sandbox_image:    Docker image for sandbox execution.
+        workspace_path:   Cloned repo the engine runs in (None until the runner
+                          creates the workspace).
     """
 
     task_id: str
@@ -73,6 +75,7 @@ class RunnerTask:
     max_cost_usd: float = 0.0
     sandbox_mode: bool = False
     sandbox_image: str = "lailatov/sandbox:python"
+    workspace_path: Path | None = None
 
     def __post_init__(self) -> None:
         if not self.task_id:
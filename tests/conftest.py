@@ -2,19 +2,56 @@
 Shared pytest fixtures for AgentFactory tests.
 
 Provides:
-- FastAPI TestClient configured with mocked env vars
+- FastAPI TestClient and ASGI AsyncClient configured with mocked env vars
 - Common env var fixtures
 - httpx response mocking helpers
+- Optional per-request profiling (PROFILE_TESTS=1, requires pyinstrument)
 """
 
 from __future__ import annotations
 
-from collections.abc import Generator
+import os
+import time
+from collections.abc import AsyncIterator, Generator
+from pathlib import Path
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
 import pytest
+from fastapi import Request, Response
 from fastapi.testclient import TestClient
 
+# Captured before any test patches httpx.AsyncClient for outbound calls.
+_RealAsyncClient = httpx.AsyncClient
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """With PROFILE_TESTS=1, write one pyinstrument HTML profile per app request.
+
+    Registered before any test starts the app, so the middleware is in place
+    for every client. Profiles land in ``PROFILE_TESTS_DIR`` (default
+    ``pytest-profiles/``), named after the request path.
+    """
+    if not os.getenv("PROFILE_TESTS"):
+        return
+
+    from pyinstrument import Profiler
+
+    from apps.orchestrator.main import app
+
+    out_dir = Path(os.getenv("PROFILE_TESTS_DIR", "pytest-profiles"))
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    @app.middleware("http")
+    async def _profile_request(request: Request, call_next: Any) -> Response:
+        with Profiler(async_mode="enabled") as profiler:
+            response = await call_next(request)
+        name = request.url.path.strip("/").replace("/", "_") or "root"
+        out = out_dir / f"prof-{name}-{time.monotonic_ns()}.html"
+        out.write_text(profiler.output_html())
+        return response
+
 
 @pytest.fixture()
 def env_vars(monkeypatch: pytest.MonkeyPatch) -> dict[str, str]:
@@ -35,12 +72,36 @@ def env_vars(monkeypatch: pytest.MonkeyPatch) -> dict[str, str]:
     return defaults
 
 
+@pytest.fixture(scope="session")
+def _session_client() -> Generator[TestClient, None, None]:
+    """One TestClient (and one lifespan startup) shared by the whole session.
+
+    Handlers read env vars at call time, so sharing the client across tests
+    is safe as long as each test sets its own env via ``env_vars``.
+    """
+    from apps.orchestrator.main import app
+
+    with TestClient(app, raise_server_exceptions=False) as c:
+        yield c
+
+
 @pytest.fixture()
-def client(env_vars: dict[str, str]) -> Generator[TestClient, None, None]:
+def client(env_vars: dict[str, str], _session_client: TestClient) -> TestClient:
     """FastAPI TestClient with env vars pre-configured."""
+    return _session_client
+
+
+@pytest.fixture()
+async def aclient() -> AsyncIterator[httpx.AsyncClient]:
+    """In-loop ASGI client for the orchestrator app (no thread-hopping portal).
+
+    Built from the real AsyncClient class so it keeps working while
+    mock_httpx_post patches httpx.AsyncClient for outbound calls.
+    """
     from apps.orchestrator.main import app
 
-    with TestClient(app, raise_server_exceptions=False) as c:
+    transport = httpx.ASGITransport(app=app)
+    async with _RealAsyncClient(transport=transport, base_url="http://test") as c:
         yield c
 
 
@@ -51,6 +51,15 @@ def test_audit_get_events_returns_empty_for_unknown() -> None:
     assert audit.get_events("nonexistent") == []
 
 
+def test_audit_has_action() -> None:
+    audit = AuditLog()
+    audit.record("task.submitted", task_id="t-1")
+    audit.record("task.completed", task_id="t-2")
+    assert audit.has_action("t-1", "task.submitted")
+    assert not audit.has_action("t-1", "task.completed")
+    assert not audit.has_action("nonexistent", "task.submitted")
+
+
 # ── Persistence tests ─────────────────────────────────────────────────────
 
 
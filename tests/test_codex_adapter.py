@@ -13,6 +13,8 @@ from apps.runner.engines.protocol import AgentEngine
 from apps.runner.engines.subprocess_util import SubprocessResult
 from apps.runner.models import RunnerTask
 
+_FAKE_WS = Path("/tmp/fake-workspace")
+
 
 def _make_task(**overrides: object) -> RunnerTask:
     """Build a RunnerTask with workspace_path pre-set for engine tests."""
@@ -22,11 +24,10 @@ def _make_task(**overrides: object) -> RunnerTask:
         "branch": "agent/test-1",
         "base_branch": "main",
         "description": "Fix the login bug",
+        "workspace_path": _FAKE_WS,
     }
     defaults.update(overrides)
-    task = RunnerTask(**defaults)  # type: ignore[arg-type]
-    object.__setattr__(task, "workspace_path", Path("/tmp/fake-workspace"))
-    return task
+    return RunnerTask(**defaults)  # type: ignore[arg-type]
 
 
 _CODEX_SUBPROCESS = "apps.runner.engines.codex.run_engine_subprocess"
@@ -341,4 +342,4 @@ class TestCodexCommand:
         ) as mock_run:
             await CodexAdapter().run(_make_task(model="gpt-4.1"))
 
-        assert mock_run.call_args.kwargs["cwd"] == Path("/tmp/fake-workspace")
+        assert mock_run.call_args.kwargs["cwd"] == _FAKE_WS
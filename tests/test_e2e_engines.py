@@ -44,7 +44,7 @@ def _make_task(
     env_vars: dict[str, str] | None = None,
 ) -> RunnerTask:
     """Build a RunnerTask pointing at the e2e workspace."""
-    task = RunnerTask(
+    return RunnerTask(
         task_id="e2e-smoke",
         repo_url="local://test",
         branch="main",
@@ -56,10 +56,8 @@ def _make_task(
         max_turns=_MAX_TURNS,
         timeout_seconds=_TIMEOUT,
         env_vars=env_vars or {},
+        workspace_path=workspace,
     )
-    # Adapters read workspace_path via hasattr(); set on frozen dataclass.
-    object.__setattr__(task, "workspace_path", workspace)
-    return task
 
 
 # ===========================================================================
@@ -10,10 +10,12 @@ from __future__ import annotations
 import asyncio
 import json
 from pathlib import Path
-from unittest.mock import AsyncMock, patch
+from types import ModuleType
+from unittest.mock import AsyncMock
 
 import pytest
 
+from apps.runner.engines import aider, claude_code, codex, gemini_cli, pi
 from apps.runner.engines.aider import AiderAdapter
 from apps.runner.engines.claude_code import ClaudeCodeAdapter
 from apps.runner.engines.codex import CodexAdapter
@@ -25,6 +27,9 @@ from apps.runner.models import RunnerTask
 # ── Helpers ──────────────────────────────────────────────────────────────────
 
 
+_FAKE_WS = Path("/tmp/fake-workspace")
+
+
 def _make_task(**overrides: object) -> RunnerTask:
     """Build a RunnerTask with workspace_path pre-set for engine tests."""
     defaults: dict[str, object] = {
@@ -33,11 +38,10 @@ def _make_task(**overrides: object) -> RunnerTask:
         "branch": "agent/test-1",
         "base_branch": "main",
         "description": "Fix the bug in auth module",
+        "workspace_path": _FAKE_WS,
     }
     defaults.update(overrides)
-    task = RunnerTask(**defaults)  # type: ignore[arg-type]
-    object.__setattr__(task, "workspace_path", Path("/tmp/fake-workspace"))
-    return task
+    return RunnerTask(**defaults)  # type: ignore[arg-type]
 
 
 def _make_task_no_workspace(**overrides: object) -> RunnerTask:
@@ -53,6 +57,17 @@ def _make_task_no_workspace(**overrides: object) -> RunnerTask:
     return RunnerTask(**defaults)  # type: ignore[arg-type]
 
 
+def _mock_subproc(
+    monkeypatch: pytest.MonkeyPatch,
+    module: ModuleType,
+    result: SubprocessResult,
+) -> AsyncMock:
+    """Replace ``module.run_engine_subprocess`` with an AsyncMock returning ``result``."""
+    mock = AsyncMock(return_value=result)
+    monkeypatch.setattr(module, "run_engine_subprocess", mock)
+    return mock
+
+
 def _subprocess_ok(
     stdout: str = "",
     stderr: str = "",
@@ -111,14 +126,14 @@ def _subprocess_cancelled(duration_ms: int = 15000) -> SubprocessResult:
 
 # ── ClaudeCodeAdapter tests ─────────────────────────────────────────────────
 
-_CLAUDE_SUBPROCESS = "apps.runner.engines.claude_code.run_engine_subprocess"
-
 
 class TestClaudeSuccessParsing:
     """ClaudeCodeAdapter: successful runs parse cost and turns from JSON output."""
 
     @pytest.mark.asyncio
-    async def test_claude_success_parses_cost_and_turns(self) -> None:
+    async def test_claude_success_parses_cost_and_turns(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """Mock subprocess returns JSON output; verify cost_usd and num_turns parsed."""
         ndjson_output = "\n".join([
             json.dumps({"type": "progress", "message": "thinking..."}),
@@ -127,13 +142,9 @@ class TestClaudeSuccessParsing:
         ])
         mock_result = _subprocess_ok(stdout=ndjson_output, duration_ms=45000)
 
-        with patch(
-            _CLAUDE_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ):
-            adapter = ClaudeCodeAdapter()
-            result = await adapter.run(_make_task())
+        _mock_subproc(monkeypatch, claude_code, mock_result)
+        adapter = ClaudeCodeAdapter()
+        result = await adapter.run(_make_task())
 
         assert result.status == "success"
         assert result.cost_usd == 0.42
@@ -143,49 +154,41 @@ class TestClaudeSuccessParsing:
         assert result.error_message is None
 
     @pytest.mark.asyncio
-    async def test_claude_success_single_json_line(self) -> None:
+    async def test_claude_success_single_json_line(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """A single JSON line with cost and turns is parsed correctly."""
         stdout = json.dumps({"cost_usd": 1.23, "num_turns": 30})
         mock_result = _subprocess_ok(stdout=stdout)
 
-        with patch(
-            _CLAUDE_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ):
-            result = await ClaudeCodeAdapter().run(_make_task())
+        _mock_subproc(monkeypatch, claude_code, mock_result)
+        result = await ClaudeCodeAdapter().run(_make_task())
 
         assert result.cost_usd == 1.23
         assert result.num_turns == 30
 
     @pytest.mark.asyncio
-    async def test_claude_success_missing_cost_defaults_zero(self) -> None:
+    async def test_claude_success_missing_cost_defaults_zero(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """If JSON lacks cost_usd, defaults to 0.0."""
         stdout = json.dumps({"num_turns": 5})
         mock_result = _subprocess_ok(stdout=stdout)
 
-        with patch(
-            _CLAUDE_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ):
-            result = await ClaudeCodeAdapter().run(_make_task())
+        _mock_subproc(monkeypatch, claude_code, mock_result)
+        result = await ClaudeCodeAdapter().run(_make_task())
 
         assert result.cost_usd == 0.0
         assert result.num_turns == 5
 
     @pytest.mark.asyncio
-    async def test_claude_success_null_cost_defaults_zero(self) -> None:
+    async def test_claude_success_null_cost_defaults_zero(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """OpenRouter returns cost: null — adapter handles gracefully."""
         stdout = json.dumps({"cost_usd": None, "num_turns": 7})
         mock_result = _subprocess_ok(stdout=stdout)
 
-        with patch(
-            _CLAUDE_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ):
-            result = await ClaudeCodeAdapter().run(_make_task())
+        _mock_subproc(monkeypatch, claude_code, mock_result)
+        result = await ClaudeCodeAdapter().run(_make_task())
 
         assert result.cost_usd == 0.0
         assert result.num_turns == 7
@@ -195,16 +198,14 @@ class TestClaudeTimeoutAndCancel:
     """ClaudeCodeAdapter: timeout and cancellation scenarios."""
 
     @pytest.mark.asyncio
-    async def test_claude_timeout_returns_timeout_status(self) -> None:
+    async def test_claude_timeout_returns_timeout_status(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """Mock subprocess with timed_out=True produces status='timeout'."""
         mock_result = _subprocess_timeout(duration_ms=3600000)
 
-        with patch(
-            _CLAUDE_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ):
-            result = await ClaudeCodeAdapter().run(_make_task())
+        _mock_subproc(monkeypatch, claude_code, mock_result)
+        result = await ClaudeCodeAdapter().run(_make_task())
 
         assert result.status == "timeout"
         assert result.duration_ms == 3600000
@@ -212,16 +213,14 @@ class TestClaudeTimeoutAndCancel:
         assert result.error_message is None  # timeout is not a "failure"
 
     @pytest.mark.asyncio
-    async def test_claude_cancelled_returns_cancelled_status(self) -> None:
+    async def test_claude_cancelled_returns_cancelled_status(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """Mock subprocess with cancelled=True produces status='cancelled'."""
         mock_result = _subprocess_cancelled(duration_ms=8000)
 
-        with patch(
-            _CLAUDE_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ):
-            result = await ClaudeCodeAdapter().run(_make_task())
+        _mock_subproc(monkeypatch, claude_code, mock_result)
+        result = await ClaudeCodeAdapter().run(_make_task())
 
         assert result.status == "cancelled"
         assert result.duration_ms == 8000
@@ -233,7 +232,7 @@ class TestClaudeFailure:
     """ClaudeCodeAdapter: non-zero exit codes and error handling."""
 
     @pytest.mark.asyncio
-    async def test_claude_failure_returns_error(self) -> None:
+    async def test_claude_failure_returns_error(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Mock subprocess with return_code=1 produces status='failure' with error."""
         mock_result = _subprocess_fail(
             return_code=1,
@@ -241,12 +240,8 @@ class TestClaudeFailure:
             duration_ms=2000,
         )
 
-        with patch(
-            _CLAUDE_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ):
-            result = await ClaudeCodeAdapter().run(_make_task())
+        _mock_subproc(monkeypatch, claude_code, mock_result)
+        result = await ClaudeCodeAdapter().run(_make_task())
 
         assert result.status == "failure"
         assert result.error_message is not None
@@ -254,7 +249,7 @@ class TestClaudeFailure:
         assert result.engine == "claude-code"
 
     @pytest.mark.asyncio
-    async def test_claude_failure_still_parses_cost(self) -> None:
+    async def test_claude_failure_still_parses_cost(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Even on failure, stdout is parsed for cost metrics."""
         stdout = json.dumps({"cost_usd": 0.08, "num_turns": 3})
         mock_result = SubprocessResult(
@@ -266,12 +261,8 @@ class TestClaudeFailure:
             cancelled=False,
         )
 
-        with patch(
-            _CLAUDE_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ):
-            result = await ClaudeCodeAdapter().run(_make_task())
+        _mock_subproc(monkeypatch, claude_code, mock_result)
+        result = await ClaudeCodeAdapter().run(_make_task())
 
         assert result.status == "failure"
         assert result.cost_usd == 0.08
@@ -298,19 +289,15 @@ class TestClaudeCancelEvent:
     """ClaudeCodeAdapter: cancel_event is forwarded to run_engine_subprocess."""
 
     @pytest.mark.asyncio
-    async def test_claude_passes_cancel_event(self) -> None:
+    async def test_claude_passes_cancel_event(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Verify cancel_event kwarg is passed through to run_engine_subprocess."""
         mock_result = _subprocess_ok(
             stdout=json.dumps({"cost_usd": 0.01, "num_turns": 1}),
         )
         cancel_event = asyncio.Event()
 
-        with patch(
-            _CLAUDE_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await ClaudeCodeAdapter().run(_make_task(), cancel_event=cancel_event)
+        mock_run = _mock_subproc(monkeypatch, claude_code, mock_result)
+        await ClaudeCodeAdapter().run(_make_task(), cancel_event=cancel_event)
 
         # Verify cancel_event was passed as a keyword argument
         assert mock_run.call_count == 1
@@ -319,18 +306,16 @@ class TestClaudeCancelEvent:
         assert call_kwargs["cancel_event"] is cancel_event
 
     @pytest.mark.asyncio
-    async def test_claude_passes_none_cancel_event_by_default(self) -> None:
+    async def test_claude_passes_none_cancel_event_by_default(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """Without explicit cancel_event, None is passed."""
         mock_result = _subprocess_ok(
             stdout=json.dumps({"cost_usd": 0.0, "num_turns": 1}),
         )
 
-        with patch(
-            _CLAUDE_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await ClaudeCodeAdapter().run(_make_task())
+        mock_run = _mock_subproc(monkeypatch, claude_code, mock_result)
+        await ClaudeCodeAdapter().run(_make_task())
 
         call_kwargs = mock_run.call_args.kwargs
         assert call_kwargs["cancel_event"] is None
@@ -350,12 +335,8 @@ class TestClaudeEnvOverrides:
             stdout=json.dumps({"cost_usd": 0.05, "num_turns": 2}),
         )
 
-        with patch(
-            _CLAUDE_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await ClaudeCodeAdapter().run(_make_task())
+        mock_run = _mock_subproc(monkeypatch, claude_code, mock_result)
+        await ClaudeCodeAdapter().run(_make_task())
 
         env_overrides = mock_run.call_args.kwargs["env_overrides"]
         assert env_overrides["ANTHROPIC_API_KEY"] == "sk-ant-test-key-123"
@@ -371,12 +352,8 @@ class TestClaudeEnvOverrides:
             stdout=json.dumps({"cost_usd": 0.0, "num_turns": 1}),
         )
 
-        with patch(
-            _CLAUDE_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await ClaudeCodeAdapter().run(_make_task())
+        mock_run = _mock_subproc(monkeypatch, claude_code, mock_result)
+        await ClaudeCodeAdapter().run(_make_task())
 
         env_overrides = mock_run.call_args.kwargs["env_overrides"]
         assert env_overrides["ANTHROPIC_BASE_URL"] == "https://openrouter.ai/api"
@@ -392,12 +369,8 @@ class TestClaudeEnvOverrides:
             stdout=json.dumps({"cost_usd": 0.0, "num_turns": 1}),
         )
 
-        with patch(
-            _CLAUDE_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await ClaudeCodeAdapter().run(_make_task())
+        mock_run = _mock_subproc(monkeypatch, claude_code, mock_result)
+        await ClaudeCodeAdapter().run(_make_task())
 
         env_overrides = mock_run.call_args.kwargs["env_overrides"]
         assert "ANTHROPIC_API_KEY" not in env_overrides
@@ -414,12 +387,8 @@ class TestClaudeEnvOverrides:
             stdout=json.dumps({"cost_usd": 0.0, "num_turns": 1}),
         )
 
-        with patch(
-            _CLAUDE_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await ClaudeCodeAdapter().run(task)
+        mock_run = _mock_subproc(monkeypatch, claude_code, mock_result)
+        await ClaudeCodeAdapter().run(task)
 
         env_overrides = mock_run.call_args.kwargs["env_overrides"]
         assert env_overrides["CUSTOM_VAR"] == "custom-value"
@@ -437,12 +406,8 @@ class TestClaudeEnvOverrides:
         mock_result = _subprocess_ok(
             stdout=json.dumps({"cost_usd": 0.0, "num_turns": 1}),
         )
-        with patch(
-            _CLAUDE_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await ClaudeCodeAdapter().run(_make_task())
+        mock_run = _mock_subproc(monkeypatch, claude_code, mock_result)
+        await ClaudeCodeAdapter().run(_make_task())
         env_overrides = mock_run.call_args.kwargs["env_overrides"]
         assert env_overrides["ANTHROPIC_AUTH_TOKEN"] == "sk-or-v1-test-key"
         assert env_overrides["ANTHROPIC_BASE_URL"] == "https://openrouter.ai/api"
@@ -458,12 +423,8 @@ class TestClaudeEnvOverrides:
         mock_result = _subprocess_ok(
             stdout=json.dumps({"cost_usd": 0.0, "num_turns": 1}),
         )
-        with patch(
-            _CLAUDE_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await ClaudeCodeAdapter().run(_make_task())
+        mock_run = _mock_subproc(monkeypatch, claude_code, mock_result)
+        await ClaudeCodeAdapter().run(_make_task())
         env_overrides = mock_run.call_args.kwargs["env_overrides"]
         assert "ANTHROPIC_AUTH_TOKEN" not in env_overrides
 
@@ -480,12 +441,8 @@ class TestClaudeEnvOverrides:
         mock_result = _subprocess_ok(
             stdout=json.dumps({"cost_usd": 0.0, "num_turns": 1}),
         )
-        with patch(
-            _CLAUDE_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await ClaudeCodeAdapter().run(_make_task())
+        mock_run = _mock_subproc(monkeypatch, claude_code, mock_result)
+        await ClaudeCodeAdapter().run(_make_task())
         env_overrides = mock_run.call_args.kwargs["env_overrides"]
         assert env_overrides["CLAUDE_CODE_USE_BEDROCK"] == "1"
 
@@ -494,19 +451,15 @@ class TestClaudeCommandBuilding:
     """ClaudeCodeAdapter: verify the constructed CLI command."""
 
     @pytest.mark.asyncio
-    async def test_claude_uses_task_model(self) -> None:
+    async def test_claude_uses_task_model(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Task model is passed as --model argument."""
         task = _make_task(model="claude-opus-4-6")
         mock_result = _subprocess_ok(
             stdout=json.dumps({"cost_usd": 0.5, "num_turns": 10}),
         )
 
-        with patch(
-            _CLAUDE_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            result = await ClaudeCodeAdapter().run(task)
+        mock_run = _mock_subproc(monkeypatch, claude_code, mock_result)
+        result = await ClaudeCodeAdapter().run(task)
 
         cmd = mock_run.call_args.args[0]
         model_idx = cmd.index("--model") + 1
@@ -514,19 +467,15 @@ class TestClaudeCommandBuilding:
         assert result.model == "claude-opus-4-6"
 
     @pytest.mark.asyncio
-    async def test_claude_default_model_when_none(self) -> None:
+    async def test_claude_default_model_when_none(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """No model on task defaults to claude-sonnet-4-6."""
         task = _make_task(model=None)
         mock_result = _subprocess_ok(
             stdout=json.dumps({"cost_usd": 0.0, "num_turns": 1}),
         )
 
-        with patch(
-            _CLAUDE_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            result = await ClaudeCodeAdapter().run(task)
+        mock_run = _mock_subproc(monkeypatch, claude_code, mock_result)
+        result = await ClaudeCodeAdapter().run(task)
 
         cmd = mock_run.call_args.args[0]
         model_idx = cmd.index("--model") + 1
@@ -534,99 +483,79 @@ class TestClaudeCommandBuilding:
         assert result.model == "claude-sonnet-4-6"
 
     @pytest.mark.asyncio
-    async def test_claude_passes_max_turns(self) -> None:
+    async def test_claude_passes_max_turns(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Task max_turns is passed as --max-turns argument."""
         task = _make_task(max_turns=25)
         mock_result = _subprocess_ok(
             stdout=json.dumps({"cost_usd": 0.0, "num_turns": 1}),
         )
 
-        with patch(
-            _CLAUDE_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await ClaudeCodeAdapter().run(task)
+        mock_run = _mock_subproc(monkeypatch, claude_code, mock_result)
+        await ClaudeCodeAdapter().run(task)
 
         cmd = mock_run.call_args.args[0]
         turns_idx = cmd.index("--max-turns") + 1
         assert cmd[turns_idx] == "25"
 
     @pytest.mark.asyncio
-    async def test_claude_passes_description_as_stdin(self) -> None:
+    async def test_claude_passes_description_as_stdin(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """Task description is piped via stdin_text."""
         task = _make_task(description="Refactor the auth middleware")
         mock_result = _subprocess_ok(
             stdout=json.dumps({"cost_usd": 0.0, "num_turns": 1}),
         )
 
-        with patch(
-            _CLAUDE_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await ClaudeCodeAdapter().run(task)
+        mock_run = _mock_subproc(monkeypatch, claude_code, mock_result)
+        await ClaudeCodeAdapter().run(task)
 
         assert mock_run.call_args.kwargs["stdin_text"] == "Refactor the auth middleware"
 
     @pytest.mark.asyncio
-    async def test_claude_passes_workspace_as_cwd(self) -> None:
+    async def test_claude_passes_workspace_as_cwd(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Workspace path is passed as cwd to subprocess."""
         mock_result = _subprocess_ok(
             stdout=json.dumps({"cost_usd": 0.0, "num_turns": 1}),
         )
 
-        with patch(
-            _CLAUDE_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await ClaudeCodeAdapter().run(_make_task())
+        mock_run = _mock_subproc(monkeypatch, claude_code, mock_result)
+        await ClaudeCodeAdapter().run(_make_task())
 
-        assert mock_run.call_args.kwargs["cwd"] == Path("/tmp/fake-workspace")
+        assert mock_run.call_args.kwargs["cwd"] == _FAKE_WS
 
     @pytest.mark.asyncio
-    async def test_claude_passes_timeout_seconds(self) -> None:
+    async def test_claude_passes_timeout_seconds(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Task timeout_seconds is forwarded to subprocess."""
         task = _make_task(timeout_seconds=1800)
         mock_result = _subprocess_ok(
             stdout=json.dumps({"cost_usd": 0.0, "num_turns": 1}),
         )
 
-        with patch(
-            _CLAUDE_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await ClaudeCodeAdapter().run(task)
+        mock_run = _mock_subproc(monkeypatch, claude_code, mock_result)
+        await ClaudeCodeAdapter().run(task)
 
         assert mock_run.call_args.kwargs["timeout_seconds"] == 1800
 
 
 # ── AiderAdapter tests ──────────────────────────────────────────────────────
 
-_AIDER_SUBPROCESS = "apps.runner.engines.aider.run_engine_subprocess"
-
 
 class TestAiderSuccess:
     """AiderAdapter: successful runs and output parsing."""
 
     @pytest.mark.asyncio
-    async def test_aider_success_returns_result(self) -> None:
+    async def test_aider_success_returns_result(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Mock subprocess success produces status='success'."""
         mock_result = _subprocess_ok(
             stdout="Editing file.py\nApplied 3 edits\nDone!",
             duration_ms=25000,
         )
 
-        with patch(
-            _AIDER_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ):
-            result = await AiderAdapter().run(
-                _make_task(model="deepseek/deepseek-chat")
-            )
+        _mock_subproc(monkeypatch, aider, mock_result)
+        result = await AiderAdapter().run(
+            _make_task(model="deepseek/deepseek-chat")
+        )
 
         assert result.status == "success"
         assert result.engine == "aider"
@@ -634,7 +563,7 @@ class TestAiderSuccess:
         assert result.error_message is None
 
     @pytest.mark.asyncio
-    async def test_aider_parses_cost_from_stdout(self) -> None:
+    async def test_aider_parses_cost_from_stdout(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Mock output with 'Cost: $0.05' parses cost correctly."""
         stdout = (
             "Editing auth.py\n"
@@ -643,47 +572,37 @@ class TestAiderSuccess:
         )
         mock_result = _subprocess_ok(stdout=stdout)
 
-        with patch(
-            _AIDER_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ):
-            result = await AiderAdapter().run(
-                _make_task(model="deepseek/deepseek-chat")
-            )
+        _mock_subproc(monkeypatch, aider, mock_result)
+        result = await AiderAdapter().run(
+            _make_task(model="deepseek/deepseek-chat")
+        )
 
         assert result.status == "success"
         assert result.cost_usd == 0.05
 
     @pytest.mark.asyncio
-    async def test_aider_no_cost_in_output_defaults_zero(self) -> None:
+    async def test_aider_no_cost_in_output_defaults_zero(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """When stdout has no cost line, cost_usd defaults to 0.0."""
         mock_result = _subprocess_ok(stdout="Applied edits. Done!")
 
-        with patch(
-            _AIDER_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ):
-            result = await AiderAdapter().run(
-                _make_task(model="gpt-4.1")
-            )
+        _mock_subproc(monkeypatch, aider, mock_result)
+        result = await AiderAdapter().run(
+            _make_task(model="gpt-4.1")
+        )
 
         assert result.cost_usd == 0.0
 
     @pytest.mark.asyncio
-    async def test_aider_integer_cost_parsed(self) -> None:
+    async def test_aider_integer_cost_parsed(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Integer cost like 'Cost: $2' parses correctly."""
         mock_result = _subprocess_ok(stdout="Tokens: 100k sent. Cost: $2")
 
-        with patch(
-            _AIDER_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ):
-            result = await AiderAdapter().run(
-                _make_task(model="claude-sonnet-4-6")
-            )
+        _mock_subproc(monkeypatch, aider, mock_result)
+        result = await AiderAdapter().run(
+            _make_task(model="claude-sonnet-4-6")
+        )
 
         assert result.cost_usd == 2.0
 
@@ -692,18 +611,16 @@ class TestAiderTimeoutAndCancel:
     """AiderAdapter: timeout and cancellation scenarios."""
 
     @pytest.mark.asyncio
-    async def test_aider_timeout_returns_timeout_status(self) -> None:
+    async def test_aider_timeout_returns_timeout_status(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """Mock subprocess with timed_out=True produces status='timeout'."""
         mock_result = _subprocess_timeout(duration_ms=3600000)
 
-        with patch(
-            _AIDER_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ):
-            result = await AiderAdapter().run(
-                _make_task(model="gpt-4.1")
-            )
+        _mock_subproc(monkeypatch, aider, mock_result)
+        result = await AiderAdapter().run(
+            _make_task(model="gpt-4.1")
+        )
 
         assert result.status == "timeout"
         assert result.duration_ms == 3600000
@@ -711,18 +628,16 @@ class TestAiderTimeoutAndCancel:
         assert result.error_message is None
 
     @pytest.mark.asyncio
-    async def test_aider_cancelled_returns_cancelled_status(self) -> None:
+    async def test_aider_cancelled_returns_cancelled_status(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """Mock subprocess with cancelled=True produces status='cancelled'."""
         mock_result = _subprocess_cancelled(duration_ms=12000)
 
-        with patch(
-            _AIDER_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ):
-            result = await AiderAdapter().run(
-                _make_task(model="deepseek-chat")
-            )
+        _mock_subproc(monkeypatch, aider, mock_result)
+        result = await AiderAdapter().run(
+            _make_task(model="deepseek-chat")
+        )
 
         assert result.status == "cancelled"
         assert result.duration_ms == 12000
@@ -749,20 +664,16 @@ class TestAiderCancelEvent:
     """AiderAdapter: cancel_event is forwarded to run_engine_subprocess."""
 
     @pytest.mark.asyncio
-    async def test_aider_passes_cancel_event(self) -> None:
+    async def test_aider_passes_cancel_event(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Verify cancel_event kwarg is passed through to run_engine_subprocess."""
         mock_result = _subprocess_ok(stdout="Done!")
         cancel_event = asyncio.Event()
 
-        with patch(
-            _AIDER_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await AiderAdapter().run(
-                _make_task(model="gpt-4.1"),
-                cancel_event=cancel_event,
-            )
+        mock_run = _mock_subproc(monkeypatch, aider, mock_result)
+        await AiderAdapter().run(
+            _make_task(model="gpt-4.1"),
+            cancel_event=cancel_event,
+        )
 
         assert mock_run.call_count == 1
         call_kwargs = mock_run.call_args.kwargs
@@ -770,16 +681,14 @@ class TestAiderCancelEvent:
         assert call_kwargs["cancel_event"] is cancel_event
 
     @pytest.mark.asyncio
-    async def test_aider_passes_none_cancel_event_by_default(self) -> None:
+    async def test_aider_passes_none_cancel_event_by_default(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """Without explicit cancel_event, None is passed."""
         mock_result = _subprocess_ok(stdout="Done!")
 
-        with patch(
-            _AIDER_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await AiderAdapter().run(_make_task(model="gpt-4.1"))
+        mock_run = _mock_subproc(monkeypatch, aider, mock_result)
+        await AiderAdapter().run(_make_task(model="gpt-4.1"))
 
         call_kwargs = mock_run.call_args.kwargs
         assert call_kwargs["cancel_event"] is None
@@ -797,12 +706,8 @@ class TestAiderEnvOverrides:
         task = _make_task(model="deepseek/deepseek-chat")
         mock_result = _subprocess_ok(stdout="Done!")
 
-        with patch(
-            _AIDER_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await AiderAdapter().run(task)
+        mock_run = _mock_subproc(monkeypatch, aider, mock_result)
+        await AiderAdapter().run(task)
 
         env_overrides = mock_run.call_args.kwargs["env_overrides"]
         assert env_overrides["DEEPSEEK_API_KEY"] == "sk-deepseek-test-key"
@@ -816,12 +721,8 @@ class TestAiderEnvOverrides:
         task = _make_task(model="deepseek-chat")
         mock_result = _subprocess_ok(stdout="Done!")
 
-        with patch(
-            _AIDER_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await AiderAdapter().run(task)
+        mock_run = _mock_subproc(monkeypatch, aider, mock_result)
+        await AiderAdapter().run(task)
 
         env_overrides = mock_run.call_args.kwargs["env_overrides"]
         assert env_overrides["DEEPSEEK_API_KEY"] == "sk-ds-abc"
@@ -835,12 +736,8 @@ class TestAiderEnvOverrides:
         task = _make_task(model="gpt-4.1-mini")
         mock_result = _subprocess_ok(stdout="Done!")
 
-        with patch(
-            _AIDER_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await AiderAdapter().run(task)
+        mock_run = _mock_subproc(monkeypatch, aider, mock_result)
+        await AiderAdapter().run(task)
 
         env_overrides = mock_run.call_args.kwargs["env_overrides"]
         assert env_overrides["OPENAI_API_KEY"] == "sk-openai-test"
@@ -854,12 +751,8 @@ class TestAiderEnvOverrides:
         task = _make_task(model="claude-sonnet-4-6")
         mock_result = _subprocess_ok(stdout="Done!")
 
-        with patch(
-            _AIDER_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await AiderAdapter().run(task)
+        mock_run = _mock_subproc(monkeypatch, aider, mock_result)
+        await AiderAdapter().run(task)
 
         env_overrides = mock_run.call_args.kwargs["env_overrides"]
         assert env_overrides["ANTHROPIC_API_KEY"] == "sk-ant-xyz"
@@ -873,12 +766,8 @@ class TestAiderEnvOverrides:
         task = _make_task(model="gemini-2.0-flash")
         mock_result = _subprocess_ok(stdout="Done!")
 
-        with patch(
-            _AIDER_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await AiderAdapter().run(task)
+        mock_run = _mock_subproc(monkeypatch, aider, mock_result)
+        await AiderAdapter().run(task)
 
         env_overrides = mock_run.call_args.kwargs["env_overrides"]
         assert env_overrides["GEMINI_API_KEY"] == "AIza-test"
@@ -892,12 +781,8 @@ class TestAiderEnvOverrides:
         task = _make_task(model="openrouter/anthropic/claude-3.5-sonnet")
         mock_result = _subprocess_ok(stdout="Done!")
 
-        with patch(
-            _AIDER_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await AiderAdapter().run(task)
+        mock_run = _mock_subproc(monkeypatch, aider, mock_result)
+        await AiderAdapter().run(task)
 
         env_overrides = mock_run.call_args.kwargs["env_overrides"]
         assert env_overrides["OPENROUTER_API_KEY"] == "sk-or-test"
@@ -911,12 +796,8 @@ class TestAiderEnvOverrides:
         task = _make_task(model="deepseek/deepseek-chat")
         mock_result = _subprocess_ok(stdout="Done!")
 
-        with patch(
-            _AIDER_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await AiderAdapter().run(task)
+        mock_run = _mock_subproc(monkeypatch, aider, mock_result)
+        await AiderAdapter().run(task)
 
         env_overrides = mock_run.call_args.kwargs["env_overrides"]
         assert "DEEPSEEK_API_KEY" not in env_overrides
@@ -930,12 +811,8 @@ class TestAiderEnvOverrides:
         task = _make_task(model="gpt-4.1", env_vars={"MY_FLAG": "true"})
         mock_result = _subprocess_ok(stdout="Done!")
 
-        with patch(
-            _AIDER_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await AiderAdapter().run(task)
+        mock_run = _mock_subproc(monkeypatch, aider, mock_result)
+        await AiderAdapter().run(task)
 
         env_overrides = mock_run.call_args.kwargs["env_overrides"]
         assert env_overrides["MY_FLAG"] == "true"
@@ -946,17 +823,13 @@ class TestAiderCommandBuilding:
     """AiderAdapter: verify the constructed CLI command."""
 
     @pytest.mark.asyncio
-    async def test_aider_uses_task_model(self) -> None:
+    async def test_aider_uses_task_model(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Task model is passed as --model argument."""
         task = _make_task(model="deepseek/deepseek-chat")
         mock_result = _subprocess_ok(stdout="Done!")
 
-        with patch(
-            _AIDER_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            result = await AiderAdapter().run(task)
+        mock_run = _mock_subproc(monkeypatch, aider, mock_result)
+        result = await AiderAdapter().run(task)
 
         cmd = mock_run.call_args.args[0]
         model_idx = cmd.index("--model") + 1
@@ -964,17 +837,13 @@ class TestAiderCommandBuilding:
         assert result.model == "deepseek/deepseek-chat"
 
     @pytest.mark.asyncio
-    async def test_aider_default_model_when_none(self) -> None:
+    async def test_aider_default_model_when_none(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """No model on task defaults to claude-sonnet-4-6."""
         task = _make_task(model=None)
         mock_result = _subprocess_ok(stdout="Done!")
 
-        with patch(
-            _AIDER_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            result = await AiderAdapter().run(task)
+        mock_run = _mock_subproc(monkeypatch, aider, mock_result)
+        result = await AiderAdapter().run(task)
 
         cmd = mock_run.call_args.args[0]
         model_idx = cmd.index("--model") + 1
@@ -982,33 +851,29 @@ class TestAiderCommandBuilding:
         assert result.model == "claude-sonnet-4-6"
 
     @pytest.mark.asyncio
-    async def test_aider_passes_description_as_message(self) -> None:
+    async def test_aider_passes_description_as_message(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """Task description is passed via --message argument."""
         task = _make_task(description="Implement user signup flow")
         mock_result = _subprocess_ok(stdout="Done!")
 
-        with patch(
-            _AIDER_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await AiderAdapter().run(task)
+        mock_run = _mock_subproc(monkeypatch, aider, mock_result)
+        await AiderAdapter().run(task)
 
         cmd = mock_run.call_args.args[0]
         msg_idx = cmd.index("--message") + 1
         assert cmd[msg_idx] == "Implement user signup flow"
 
     @pytest.mark.asyncio
-    async def test_aider_includes_yes_always_and_no_git(self) -> None:
+    async def test_aider_includes_yes_always_and_no_git(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """Aider command includes --yes-always, --no-auto-commits, --no-git."""
         mock_result = _subprocess_ok(stdout="Done!")
 
-        with patch(
-            _AIDER_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await AiderAdapter().run(_make_task(model="gpt-4.1"))
+        mock_run = _mock_subproc(monkeypatch, aider, mock_result)
+        await AiderAdapter().run(_make_task(model="gpt-4.1"))
 
         cmd = mock_run.call_args.args[0]
         assert "--yes-always" in cmd
@@ -1016,44 +881,32 @@ class TestAiderCommandBuilding:
         assert "--no-git" in cmd
 
     @pytest.mark.asyncio
-    async def test_aider_includes_no_stream(self) -> None:
+    async def test_aider_includes_no_stream(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Aider command includes --no-stream for headless use."""
         mock_result = _subprocess_ok(stdout="Done!")
-        with patch(
-            _AIDER_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await AiderAdapter().run(_make_task(model="gpt-4.1"))
+        mock_run = _mock_subproc(monkeypatch, aider, mock_result)
+        await AiderAdapter().run(_make_task(model="gpt-4.1"))
         cmd = mock_run.call_args.args[0]
         assert "--no-stream" in cmd
 
     @pytest.mark.asyncio
-    async def test_aider_passes_workspace_as_cwd(self) -> None:
+    async def test_aider_passes_workspace_as_cwd(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Workspace path is passed as cwd to subprocess."""
         mock_result = _subprocess_ok(stdout="Done!")
 
-        with patch(
-            _AIDER_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await AiderAdapter().run(_make_task(model="gpt-4.1"))
+        mock_run = _mock_subproc(monkeypatch, aider, mock_result)
+        await AiderAdapter().run(_make_task(model="gpt-4.1"))
 
-        assert mock_run.call_args.kwargs["cwd"] == Path("/tmp/fake-workspace")
+        assert mock_run.call_args.kwargs["cwd"] == _FAKE_WS
 
     @pytest.mark.asyncio
-    async def test_aider_passes_timeout_seconds(self) -> None:
+    async def test_aider_passes_timeout_seconds(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Task timeout_seconds is forwarded to subprocess."""
         task = _make_task(model="gpt-4.1", timeout_seconds=900)
         mock_result = _subprocess_ok(stdout="Done!")
 
-        with patch(
-            _AIDER_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await AiderAdapter().run(task)
+        mock_run = _mock_subproc(monkeypatch, aider, mock_result)
+        await AiderAdapter().run(task)
 
         assert mock_run.call_args.kwargs["timeout_seconds"] == 900
 
@@ -1062,26 +915,22 @@ class TestAiderFailure:
     """AiderAdapter: non-zero exit codes and error handling."""
 
     @pytest.mark.asyncio
-    async def test_aider_failure_returns_error(self) -> None:
+    async def test_aider_failure_returns_error(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Non-zero exit code produces status='failure' with error."""
         mock_result = _subprocess_fail(
             return_code=1,
             stderr="Error: Model not available",
         )
 
-        with patch(
-            _AIDER_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ):
-            result = await AiderAdapter().run(_make_task(model="gpt-4.1"))
+        _mock_subproc(monkeypatch, aider, mock_result)
+        result = await AiderAdapter().run(_make_task(model="gpt-4.1"))
 
         assert result.status == "failure"
         assert result.error_message is not None
         assert "Model not available" in result.error_message
 
     @pytest.mark.asyncio
-    async def test_aider_failure_still_parses_cost(self) -> None:
+    async def test_aider_failure_still_parses_cost(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Even on failure, stdout is parsed for cost."""
         mock_result = SubprocessResult(
             return_code=1,
@@ -1092,12 +941,8 @@ class TestAiderFailure:
             cancelled=False,
         )
 
-        with patch(
-            _AIDER_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ):
-            result = await AiderAdapter().run(_make_task(model="gpt-4.1"))
+        _mock_subproc(monkeypatch, aider, mock_result)
+        result = await AiderAdapter().run(_make_task(model="gpt-4.1"))
 
         assert result.status == "failure"
         assert result.cost_usd == 0.03
@@ -1110,19 +955,15 @@ class TestClaudeSandboxWiring:
     """ClaudeCodeAdapter: sandbox_mode wraps command in Docker."""
 
     @pytest.mark.asyncio
-    async def test_claude_sandbox_wraps_command(self) -> None:
+    async def test_claude_sandbox_wraps_command(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """When sandbox_mode=True, cmd starts with 'docker' instead of 'claude'."""
         task = _make_task(sandbox_mode=True, sandbox_image="lailatov/sandbox:python")
         mock_result = _subprocess_ok(
             stdout=json.dumps({"cost_usd": 0.1, "num_turns": 3}),
         )
 
-        with patch(
-            _CLAUDE_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await ClaudeCodeAdapter().run(task)
+        mock_run = _mock_subproc(monkeypatch, claude_code, mock_result)
+        await ClaudeCodeAdapter().run(task)
 
         cmd = mock_run.call_args.args[0]
         assert cmd[0] == "docker"
@@ -1130,19 +971,17 @@ class TestClaudeSandboxWiring:
         assert "lailatov/sandbox:python" in cmd
 
     @pytest.mark.asyncio
-    async def test_claude_no_sandbox_uses_claude_command(self) -> None:
+    async def test_claude_no_sandbox_uses_claude_command(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """When sandbox_mode=False (default), cmd starts with 'claude'."""
         task = _make_task(sandbox_mode=False)
         mock_result = _subprocess_ok(
             stdout=json.dumps({"cost_usd": 0.0, "num_turns": 1}),
         )
 
-        with patch(
-            _CLAUDE_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await ClaudeCodeAdapter().run(task)
+        mock_run = _mock_subproc(monkeypatch, claude_code, mock_result)
+        await ClaudeCodeAdapter().run(task)
 
         cmd = mock_run.call_args.args[0]
         assert cmd[0] == "claude"
@@ -1152,7 +991,7 @@ class TestAiderSandboxWiring:
     """AiderAdapter: sandbox_mode wraps command in Docker."""
 
     @pytest.mark.asyncio
-    async def test_aider_sandbox_wraps_command(self) -> None:
+    async def test_aider_sandbox_wraps_command(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """When sandbox_mode=True, cmd starts with 'docker' instead of 'aider'."""
         task = _make_task(
             model="gpt-4.1",
@@ -1161,12 +1000,8 @@ class TestAiderSandboxWiring:
         )
         mock_result = _subprocess_ok(stdout="Done!")
 
-        with patch(
-            _AIDER_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await AiderAdapter().run(task)
+        mock_run = _mock_subproc(monkeypatch, aider, mock_result)
+        await AiderAdapter().run(task)
 
         cmd = mock_run.call_args.args[0]
         assert cmd[0] == "docker"
@@ -1174,17 +1009,15 @@ class TestAiderSandboxWiring:
         assert "lailatov/sandbox:node" in cmd
 
     @pytest.mark.asyncio
-    async def test_aider_no_sandbox_uses_aider_command(self) -> None:
+    async def test_aider_no_sandbox_uses_aider_command(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """When sandbox_mode=False (default), cmd starts with 'aider'."""
         task = _make_task(model="gpt-4.1", sandbox_mode=False)
         mock_result = _subprocess_ok(stdout="Done!")
 
-        with patch(
-            _AIDER_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await AiderAdapter().run(task)
+        mock_run = _mock_subproc(monkeypatch, aider, mock_result)
+        await AiderAdapter().run(task)
 
         cmd = mock_run.call_args.args[0]
         assert cmd[0] == "aider"
@@ -1192,8 +1025,6 @@ class TestAiderSandboxWiring:
 
 # ── GeminiCliAdapter tests ─────────────────────────────────────────────────
 
-_GEMINI_SUBPROCESS = "apps.runner.engines.gemini_cli.run_engine_subprocess"
-
 
 class TestGeminiEnvOverrides:
     """GeminiCliAdapter: environment variable injection."""
@@ -1209,12 +1040,8 @@ class TestGeminiEnvOverrides:
         monkeypatch.delenv("GOOGLE_CLOUD_LOCATION", raising=False)
         mock_result = _subprocess_ok(stdout="Generated code", duration_ms=8000)
 
-        with patch(
-            _GEMINI_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await GeminiCliAdapter().run(_make_task())
+        mock_run = _mock_subproc(monkeypatch, gemini_cli, mock_result)
+        await GeminiCliAdapter().run(_make_task())
 
         env_overrides = mock_run.call_args.kwargs["env_overrides"]
         assert env_overrides["GEMINI_API_KEY"] == "AIza-test-key-123"
@@ -1230,12 +1057,8 @@ class TestGeminiEnvOverrides:
         monkeypatch.delenv("GOOGLE_CLOUD_LOCATION", raising=False)
         mock_result = _subprocess_ok(stdout="Done")
 
-        with patch(
-            _GEMINI_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await GeminiCliAdapter().run(_make_task())
+        mock_run = _mock_subproc(monkeypatch, gemini_cli, mock_result)
+        await GeminiCliAdapter().run(_make_task())
 
         env_overrides = mock_run.call_args.kwargs["env_overrides"]
         assert env_overrides["GOOGLE_GEMINI_BASE_URL"] == "https://my-proxy.example.com"
@@ -1251,12 +1074,8 @@ class TestGeminiEnvOverrides:
         monkeypatch.delenv("GOOGLE_CLOUD_LOCATION", raising=False)
         mock_result = _subprocess_ok(stdout="Done")
 
-        with patch(
-            _GEMINI_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await GeminiCliAdapter().run(_make_task())
+        mock_run = _mock_subproc(monkeypatch, gemini_cli, mock_result)
+        await GeminiCliAdapter().run(_make_task())
 
         env_overrides = mock_run.call_args.kwargs["env_overrides"]
         assert "GOOGLE_GEMINI_BASE_URL" not in env_overrides
@@ -1272,12 +1091,8 @@ class TestGeminiEnvOverrides:
         monkeypatch.delenv("GOOGLE_GEMINI_BASE_URL", raising=False)
         mock_result = _subprocess_ok(stdout="Done")
 
-        with patch(
-            _GEMINI_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await GeminiCliAdapter().run(_make_task())
+        mock_run = _mock_subproc(monkeypatch, gemini_cli, mock_result)
+        await GeminiCliAdapter().run(_make_task())
 
         env_overrides = mock_run.call_args.kwargs["env_overrides"]
         assert env_overrides["GOOGLE_CLOUD_PROJECT"] == "my-gcp-project"
@@ -1288,17 +1103,13 @@ class TestGeminiCommandBuilding:
     """GeminiCliAdapter: verify the constructed CLI command."""
 
     @pytest.mark.asyncio
-    async def test_gemini_uses_task_model(self) -> None:
+    async def test_gemini_uses_task_model(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Task model is passed as --model argument."""
         task = _make_task(model="gemini-2.5-pro")
         mock_result = _subprocess_ok(stdout="Done")
 
-        with patch(
-            _GEMINI_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            result = await GeminiCliAdapter().run(task)
+        mock_run = _mock_subproc(monkeypatch, gemini_cli, mock_result)
+        result = await GeminiCliAdapter().run(task)
 
         cmd = mock_run.call_args.args[0]
         model_idx = cmd.index("--model") + 1
@@ -1306,34 +1117,28 @@ class TestGeminiCommandBuilding:
         assert result.model == "gemini-2.5-pro"
 
     @pytest.mark.asyncio
-    async def test_gemini_passes_description_as_positional(self) -> None:
+    async def test_gemini_passes_description_as_positional(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """Task description is passed as a positional argument (not --message)."""
         task = _make_task(description="Refactor the auth middleware")
         mock_result = _subprocess_ok(stdout="Done")
 
-        with patch(
-            _GEMINI_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await GeminiCliAdapter().run(task)
+        mock_run = _mock_subproc(monkeypatch, gemini_cli, mock_result)
+        await GeminiCliAdapter().run(task)
 
         cmd = mock_run.call_args.args[0]
         assert "--message" not in cmd
         assert "Refactor the auth middleware" in cmd
 
     @pytest.mark.asyncio
-    async def test_gemini_default_model(self) -> None:
+    async def test_gemini_default_model(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """No model on task defaults to gemini-2.5-flash."""
         task = _make_task(model=None)
         mock_result = _subprocess_ok(stdout="Done")
 
-        with patch(
-            _GEMINI_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            result = await GeminiCliAdapter().run(task)
+        mock_run = _mock_subproc(monkeypatch, gemini_cli, mock_result)
+        result = await GeminiCliAdapter().run(task)
 
         cmd = mock_run.call_args.args[0]
         model_idx = cmd.index("--model") + 1
@@ -1345,19 +1150,15 @@ class TestGeminiSuccess:
     """GeminiCliAdapter: successful runs and failure handling."""
 
     @pytest.mark.asyncio
-    async def test_gemini_success_returns_result(self) -> None:
+    async def test_gemini_success_returns_result(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Mock subprocess success produces status='success'."""
         mock_result = _subprocess_ok(
             stdout="Generated code for auth module\nDone!",
             duration_ms=20000,
         )
 
-        with patch(
-            _GEMINI_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ):
-            result = await GeminiCliAdapter().run(_make_task())
+        _mock_subproc(monkeypatch, gemini_cli, mock_result)
+        result = await GeminiCliAdapter().run(_make_task())
 
         assert result.status == "success"
         assert result.engine == "gemini-cli"
@@ -1365,7 +1166,7 @@ class TestGeminiSuccess:
         assert result.error_message is None
 
     @pytest.mark.asyncio
-    async def test_gemini_failure_returns_error(self) -> None:
+    async def test_gemini_failure_returns_error(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Non-zero exit code produces status='failure' with error."""
         mock_result = _subprocess_fail(
             return_code=1,
@@ -1373,12 +1174,8 @@ class TestGeminiSuccess:
             duration_ms=3000,
         )
 
-        with patch(
-            _GEMINI_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ):
-            result = await GeminiCliAdapter().run(_make_task())
+        _mock_subproc(monkeypatch, gemini_cli, mock_result)
+        result = await GeminiCliAdapter().run(_make_task())
 
         assert result.status == "failure"
         assert result.error_message is not None
@@ -1390,7 +1187,7 @@ class TestGeminiSandboxWiring:
     """GeminiCliAdapter: sandbox_mode wraps command in Docker."""
 
     @pytest.mark.asyncio
-    async def test_gemini_sandbox_wraps_command(self) -> None:
+    async def test_gemini_sandbox_wraps_command(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """When sandbox_mode=True, cmd starts with 'docker' instead of 'gemini'."""
         task = _make_task(
             sandbox_mode=True,
@@ -1398,12 +1195,8 @@ class TestGeminiSandboxWiring:
         )
         mock_result = _subprocess_ok(stdout="Done")
 
-        with patch(
-            _GEMINI_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await GeminiCliAdapter().run(task)
+        mock_run = _mock_subproc(monkeypatch, gemini_cli, mock_result)
+        await GeminiCliAdapter().run(task)
 
         cmd = mock_run.call_args.args[0]
         assert cmd[0] == "docker"
@@ -1412,8 +1205,6 @@ class TestGeminiSandboxWiring:
 
 # ── CodexAdapter tests ──────────────────────────────────────────────────────
 
-_CODEX_SUBPROCESS = "apps.runner.engines.codex.run_engine_subprocess"
-
 
 class TestCodexEnvOverrides:
     """CodexAdapter: environment variable injection for OpenAI and OpenRouter."""
@@ -1427,12 +1218,8 @@ class TestCodexEnvOverrides:
         monkeypatch.delenv("OPENAI_BASE_URL", raising=False)
         mock_result = _subprocess_ok(stdout="Done!")
 
-        with patch(
-            _CODEX_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await CodexAdapter().run(_make_task())
+        mock_run = _mock_subproc(monkeypatch, codex, mock_result)
+        await CodexAdapter().run(_make_task())
 
         env_overrides = mock_run.call_args.kwargs["env_overrides"]
         assert env_overrides["OPENAI_API_KEY"] == "sk-test-key"
@@ -1446,12 +1233,8 @@ class TestCodexEnvOverrides:
         monkeypatch.setenv("OPENAI_BASE_URL", "https://openrouter.ai/api/v1")
         mock_result = _subprocess_ok(stdout="Done!")
 
-        with patch(
-            _CODEX_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await CodexAdapter().run(_make_task())
+        mock_run = _mock_subproc(monkeypatch, codex, mock_result)
+        await CodexAdapter().run(_make_task())
 
         env_overrides = mock_run.call_args.kwargs["env_overrides"]
         assert env_overrides["OPENAI_BASE_URL"] == "https://openrouter.ai/api/v1"
@@ -1465,12 +1248,8 @@ class TestCodexEnvOverrides:
         monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
         mock_result = _subprocess_ok(stdout="Done!")
 
-        with patch(
-            _CODEX_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await CodexAdapter().run(_make_task())
+        mock_run = _mock_subproc(monkeypatch, codex, mock_result)
+        await CodexAdapter().run(_make_task())
 
         env_overrides = mock_run.call_args.kwargs["env_overrides"]
         assert "OPENAI_BASE_URL" not in env_overrides
@@ -1484,12 +1263,8 @@ class TestCodexEnvOverrides:
         monkeypatch.delenv("OPENAI_BASE_URL", raising=False)
         mock_result = _subprocess_ok(stdout="Done!")
 
-        with patch(
-            _CODEX_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await CodexAdapter().run(_make_task())
+        mock_run = _mock_subproc(monkeypatch, codex, mock_result)
+        await CodexAdapter().run(_make_task())
 
         env_overrides = mock_run.call_args.kwargs["env_overrides"]
         assert "OPENAI_API_KEY" not in env_overrides
@@ -1504,12 +1279,8 @@ class TestCodexEnvOverrides:
         task = _make_task(env_vars={"CUSTOM_VAR": "custom-value"})
         mock_result = _subprocess_ok(stdout="Done!")
 
-        with patch(
-            _CODEX_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await CodexAdapter().run(task)
+        mock_run = _mock_subproc(monkeypatch, codex, mock_result)
+        await CodexAdapter().run(task)
 
         env_overrides = mock_run.call_args.kwargs["env_overrides"]
         assert env_overrides["CUSTOM_VAR"] == "custom-value"
@@ -1520,48 +1291,36 @@ class TestCodexCommandBuilding:
     """CodexAdapter: verify the constructed CLI command."""
 
     @pytest.mark.asyncio
-    async def test_codex_uses_exec_subcommand(self) -> None:
+    async def test_codex_uses_exec_subcommand(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Command uses ``exec`` subcommand for non-interactive mode."""
         mock_result = _subprocess_ok(stdout="Done!")
 
-        with patch(
-            _CODEX_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await CodexAdapter().run(_make_task())
+        mock_run = _mock_subproc(monkeypatch, codex, mock_result)
+        await CodexAdapter().run(_make_task())
 
         cmd = mock_run.call_args.args[0]
         assert cmd[0] == "codex"
         assert cmd[1] == "exec"
 
     @pytest.mark.asyncio
-    async def test_codex_includes_full_auto_flag(self) -> None:
+    async def test_codex_includes_full_auto_flag(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Command includes --full-auto for headless execution."""
         mock_result = _subprocess_ok(stdout="Done!")
 
-        with patch(
-            _CODEX_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await CodexAdapter().run(_make_task())
+        mock_run = _mock_subproc(monkeypatch, codex, mock_result)
+        await CodexAdapter().run(_make_task())
 
         cmd = mock_run.call_args.args[0]
         assert "--full-auto" in cmd
 
     @pytest.mark.asyncio
-    async def test_codex_uses_task_model(self) -> None:
+    async def test_codex_uses_task_model(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Task model is passed as --model argument."""
         task = _make_task(model="o3-mini")
         mock_result = _subprocess_ok(stdout="Done!")
 
-        with patch(
-            _CODEX_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            result = await CodexAdapter().run(task)
+        mock_run = _mock_subproc(monkeypatch, codex, mock_result)
+        result = await CodexAdapter().run(task)
 
         cmd = mock_run.call_args.args[0]
         model_idx = cmd.index("--model") + 1
@@ -1569,17 +1328,13 @@ class TestCodexCommandBuilding:
         assert result.model == "o3-mini"
 
     @pytest.mark.asyncio
-    async def test_codex_default_model_when_none(self) -> None:
+    async def test_codex_default_model_when_none(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """No model on task defaults to gpt-4.1."""
         task = _make_task(model=None)
         mock_result = _subprocess_ok(stdout="Done!")
 
-        with patch(
-            _CODEX_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            result = await CodexAdapter().run(task)
+        mock_run = _mock_subproc(monkeypatch, codex, mock_result)
+        result = await CodexAdapter().run(task)
 
         cmd = mock_run.call_args.args[0]
         model_idx = cmd.index("--model") + 1
@@ -1587,56 +1342,44 @@ class TestCodexCommandBuilding:
         assert result.model == "gpt-4.1-mini"
 
     @pytest.mark.asyncio
-    async def test_codex_passes_description_as_positional_arg(self) -> None:
+    async def test_codex_passes_description_as_positional_arg(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """Task description is passed as positional argument to exec."""
         task = _make_task(description="Refactor the auth module")
         mock_result = _subprocess_ok(stdout="Done!")
 
-        with patch(
-            _CODEX_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await CodexAdapter().run(task)
+        mock_run = _mock_subproc(monkeypatch, codex, mock_result)
+        await CodexAdapter().run(task)
 
         cmd = mock_run.call_args.args[0]
         assert cmd[-1] == "Refactor the auth module"
 
     @pytest.mark.asyncio
-    async def test_codex_passes_workspace_as_cwd(self) -> None:
+    async def test_codex_passes_workspace_as_cwd(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Workspace path is passed as cwd to subprocess."""
         mock_result = _subprocess_ok(stdout="Done!")
 
-        with patch(
-            _CODEX_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await CodexAdapter().run(_make_task())
+        mock_run = _mock_subproc(monkeypatch, codex, mock_result)
+        await CodexAdapter().run(_make_task())
 
-        assert mock_run.call_args.kwargs["cwd"] == Path("/tmp/fake-workspace")
+        assert mock_run.call_args.kwargs["cwd"] == _FAKE_WS
 
 
 # ── PiAdapter tests ─────────────────────────────────────────────────────────
 
-_PI_SUBPROCESS = "apps.runner.engines.pi.run_engine_subprocess"
-
 
 class TestPiCommandBuilding:
     """PiAdapter: verify the constructed CLI command includes --model, --print, --no-session."""
 
     @pytest.mark.asyncio
-    async def test_pi_includes_model_flag(self) -> None:
+    async def test_pi_includes_model_flag(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Task model is passed as --model argument."""
         task = _make_task(model="gpt-4.1")
         mock_result = _subprocess_ok(stdout="Done!")
 
-        with patch(
-            _PI_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            result = await PiAdapter().run(task)
+        mock_run = _mock_subproc(monkeypatch, pi, mock_result)
+        result = await PiAdapter().run(task)
 
         cmd = mock_run.call_args.args[0]
         model_idx = cmd.index("--model") + 1
@@ -1644,17 +1387,13 @@ class TestPiCommandBuilding:
         assert result.model == "gpt-4.1"
 
     @pytest.mark.asyncio
-    async def test_pi_default_model_when_none(self) -> None:
+    async def test_pi_default_model_when_none(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """No model on task defaults to claude-sonnet-4-6."""
         task = _make_task(model=None)
         mock_result = _subprocess_ok(stdout="Done!")
 
-        with patch(
-            _PI_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            result = await PiAdapter().run(task)
+        mock_run = _mock_subproc(monkeypatch, pi, mock_result)
+        result = await PiAdapter().run(task)
 
         cmd = mock_run.call_args.args[0]
         model_idx = cmd.index("--model") + 1
@@ -1662,77 +1401,59 @@ class TestPiCommandBuilding:
         assert result.model == "claude-sonnet-4-6"
 
     @pytest.mark.asyncio
-    async def test_pi_includes_print_flag(self) -> None:
+    async def test_pi_includes_print_flag(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Command includes --print for headless output."""
         mock_result = _subprocess_ok(stdout="Done!")
 
-        with patch(
-            _PI_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await PiAdapter().run(_make_task())
+        mock_run = _mock_subproc(monkeypatch, pi, mock_result)
+        await PiAdapter().run(_make_task())
 
         cmd = mock_run.call_args.args[0]
         assert "--print" in cmd
 
     @pytest.mark.asyncio
-    async def test_pi_includes_no_session_flag(self) -> None:
+    async def test_pi_includes_no_session_flag(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Command includes --no-session for stateless execution."""
         mock_result = _subprocess_ok(stdout="Done!")
 
-        with patch(
-            _PI_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await PiAdapter().run(_make_task())
+        mock_run = _mock_subproc(monkeypatch, pi, mock_result)
+        await PiAdapter().run(_make_task())
 
         cmd = mock_run.call_args.args[0]
         assert "--no-session" in cmd
 
     @pytest.mark.asyncio
-    async def test_pi_passes_description_as_positional_arg(self) -> None:
+    async def test_pi_passes_description_as_positional_arg(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """Task description is passed as the last positional argument."""
         task = _make_task(description="Refactor the parser")
         mock_result = _subprocess_ok(stdout="Done!")
 
-        with patch(
-            _PI_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await PiAdapter().run(task)
+        mock_run = _mock_subproc(monkeypatch, pi, mock_result)
+        await PiAdapter().run(task)
 
         cmd = mock_run.call_args.args[0]
         assert cmd[-1] == "Refactor the parser"
 
     @pytest.mark.asyncio
-    async def test_pi_passes_workspace_as_cwd(self) -> None:
+    async def test_pi_passes_workspace_as_cwd(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Workspace path is passed as cwd to subprocess."""
         mock_result = _subprocess_ok(stdout="Done!")
 
-        with patch(
-            _PI_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await PiAdapter().run(_make_task())
+        mock_run = _mock_subproc(monkeypatch, pi, mock_result)
+        await PiAdapter().run(_make_task())
 
-        assert mock_run.call_args.kwargs["cwd"] == Path("/tmp/fake-workspace")
+        assert mock_run.call_args.kwargs["cwd"] == _FAKE_WS
 
     @pytest.mark.asyncio
-    async def test_pi_passes_timeout_seconds(self) -> None:
+    async def test_pi_passes_timeout_seconds(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Task timeout_seconds is forwarded to subprocess."""
         task = _make_task(timeout_seconds=1200)
         mock_result = _subprocess_ok(stdout="Done!")
 
-        with patch(
-            _PI_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await PiAdapter().run(task)
+        mock_run = _mock_subproc(monkeypatch, pi, mock_result)
+        await PiAdapter().run(task)
 
         assert mock_run.call_args.kwargs["timeout_seconds"] == 1200
 
@@ -1748,12 +1469,8 @@ class TestPiEnvOverrides:
         monkeypatch.setenv("ANTHROPIC_API_KEY", "sk-ant-pi-test")
         mock_result = _subprocess_ok(stdout="Done!")
 
-        with patch(
-            _PI_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await PiAdapter().run(_make_task())
+        mock_run = _mock_subproc(monkeypatch, pi, mock_result)
+        await PiAdapter().run(_make_task())
 
         env_overrides = mock_run.call_args.kwargs["env_overrides"]
         assert env_overrides["ANTHROPIC_API_KEY"] == "sk-ant-pi-test"
@@ -1766,12 +1483,8 @@ class TestPiEnvOverrides:
         monkeypatch.setenv("OPENAI_API_KEY", "sk-openai-pi-test")
         mock_result = _subprocess_ok(stdout="Done!")
 
-        with patch(
-            _PI_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await PiAdapter().run(_make_task())
+        mock_run = _mock_subproc(monkeypatch, pi, mock_result)
+        await PiAdapter().run(_make_task())
 
         env_overrides = mock_run.call_args.kwargs["env_overrides"]
         assert env_overrides["OPENAI_API_KEY"] == "sk-openai-pi-test"
@@ -1784,12 +1497,8 @@ class TestPiEnvOverrides:
         monkeypatch.setenv("GEMINI_API_KEY", "AIza-pi-test")
         mock_result = _subprocess_ok(stdout="Done!")
 
-        with patch(
-            _PI_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await PiAdapter().run(_make_task())
+        mock_run = _mock_subproc(monkeypatch, pi, mock_result)
+        await PiAdapter().run(_make_task())
 
         env_overrides = mock_run.call_args.kwargs["env_overrides"]
         assert env_overrides["GEMINI_API_KEY"] == "AIza-pi-test"
@@ -1802,12 +1511,8 @@ class TestPiEnvOverrides:
         monkeypatch.setenv("OPENROUTER_API_KEY", "sk-or-pi-test")
         mock_result = _subprocess_ok(stdout="Done!")
 
-        with patch(
-            _PI_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await PiAdapter().run(_make_task())
+        mock_run = _mock_subproc(monkeypatch, pi, mock_result)
+        await PiAdapter().run(_make_task())
 
         env_overrides = mock_run.call_args.kwargs["env_overrides"]
         assert env_overrides["OPENROUTER_API_KEY"] == "sk-or-pi-test"
@@ -1820,12 +1525,8 @@ class TestPiEnvOverrides:
         monkeypatch.setenv("GROQ_API_KEY", "gsk-pi-test")
         mock_result = _subprocess_ok(stdout="Done!")
 
-        with patch(
-            _PI_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await PiAdapter().run(_make_task())
+        mock_run = _mock_subproc(monkeypatch, pi, mock_result)
+        await PiAdapter().run(_make_task())
 
         env_overrides = mock_run.call_args.kwargs["env_overrides"]
         assert env_overrides["GROQ_API_KEY"] == "gsk-pi-test"
@@ -1838,12 +1539,8 @@ class TestPiEnvOverrides:
         monkeypatch.setenv("MISTRAL_API_KEY", "sk-mistral-pi-test")
         mock_result = _subprocess_ok(stdout="Done!")
 
-        with patch(
-            _PI_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await PiAdapter().run(_make_task())
+        mock_run = _mock_subproc(monkeypatch, pi, mock_result)
+        await PiAdapter().run(_make_task())
 
         env_overrides = mock_run.call_args.kwargs["env_overrides"]
         assert env_overrides["MISTRAL_API_KEY"] == "sk-mistral-pi-test"
@@ -1865,12 +1562,8 @@ class TestPiEnvOverrides:
             monkeypatch.setenv(k, v)
         mock_result = _subprocess_ok(stdout="Done!")
 
-        with patch(
-            _PI_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await PiAdapter().run(_make_task())
+        mock_run = _mock_subproc(monkeypatch, pi, mock_result)
+        await PiAdapter().run(_make_task())
 
         env_overrides = mock_run.call_args.kwargs["env_overrides"]
         for k, v in keys.items():
@@ -1892,12 +1585,8 @@ class TestPiEnvOverrides:
             monkeypatch.delenv(k, raising=False)
         mock_result = _subprocess_ok(stdout="Done!")
 
-        with patch(
-            _PI_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await PiAdapter().run(_make_task())
+        mock_run = _mock_subproc(monkeypatch, pi, mock_result)
+        await PiAdapter().run(_make_task())
 
         env_overrides = mock_run.call_args.kwargs["env_overrides"]
         for k in (
@@ -1919,12 +1608,8 @@ class TestPiEnvOverrides:
         task = _make_task(env_vars={"MY_CUSTOM": "value"})
         mock_result = _subprocess_ok(stdout="Done!")
 
-        with patch(
-            _PI_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await PiAdapter().run(task)
+        mock_run = _mock_subproc(monkeypatch, pi, mock_result)
+        await PiAdapter().run(task)
 
         env_overrides = mock_run.call_args.kwargs["env_overrides"]
         assert env_overrides["MY_CUSTOM"] == "value"
@@ -1935,16 +1620,12 @@ class TestPiSuccess:
     """PiAdapter: basic success, failure, timeout, and cancel scenarios."""
 
     @pytest.mark.asyncio
-    async def test_pi_success_returns_result(self) -> None:
+    async def test_pi_success_returns_result(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Mock subprocess success produces status='success'."""
         mock_result = _subprocess_ok(stdout="Edits applied!", duration_ms=20000)
 
-        with patch(
-            _PI_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ):
-            result = await PiAdapter().run(_make_task())
+        _mock_subproc(monkeypatch, pi, mock_result)
+        result = await PiAdapter().run(_make_task())
 
         assert result.status == "success"
         assert result.engine == "oh-my-pi"
@@ -1952,35 +1633,27 @@ class TestPiSuccess:
         assert result.error_message is None
 
     @pytest.mark.asyncio
-    async def test_pi_failure_returns_error(self) -> None:
+    async def test_pi_failure_returns_error(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Non-zero exit code produces status='failure' with error."""
         mock_result = _subprocess_fail(
             return_code=1,
             stderr="Error: model not found",
         )
 
-        with patch(
-            _PI_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ):
-            result = await PiAdapter().run(_make_task())
+        _mock_subproc(monkeypatch, pi, mock_result)
+        result = await PiAdapter().run(_make_task())
 
         assert result.status == "failure"
         assert result.error_message is not None
         assert "model not found" in result.error_message
 
     @pytest.mark.asyncio
-    async def test_pi_timeout_returns_timeout_status(self) -> None:
+    async def test_pi_timeout_returns_timeout_status(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Mock subprocess with timed_out=True produces status='timeout'."""
         mock_result = _subprocess_timeout(duration_ms=3600000)
 
-        with patch(
-            _PI_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ):
-            result = await PiAdapter().run(_make_task())
+        _mock_subproc(monkeypatch, pi, mock_result)
+        result = await PiAdapter().run(_make_task())
 
         assert result.status == "timeout"
         assert result.duration_ms == 3600000
@@ -1988,16 +1661,14 @@ class TestPiSuccess:
         assert result.error_message is None
 
     @pytest.mark.asyncio
-    async def test_pi_cancelled_returns_cancelled_status(self) -> None:
+    async def test_pi_cancelled_returns_cancelled_status(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """Mock subprocess with cancelled=True produces status='cancelled'."""
         mock_result = _subprocess_cancelled(duration_ms=9000)
 
-        with patch(
-            _PI_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ):
-            result = await PiAdapter().run(_make_task())
+        _mock_subproc(monkeypatch, pi, mock_result)
+        result = await PiAdapter().run(_make_task())
 
         assert result.status == "cancelled"
         assert result.duration_ms == 9000
@@ -2005,17 +1676,13 @@ class TestPiSuccess:
         assert result.error_message is None
 
     @pytest.mark.asyncio
-    async def test_pi_passes_cancel_event(self) -> None:
+    async def test_pi_passes_cancel_event(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Verify cancel_event kwarg is passed through to run_engine_subprocess."""
         mock_result = _subprocess_ok(stdout="Done!")
         cancel_event = asyncio.Event()
 
-        with patch(
-            _PI_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await PiAdapter().run(_make_task(), cancel_event=cancel_event)
+        mock_run = _mock_subproc(monkeypatch, pi, mock_result)
+        await PiAdapter().run(_make_task(), cancel_event=cancel_event)
 
         assert mock_run.call_count == 1
         call_kwargs = mock_run.call_args.kwargs
@@ -2042,7 +1709,7 @@ class TestPiSandboxWiring:
     """PiAdapter: sandbox_mode wraps command in Docker."""
 
     @pytest.mark.asyncio
-    async def test_pi_sandbox_wraps_command(self) -> None:
+    async def test_pi_sandbox_wraps_command(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """When sandbox_mode=True, cmd starts with 'docker' instead of 'omp'."""
         task = _make_task(
             sandbox_mode=True,
@@ -2050,12 +1717,8 @@ class TestPiSandboxWiring:
         )
         mock_result = _subprocess_ok(stdout="Done!")
 
-        with patch(
-            _PI_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await PiAdapter().run(task)
+        mock_run = _mock_subproc(monkeypatch, pi, mock_result)
+        await PiAdapter().run(task)
 
         cmd = mock_run.call_args.args[0]
         assert cmd[0] == "docker"
@@ -2063,17 +1726,13 @@ class TestPiSandboxWiring:
         assert "lailatov/sandbox:python" in cmd
 
     @pytest.mark.asyncio
-    async def test_pi_no_sandbox_uses_omp_command(self) -> None:
+    async def test_pi_no_sandbox_uses_omp_command(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """When sandbox_mode=False (default), cmd starts with 'omp'."""
         task = _make_task(sandbox_mode=False)
         mock_result = _subprocess_ok(stdout="Done!")
 
-        with patch(
-            _PI_SUBPROCESS,
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            await PiAdapter().run(task)
+        mock_run = _mock_subproc(monkeypatch, pi, mock_result)
+        await PiAdapter().run(task)
 
         cmd = mock_run.call_args.args[0]
         assert cmd[0] == "omp"
@@ -13,6 +13,8 @@ from apps.runner.engines.protocol import AgentEngine
 from apps.runner.engines.subprocess_util import SubprocessResult
 from apps.runner.models import RunnerTask
 
+_FAKE_WS = Path("/tmp/fake-workspace")
+
 
 def _make_task(**overrides: object) -> RunnerTask:
     defaults: dict[str, object] = {
@@ -21,11 +23,10 @@ def _make_task(**overrides: object) -> RunnerTask:
         "branch": "agent/test-1",
         "base_branch": "main",
         "description": "Optimize the search query",
+        "workspace_path": _FAKE_WS,
     }
     defaults.update(overrides)
-    task = RunnerTask(**defaults)
-    object.__setattr__(task, "workspace_path", Path("/tmp/fake-workspace"))
-    return task
+    return RunnerTask(**defaults)
 
 
 _GEMINI_SUBPROCESS = (
@@ -249,6 +250,4 @@ class TestGeminiCommand:
             await GeminiCliAdapter().run(
                 _make_task(model="gemini-2.5-pro"),
             )
-        assert mock_run.call_args.kwargs["cwd"] == Path(
-            "/tmp/fake-workspace",
-        )
+        assert mock_run.call_args.kwargs["cwd"] == _FAKE_WS
@@ -13,6 +13,8 @@ from apps.runner.engines.protocol import AgentEngine
 from apps.runner.engines.subprocess_util import SubprocessResult
 from apps.runner.models import RunnerTask
 
+_FAKE_WS = Path("/tmp/fake-workspace")
+
 
 def _make_task(**overrides: object) -> RunnerTask:
     defaults: dict[str, object] = {
@@ -21,11 +23,10 @@ def _make_task(**overrides: object) -> RunnerTask:
         "branch": "agent/test-1",
         "base_branch": "main",
         "description": "Fix the search indexing bug",
+        "workspace_path": _FAKE_WS,
     }
     defaults.update(overrides)
-    task = RunnerTask(**defaults)
-    object.__setattr__(task, "workspace_path", Path("/tmp/fake-workspace"))
-    return task
+    return RunnerTask(**defaults)
 
 
 _PI_SUBPROCESS = "apps.runner.engines.pi.run_engine_subprocess"
@@ -279,7 +280,7 @@ class TestPiCommand:
             _PI_SUBPROCESS, new_callable=AsyncMock, return_value=mock_result
         ) as mock_run:
             await PiAdapter().run(_make_task(model="gpt-4.1"))
-        assert mock_run.call_args.kwargs["cwd"] == Path("/tmp/fake-workspace")
+        assert mock_run.call_args.kwargs["cwd"] == _FAKE_WS
 
     @pytest.mark.asyncio
     async def test_pi_passes_description_as_positional_arg(self) -> None:
@@ -28,6 +28,27 @@ from scripts.risk_policy_gate import (
     write_github_outputs,
 )
 
+# Policy payloads shared by the load_policy tests, serialized once at import.
+_VALID_POLICY = {
+    "riskTierRules": {"high": ["*.py"], "low": ["*.md"]},
+    "mergePolicy": {"high": {"requiredChecks": ["tests"]}},
+}
+_VALID_POLICY_JSON = json.dumps(_VALID_POLICY)
+
+_EXTRA_KEYS_POLICY = {
+    "riskTierRules": {"low": ["*.md"]},
+    "mergePolicy": {"low": {}},
+    "extraStuff": True,
+    "version": "1",
+}
+_EXTRA_KEYS_POLICY_JSON = json.dumps(_EXTRA_KEYS_POLICY)
+
+_MISSING_RISK_TIER_RULES_JSON = json.dumps({"mergePolicy": {"low": {}}})
+_MISSING_MERGE_POLICY_JSON = json.dumps({"riskTierRules": {"high": ["*.py"]}})
+
+# More files than print_summary displays (20), so the remainder is summarized.
+_THIRTY_FILES = [f"file_{i}.py" for i in range(30)]
+
 # ─── match_glob: standard fnmatch patterns ──────────────────────────────────
 
 
@@ -307,93 +328,94 @@ class TestDetermineTier:
 class TestCheckBlockedPatterns:
     """Blocked pattern detection."""
 
-    def test_matching_file_returns_violation(self) -> None:
-        blocked = [
-            {"pattern": "*.env", "reason": "Env files must not be committed"},
-        ]
-        files = ["production.env"]
-        violations = check_blocked_patterns(files, blocked)
-        assert len(violations) == 1
-        assert violations[0]["file"] == "production.env"
-        assert violations[0]["pattern"] == "*.env"
-        assert violations[0]["reason"] == "Env files must not be committed"
-
-    def test_no_matching_file_returns_empty_list(self) -> None:
-        blocked = [
-            {"pattern": "*.env", "reason": "Env files must not be committed"},
-        ]
-        files = ["apps/main.py", "README.md"]
-        violations = check_blocked_patterns(files, blocked)
-        assert violations == []
-
-    def test_multiple_violations_for_multiple_matching_files(self) -> None:
-        blocked = [
-            {"pattern": "*.env", "reason": "Env files blocked"},
-        ]
-        files = ["staging.env", "production.env"]
-        violations = check_blocked_patterns(files, blocked)
-        assert len(violations) == 2
-
-    def test_multiple_blocked_patterns_each_checked(self) -> None:
-        blocked = [
-            {"pattern": "*.env", "reason": "Env files blocked"},
-            {"pattern": "*.secret", "reason": "Secret files blocked"},
-        ]
-        files = ["staging.env", "api.secret"]
-        violations = check_blocked_patterns(files, blocked)
-        assert len(violations) == 2
-        patterns_found = {v["pattern"] for v in violations}
-        assert patterns_found == {"*.env", "*.secret"}
-
-    def test_empty_blocked_patterns_returns_empty_list(self) -> None:
-        violations = check_blocked_patterns(["any/file.py"], [])
-        assert violations == []
-
-    def test_empty_files_returns_empty_list(self) -> None:
-        blocked = [{"pattern": "*.env", "reason": "blocked"}]
-        violations = check_blocked_patterns([], blocked)
-        assert violations == []
-
-    def test_pattern_with_directory_glob(self) -> None:
-        blocked = [
-            {"pattern": "secrets/**", "reason": "Secrets directory blocked"},
-        ]
-        files = ["secrets/aws_keys.json"]
+    @pytest.mark.parametrize(
+        ("blocked", "files", "expected"),
+        [
+            pytest.param(
+                [{"pattern": "*.env", "reason": "Env files must not be committed"}],
+                ["apps/main.py", "README.md"],
+                [],
+                id="no_matching_file",
+            ),
+            pytest.param(
+                [{"pattern": "*.env", "reason": "Env files blocked"}],
+                ["staging.env", "production.env"],
+                [("staging.env", "*.env"), ("production.env", "*.env")],
+                id="multiple_matching_files",
+            ),
+            pytest.param(
+                [
+                    {"pattern": "*.env", "reason": "Env files blocked"},
+                    {"pattern": "*.secret", "reason": "Secret files blocked"},
+                ],
+                ["staging.env", "api.secret"],
+                [("staging.env", "*.env"), ("api.secret", "*.secret")],
+                id="multiple_blocked_patterns",
+            ),
+            pytest.param([], ["any/file.py"], [], id="empty_blocked_patterns"),
+            pytest.param(
+                [{"pattern": "*.env", "reason": "blocked"}], [], [], id="empty_files"
+            ),
+            pytest.param(
+                [{"pattern": "secrets/**", "reason": "Secrets directory blocked"}],
+                ["secrets/aws_keys.json"],
+                [("secrets/aws_keys.json", "secrets/**")],
+                id="directory_glob",
+            ),
+            pytest.param(
+                [{"pattern": "", "reason": "Should be skipped"}],
+                ["anything.py"],
+                [],
+                id="empty_pattern_skipped",
+            ),
+            pytest.param(
+                [{"reason": "No pattern key present"}],
+                ["anything.py"],
+                [],
+                id="missing_pattern_key_skipped",
+            ),
+        ],
+    )
+    def test_violations_match_expected_files_and_patterns(
+        self,
+        blocked: list[dict[str, str]],
+        files: list[str],
+        expected: list[tuple[str, str]],
+    ) -> None:
         violations = check_blocked_patterns(files, blocked)
+        assert sorted((v["file"], v["pattern"]) for v in violations) == sorted(expected)
+
+    @pytest.mark.parametrize(
+        ("entry", "expected_fields"),
+        [
+            pytest.param(
+                {"pattern": "*.env", "reason": "Env files must not be committed"},
+                {
+                    "file": "app.env",
+                    "pattern": "*.env",
+                    "reason": "Env files must not be committed",
+                },
+                id="matching_file_returns_violation",
+            ),
+            pytest.param(
+                {"pattern": "*.env", "reason": "Blocked", "tier": "critical"},
+                {"tier": "critical"},
+                id="tier_from_entry",
+            ),
+            pytest.param(
+                {"pattern": "*.env", "reason": "Blocked"},
+                {"tier": "high"},
+                id="default_tier_when_not_specified",
+            ),
+        ],
+    )
+    def test_violation_fields(
+        self, entry: dict[str, str], expected_fields: dict[str, str]
+    ) -> None:
+        violations = check_blocked_patterns(["app.env"], [entry])
         assert len(violations) == 1
-        assert violations[0]["file"] == "secrets/aws_keys.json"
-
-    def test_entry_with_empty_pattern_is_skipped(self) -> None:
-        blocked = [
-            {"pattern": "", "reason": "Should be skipped"},
-        ]
-        files = ["anything.py"]
-        violations = check_blocked_patterns(files, blocked)
-        assert violations == []
-
-    def test_entry_without_pattern_key_is_skipped(self) -> None:
-        blocked = [
-            {"reason": "No pattern key present"},
-        ]
-        files = ["anything.py"]
-        violations = check_blocked_patterns(files, blocked)
-        assert violations == []
-
-    def test_violation_includes_tier_from_entry(self) -> None:
-        blocked = [
-            {"pattern": "*.env", "reason": "Blocked", "tier": "critical"},
-        ]
-        files = ["app.env"]
-        violations = check_blocked_patterns(files, blocked)
-        assert violations[0]["tier"] == "critical"
-
-    def test_violation_uses_default_tier_when_not_specified(self) -> None:
-        blocked = [
-            {"pattern": "*.env", "reason": "Blocked"},
-        ]
-        files = ["app.env"]
-        violations = check_blocked_patterns(files, blocked)
-        assert violations[0]["tier"] == "high"
+        for key, value in expected_fields.items():
+            assert violations[0][key] == value
 
 
 # ─── load_policy ─────────────────────────────────────────────────────────────
@@ -402,59 +424,47 @@ class TestCheckBlockedPatterns:
 class TestLoadPolicy:
     """Loading and validating the risk policy JSON file."""
 
-    def test_valid_policy_loads_successfully(self, tmp_path: Path) -> None:
-        policy_data = {
-            "riskTierRules": {"high": ["*.py"], "low": ["*.md"]},
-            "mergePolicy": {"high": {"requiredChecks": ["tests"]}},
-        }
-        policy_file = tmp_path / "policy.json"
-        policy_file.write_text(json.dumps(policy_data))
+    @pytest.fixture(scope="module")
+    def policies_dir(self, tmp_path_factory: pytest.TempPathFactory) -> Path:
+        """One directory for every policy file written by this class."""
+        return tmp_path_factory.mktemp("policies")
+
+    @pytest.fixture()
+    def policy_file(self, policies_dir: Path, request: pytest.FixtureRequest) -> Path:
+        """Per-test policy path inside the shared directory (not yet created)."""
+        return policies_dir / f"{request.node.name}.json"
+
+    def test_valid_policy_loads_successfully(self, policy_file: Path) -> None:
+        policy_file.write_text(_VALID_POLICY_JSON)
 
         result = load_policy(str(policy_file))
-        assert result == policy_data
+        assert result == _VALID_POLICY
 
-    def test_missing_file_exits_with_code_1(self, tmp_path: Path) -> None:
-        missing_path = str(tmp_path / "nonexistent.json")
+    def test_missing_file_exits_with_code_1(self, policy_file: Path) -> None:
         with pytest.raises(SystemExit) as exc_info:
-            load_policy(missing_path)
+            load_policy(str(policy_file))
         assert exc_info.value.code == 1
 
-    def test_invalid_json_exits_with_code_1(self, tmp_path: Path) -> None:
-        bad_file = tmp_path / "bad.json"
-        bad_file.write_text("{not valid json!!")
+    def test_invalid_json_exits_with_code_1(self, policy_file: Path) -> None:
+        policy_file.write_text("{not valid json!!")
         with pytest.raises(SystemExit) as exc_info:
-            load_policy(str(bad_file))
+            load_policy(str(policy_file))
         assert exc_info.value.code == 1
 
-    def test_missing_risk_tier_rules_key_exits_with_code_1(
-        self, tmp_path: Path
-    ) -> None:
-        policy_data = {"mergePolicy": {"low": {}}}
-        policy_file = tmp_path / "policy.json"
-        policy_file.write_text(json.dumps(policy_data))
+    def test_missing_risk_tier_rules_key_exits_with_code_1(self, policy_file: Path) -> None:
+        policy_file.write_text(_MISSING_RISK_TIER_RULES_JSON)
         with pytest.raises(SystemExit) as exc_info:
             load_policy(str(policy_file))
         assert exc_info.value.code == 1
 
-    def test_missing_merge_policy_key_exits_with_code_1(
-        self, tmp_path: Path
-    ) -> None:
-        policy_data = {"riskTierRules": {"high": ["*.py"]}}
-        policy_file = tmp_path / "policy.json"
-        policy_file.write_text(json.dumps(policy_data))
+    def test_missing_merge_policy_key_exits_with_code_1(self, policy_file: Path) -> None:
+        policy_file.write_text(_MISSING_MERGE_POLICY_JSON)
         with pytest.raises(SystemExit) as exc_info:
             load_policy(str(policy_file))
         assert exc_info.value.code == 1
 
-    def test_policy_with_extra_keys_loads_fine(self, tmp_path: Path) -> None:
-        policy_data = {
-            "riskTierRules": {"low": ["*.md"]},
-            "mergePolicy": {"low": {}},
-            "extraStuff": True,
-            "version": "1",
-        }
-        policy_file = tmp_path / "policy.json"
-        policy_file.write_text(json.dumps(policy_data))
+    def test_policy_with_extra_keys_loads_fine(self, policy_file: Path) -> None:
+        policy_file.write_text(_EXTRA_KEYS_POLICY_JSON)
 
         result = load_policy(str(policy_file))
         assert "extraStuff" in result
@@ -466,42 +476,34 @@ class TestLoadPolicy:
 class TestWriteGithubOutputs:
     """Writing step outputs for GitHub Actions."""
 
-    def test_writes_key_value_pairs_to_github_output_file(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
+    @pytest.fixture()
+    def gh_out(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+        """Empty GITHUB_OUTPUT file, already exported via the env var."""
         output_file = tmp_path / "github_output"
         output_file.write_text("")
         monkeypatch.setenv("GITHUB_OUTPUT", str(output_file))
+        return output_file
 
+    def test_writes_key_value_pairs_to_github_output_file(self, gh_out: Path) -> None:
         write_github_outputs({"tier": "high", "blocked": "false"})
 
-        contents = output_file.read_text()
+        contents = gh_out.read_text()
         assert "tier=high\n" in contents
         assert "blocked=false\n" in contents
 
-    def test_appends_to_existing_github_output_file(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
-        output_file = tmp_path / "github_output"
-        output_file.write_text("existing=value\n")
-        monkeypatch.setenv("GITHUB_OUTPUT", str(output_file))
+    def test_appends_to_existing_github_output_file(self, gh_out: Path) -> None:
+        gh_out.write_text("existing=value\n")
 
         write_github_outputs({"tier": "low"})
 
-        contents = output_file.read_text()
+        contents = gh_out.read_text()
         assert contents.startswith("existing=value\n")
         assert "tier=low\n" in contents
 
-    def test_multiline_value_uses_heredoc_syntax(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
-        output_file = tmp_path / "github_output"
-        output_file.write_text("")
-        monkeypatch.setenv("GITHUB_OUTPUT", str(output_file))
-
+    def test_multiline_value_uses_heredoc_syntax(self, gh_out: Path) -> None:
         write_github_outputs({"summary": "line1\nline2"})
 
-        contents = output_file.read_text()
+        contents = gh_out.read_text()
         assert "summary<<EOF\n" in contents
         assert "line1\nline2\nEOF\n" in contents
 
@@ -516,16 +518,10 @@ class TestWriteGithubOutputs:
         assert "::set-output name=tier::medium" in captured.out
         assert "::set-output name=blocked::true" in captured.out
 
-    def test_empty_outputs_dict_writes_nothing(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
-        output_file = tmp_path / "github_output"
-        output_file.write_text("")
-        monkeypatch.setenv("GITHUB_OUTPUT", str(output_file))
-
+    def test_empty_outputs_dict_writes_nothing(self, gh_out: Path) -> None:
         write_github_outputs({})
 
-        assert output_file.read_text() == ""
+        assert gh_out.read_text() == ""
 
 
 # ─── print_summary ───────────────────────────────────────────────────────────
@@ -584,10 +580,9 @@ class TestPrintSummary:
     def test_many_files_truncates_display(
         self, capsys: pytest.CaptureFixture[str]
     ) -> None:
-        files = [f"file_{i}.py" for i in range(30)]
         print_summary(
             tier="medium",
-            changed_files=files,
+            changed_files=_THIRTY_FILES,
             required_checks=["tests"],
             blocked=False,
             violations=[],
@@ -11,7 +11,10 @@ Covers:
 
 from __future__ import annotations
 
-from unittest.mock import AsyncMock, MagicMock, patch
+import json
+from collections.abc import Callable, Iterator
+from typing import Any
+from unittest.mock import AsyncMock, patch
 
 import httpx
 import pytest
@@ -27,48 +30,138 @@ from apps.orchestrator.routers.callbacks import (
     _post_slack,
 )
 
+# ── Outbound HTTP route table ────────────────────────────────────────────────
+
+_RealAsyncClient = httpx.AsyncClient
+_Handler = Callable[[httpx.Request], httpx.Response]
+
+
+def _ok(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, json={"ok": True})
+
+
+class _Routes:
+    """Host-keyed handler table behind an httpx.MockTransport.
+
+    Every request is recorded in ``calls`` (real ``httpx.Request`` objects);
+    hosts without a registered handler get a 200.
+    """
+
+    def __init__(self) -> None:
+        self.handlers: dict[str, _Handler] = {}
+        self.calls: list[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.calls.append(request)
+        return self.handlers.get(request.url.host, _ok)(request)
+
+
+@pytest.fixture()
+def routes() -> Iterator[_Routes]:
+    """Route outbound httpx.AsyncClient traffic through a _Routes table."""
+    table = _Routes()
+    transport = httpx.MockTransport(table)
+
+    def _client(**kwargs: Any) -> httpx.AsyncClient:
+        return _RealAsyncClient(transport=transport, **kwargs)
+
+    with patch("httpx.AsyncClient", _client):
+        yield table
+
+
+def _status(code: int) -> _Handler:
+    return lambda request: httpx.Response(code, text="error")
+
+
+def _raise_request_error(request: httpx.Request) -> httpx.Response:
+    raise httpx.RequestError("Connection refused", request=request)
+
+
+def _sequence(*handlers: _Handler) -> _Handler:
+    """Answer successive requests with successive handlers (last one repeats)."""
+    remaining = list(handlers)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        current = remaining.pop(0) if len(remaining) > 1 else remaining[0]
+        return current(request)
+
+    return handler
+
+
+# ── Shared request data ──────────────────────────────────────────────────────
+
+_AGENT_COMPLETE_PAYLOAD = {"clickup_task_id": "abc123", "status": "success"}
+_PR_PAYLOAD = {"pr_url": "https://github.com/org/repo/pull/1", "pr_number": 1}
+
+
+# Stands in for env_vars["CALLBACK_SECRET"] in parametrize tables.
+_VALID_SECRET = "<valid>"
+
+
+def _headers(env_vars: dict[str, str]) -> dict[str, str]:
+    return {"X-Callback-Secret": env_vars["CALLBACK_SECRET"]}
+
+
+def _calls_to(mock_client: AsyncMock, host: str) -> list[Any]:
+    """Outbound POST calls whose URL (first positional arg) contains ``host``."""
+    return [c for c in mock_client.post.call_args_list if c.args and host in c.args[0]]
+
+
 # ── Secret verification ──────────────────────────────────────────────────────
 
 
 class TestCallbackSecretVerification:
     """Verify X-Callback-Secret header enforcement across all endpoints."""
 
-    def test_missing_secret_header_returns_401(
-        self, client: TestClient, env_vars: dict[str, str]
-    ) -> None:
-        """A request without X-Callback-Secret should be rejected with 401."""
-        resp = client.post(
-            "/callbacks/agent-complete",
-            json={"clickup_task_id": "abc123", "status": "success"},
-        )
-        assert resp.status_code == 401
-        assert resp.json()["detail"] == "Invalid callback secret"
-
-    def test_wrong_secret_header_returns_401(
-        self, client: TestClient, env_vars: dict[str, str]
-    ) -> None:
-        """A request with the wrong secret should be rejected with 401."""
-        resp = client.post(
-            "/callbacks/agent-complete",
-            json={"clickup_task_id": "abc123", "status": "success"},
-            headers={"X-Callback-Secret": "wrong-secret"},
-        )
-        assert resp.status_code == 401
-        assert resp.json()["detail"] == "Invalid callback secret"
-
-    def test_valid_secret_header_returns_200(
+    @pytest.mark.parametrize(
+        ("path", "payload", "header", "expected_status"),
+        [
+            pytest.param(
+                "/callbacks/agent-complete", _AGENT_COMPLETE_PAYLOAD, None, 401,
+                id="agent_complete_missing_header",
+            ),
+            pytest.param(
+                "/callbacks/agent-complete", _AGENT_COMPLETE_PAYLOAD, "wrong-secret", 401,
+                id="agent_complete_wrong_secret",
+            ),
+            pytest.param(
+                "/callbacks/agent-complete", _AGENT_COMPLETE_PAYLOAD, _VALID_SECRET, 200,
+                id="agent_complete_valid_secret",
+            ),
+            pytest.param(
+                "/callbacks/review-clean", _PR_PAYLOAD, "wrong-secret", 401,
+                id="review_clean_wrong_secret",
+            ),
+            pytest.param(
+                "/callbacks/blocked", _PR_PAYLOAD, "wrong-secret", 401,
+                id="blocked_wrong_secret",
+            ),
+        ],
+    )
+    def test_secret_header_enforced(
         self,
         client: TestClient,
         env_vars: dict[str, str],
         mock_httpx_post: AsyncMock,
-    ) -> None:
-        """A request with the correct secret should be accepted."""
-        resp = client.post(
-            "/callbacks/agent-complete",
-            json={"clickup_task_id": "abc123", "status": "success"},
-            headers={"X-Callback-Secret": env_vars["CALLBACK_SECRET"]},
-        )
-        assert resp.status_code == 200
+        path: str,
+        payload: dict[str, object],
+        header: str | None,
+        expected_status: int,
+    ) -> None:
+        """Every endpoint rejects a missing or wrong secret and accepts the right one."""
+        headers: dict[str, str]
+        if header is None:
+            headers = {}
+        elif header == _VALID_SECRET:
+            headers = _headers(env_vars)
+        else:
+            headers = {"X-Callback-Secret": header}
+
+        resp = client.post(path, json=payload, headers=headers)
+
+        assert resp.status_code == expected_status
+        if expected_status == 401:
+            assert resp.json()["detail"] == "Invalid callback secret"
 
     def test_no_callback_secret_configured_non_production_allows_request(
         self,
@@ -82,7 +175,7 @@ class TestCallbackSecretVerification:
         monkeypatch.setenv("ENVIRONMENT", "development")
         resp = client.post(
             "/callbacks/agent-complete",
-            json={"clickup_task_id": "abc123", "status": "success"},
+            json=_AGENT_COMPLETE_PAYLOAD,
         )
         assert resp.status_code == 200
 
@@ -98,33 +191,11 @@ class TestCallbackSecretVerification:
         monkeypatch.setenv("ENVIRONMENT", "production")
         resp = client.post(
             "/callbacks/agent-complete",
-            json={"clickup_task_id": "abc123", "status": "success"},
+            json=_AGENT_COMPLETE_PAYLOAD,
         )
         # The code logs a warning but still allows the request through
         assert resp.status_code == 200
 
-    def test_secret_verified_on_review_clean_endpoint(
-        self, client: TestClient, env_vars: dict[str, str]
-    ) -> None:
-        """review-clean also enforces secret verification."""
-        resp = client.post(
-            "/callbacks/review-clean",
-            json={"pr_url": "https://github.com/org/repo/pull/1", "pr_number": 1},
-            headers={"X-Callback-Secret": "wrong-secret"},
-        )
-        assert resp.status_code == 401
-
-    def test_secret_verified_on_blocked_endpoint(
-        self, client: TestClient, env_vars: dict[str, str]
-    ) -> None:
-        """blocked also enforces secret verification."""
-        resp = client.post(
-            "/callbacks/blocked",
-            json={"pr_url": "https://github.com/org/repo/pull/1", "pr_number": 1},
-            headers={"X-Callback-Secret": "wrong-secret"},
-        )
-        assert resp.status_code == 401
-
 
 # ── POST /callbacks/agent-complete ────────────────────────────────────────────
 
@@ -132,17 +203,14 @@ class TestCallbackSecretVerification:
 class TestAgentComplete:
     """Tests for the agent-complete callback endpoint."""
 
-    def _headers(self, env_vars: dict[str, str]) -> dict[str, str]:
-        return {"X-Callback-Secret": env_vars["CALLBACK_SECRET"]}
-
-    def test_success_status_returns_ok(
+    async def test_success_status_returns_ok(
         self,
-        client: TestClient,
+        aclient: httpx.AsyncClient,
         env_vars: dict[str, str],
         mock_httpx_post: AsyncMock,
     ) -> None:
         """Success status is acknowledged without triggering failure notifications."""
-        resp = client.post(
+        resp = await aclient.post(
             "/callbacks/agent-complete",
             json={
                 "clickup_task_id": "abc123",
@@ -150,7 +218,7 @@ class TestAgentComplete:
                 "pr_url": "https://github.com/org/repo/pull/42",
                 "branch": "agent/cu-abc123",
             },
-            headers=self._headers(env_vars),
+            headers=_headers(env_vars),
         )
         assert resp.status_code == 200
         body = resp.json()
@@ -159,14 +227,14 @@ class TestAgentComplete:
         # On success, no outbound HTTP calls should be made
         mock_httpx_post.post.assert_not_called()
 
-    def test_failure_status_triggers_slack_and_clickup(
+    async def test_failure_status_triggers_slack_and_clickup(
         self,
-        client: TestClient,
+        aclient: httpx.AsyncClient,
         env_vars: dict[str, str],
         mock_httpx_post: AsyncMock,
     ) -> None:
         """Failure status should post to both Slack and ClickUp."""
-        resp = client.post(
+        resp = await aclient.post(
             "/callbacks/agent-complete",
             json={
                 "clickup_task_id": "task99",
@@ -174,7 +242,7 @@ class TestAgentComplete:
                 "run_id": "12345",
                 "branch": "agent/cu-task99",
             },
-            headers=self._headers(env_vars),
+            headers=_headers(env_vars),
         )
         assert resp.status_code == 200
         body = resp.json()
@@ -186,24 +254,24 @@ class TestAgentComplete:
 
         # First call = Slack
         slack_call = mock_httpx_post.post.call_args_list[0]
-        assert slack_call[0][0] == env_vars["SLACK_WEBHOOK_URL"]
-        slack_payload = slack_call[1]["json"]
+        assert slack_call.args[0] == env_vars["SLACK_WEBHOOK_URL"]
+        slack_payload = slack_call.kwargs["json"]
         assert "failure" in slack_payload["text"]
         assert "task99" in slack_payload["text"]
 
         # Second call = ClickUp
         clickup_call = mock_httpx_post.post.call_args_list[1]
-        assert "clickup.com" in clickup_call[0][0]
-        assert "task99" in clickup_call[0][0]
+        assert "clickup.com" in clickup_call.args[0]
+        assert "task99" in clickup_call.args[0]
 
-    def test_cancelled_status_triggers_notifications(
+    async def test_cancelled_status_triggers_notifications(
         self,
-        client: TestClient,
+        aclient: httpx.AsyncClient,
         env_vars: dict[str, str],
         mock_httpx_post: AsyncMock,
     ) -> None:
         """Cancelled status is treated like failure and triggers notifications."""
-        resp = client.post(
+        resp = await aclient.post(
             "/callbacks/agent-complete",
             json={
                 "clickup_task_id": "task_c",
@@ -211,43 +279,43 @@ class TestAgentComplete:
                 "run_id": "run_c",
                 "branch": "agent/cu-task_c",
             },
-            headers=self._headers(env_vars),
+            headers=_headers(env_vars),
         )
         assert resp.status_code == 200
         assert resp.json()["received"] == "cancelled"
         # Slack + ClickUp
         assert mock_httpx_post.post.call_count == 2
 
-    def test_failure_with_no_clickup_task_id_skips_clickup(
+    async def test_failure_with_no_clickup_task_id_skips_clickup(
         self,
-        client: TestClient,
+        aclient: httpx.AsyncClient,
         env_vars: dict[str, str],
         mock_httpx_post: AsyncMock,
     ) -> None:
         """Failure with empty task ID still sends Slack, but skips ClickUp comment."""
-        resp = client.post(
+        resp = await aclient.post(
             "/callbacks/agent-complete",
             json={
                 "clickup_task_id": "",
                 "status": "failure",
                 "run_id": "run_x",
             },
-            headers=self._headers(env_vars),
+            headers=_headers(env_vars),
         )
         assert resp.status_code == 200
         # Only Slack (ClickUp skipped because task_id is empty/falsy)
         assert mock_httpx_post.post.call_count == 1
         slack_call = mock_httpx_post.post.call_args_list[0]
-        assert slack_call[0][0] == env_vars["SLACK_WEBHOOK_URL"]
+        assert slack_call.args[0] == env_vars["SLACK_WEBHOOK_URL"]
 
-    def test_failure_includes_actions_url_when_run_id_and_repo_present(
+    async def test_failure_includes_actions_url_when_run_id_and_repo_present(
         self,
-        client: TestClient,
+        aclient: httpx.AsyncClient,
         env_vars: dict[str, str],
         mock_httpx_post: AsyncMock,
     ) -> None:
         """The Slack and ClickUp messages should include a link to the GitHub Actions run."""
-        resp = client.post(
+        resp = await aclient.post(
             "/callbacks/agent-complete",
             json={
                 "clickup_task_id": "tid",
@@ -255,12 +323,12 @@ class TestAgentComplete:
                 "run_id": "98765",
                 "branch": "agent/cu-tid",
             },
-            headers=self._headers(env_vars),
+            headers=_headers(env_vars),
         )
         assert resp.status_code == 200
 
         slack_call = mock_httpx_post.post.call_args_list[0]
-        slack_text = slack_call[1]["json"]["text"]
+        slack_text = slack_call.kwargs["json"]["text"]
         assert "98765" in slack_text
         assert env_vars["GITHUB_REPO"] in slack_text
 
@@ -271,17 +339,14 @@ class TestAgentComplete:
 class TestReviewClean:
     """Tests for the review-clean callback endpoint."""
 
-    def _headers(self, env_vars: dict[str, str]) -> dict[str, str]:
-        return {"X-Callback-Secret": env_vars["CALLBACK_SECRET"]}
-
-    def test_review_clean_triggers_notifications(
+    async def test_review_clean_triggers_notifications(
         self,
-        client: TestClient,
+        aclient: httpx.AsyncClient,
         env_vars: dict[str, str],
         mock_httpx_post: AsyncMock,
     ) -> None:
         """A clean review should post to both Slack and ClickUp."""
-        resp = client.post(
+        resp = await aclient.post(
             "/callbacks/review-clean",
             json={
                 "pr_url": "https://github.com/org/repo/pull/10",
@@ -290,7 +355,7 @@ class TestReviewClean:
                 "risk_tier": "low",
                 "run_id": "run_rc",
             },
-            headers=self._headers(env_vars),
+            headers=_headers(env_vars),
         )
         assert resp.status_code == 200
         assert resp.json()["ok"] is True
@@ -299,31 +364,25 @@ class TestReviewClean:
         assert mock_httpx_post.post.call_count == 2
 
         # Find the ClickUp call (URL contains clickup.com)
-        clickup_calls = [
-            c for c in mock_httpx_post.post.call_args_list
-            if "clickup.com" in str(c)
-        ]
+        clickup_calls = _calls_to(mock_httpx_post, "api.clickup.com")
         assert len(clickup_calls) == 1
-        assert "task456" in clickup_calls[0][0][0]
+        assert "task456" in clickup_calls[0].args[0]
 
         # Find the Slack call
-        slack_calls = [
-            c for c in mock_httpx_post.post.call_args_list
-            if "slack" in str(c)
-        ]
+        slack_calls = _calls_to(mock_httpx_post, "hooks.slack.com")
         assert len(slack_calls) == 1
-        slack_text = slack_calls[0][1]["json"]["text"]
+        slack_text = slack_calls[0].kwargs["json"]["text"]
         assert "#10" in slack_text
         assert "low" in slack_text
 
-    def test_review_clean_without_branch_skips_clickup(
+    async def test_review_clean_without_branch_skips_clickup(
         self,
-        client: TestClient,
+        aclient: httpx.AsyncClient,
         env_vars: dict[str, str],
         mock_httpx_post: AsyncMock,
     ) -> None:
         """When branch is empty/non-matching, task_id extraction fails; ClickUp is skipped."""
-        resp = client.post(
+        resp = await aclient.post(
             "/callbacks/review-clean",
             json={
                 "pr_url": "https://github.com/org/repo/pull/11",
@@ -331,22 +390,22 @@ class TestReviewClean:
                 "branch": "main",
                 "risk_tier": "medium",
             },
-            headers=self._headers(env_vars),
+            headers=_headers(env_vars),
         )
         assert resp.status_code == 200
         # Only Slack (no task ID extracted from "main")
         assert mock_httpx_post.post.call_count == 1
         slack_call = mock_httpx_post.post.call_args_list[0]
-        assert slack_call[0][0] == env_vars["SLACK_WEBHOOK_URL"]
+        assert slack_call.args[0] == env_vars["SLACK_WEBHOOK_URL"]
 
-    def test_review_clean_includes_risk_tier_in_slack_message(
+    async def test_review_clean_includes_risk_tier_in_slack_message(
         self,
-        client: TestClient,
+        aclient: httpx.AsyncClient,
         env_vars: dict[str, str],
         mock_httpx_post: AsyncMock,
     ) -> None:
         """Slack message should include the risk tier for reviewer context."""
-        resp = client.post(
+        resp = await aclient.post(
             "/callbacks/review-clean",
             json={
                 "pr_url": "https://github.com/org/repo/pull/20",
@@ -354,14 +413,11 @@ class TestReviewClean:
                 "branch": "agent/cu-xyz",
                 "risk_tier": "high",
             },
-            headers=self._headers(env_vars),
+            headers=_headers(env_vars),
         )
         assert resp.status_code == 200
-        slack_calls = [
-            c for c in mock_httpx_post.post.call_args_list
-            if "slack" in str(c)
-        ]
-        slack_text = slack_calls[0][1]["json"]["text"]
+        slack_calls = _calls_to(mock_httpx_post, "hooks.slack.com")
+        slack_text = slack_calls[0].kwargs["json"]["text"]
         assert "high" in slack_text
 
 
@@ -371,17 +427,14 @@ class TestReviewClean:
 class TestBlocked:
     """Tests for the blocked callback endpoint."""
 
-    def _headers(self, env_vars: dict[str, str]) -> dict[str, str]:
-        return {"X-Callback-Secret": env_vars["CALLBACK_SECRET"]}
-
-    def test_blocked_triggers_notifications(
+    async def test_blocked_triggers_notifications(
         self,
-        client: TestClient,
+        aclient: httpx.AsyncClient,
         env_vars: dict[str, str],
         mock_httpx_post: AsyncMock,
     ) -> None:
         """A blocked callback should post to both Slack and ClickUp."""
-        resp = client.post(
+        resp = await aclient.post(
             "/callbacks/blocked",
             json={
                 "pr_url": "https://github.com/org/repo/pull/15",
@@ -389,7 +442,7 @@ class TestBlocked:
                 "branch": "agent/cu-blk001",
                 "reason": "test-failures",
             },
-            headers=self._headers(env_vars),
+            headers=_headers(env_vars),
         )
         assert resp.status_code == 200
         assert resp.json()["ok"] is True
@@ -397,14 +450,14 @@ class TestBlocked:
         # Slack + ClickUp
         assert mock_httpx_post.post.call_count == 2
 
-    def test_blocked_non_escalation_uses_warning_messaging(
+    async def test_blocked_non_escalation_uses_warning_messaging(
         self,
-        client: TestClient,
+        aclient: httpx.AsyncClient,
         env_vars: dict[str, str],
         mock_httpx_post: AsyncMock,
     ) -> None:
         """Non-escalation blocked callback uses warning-level messaging."""
-        resp = client.post(
+        resp = await aclient.post(
             "/callbacks/blocked",
             json={
                 "pr_url": "https://github.com/org/repo/pull/16",
@@ -413,25 +466,22 @@ class TestBlocked:
                 "reason": "lint-errors",
                 "escalation": False,
             },
-            headers=self._headers(env_vars),
+            headers=_headers(env_vars),
         )
         assert resp.status_code == 200
-        slack_calls = [
-            c for c in mock_httpx_post.post.call_args_list
-            if "slack" in str(c)
-        ]
-        slack_text = slack_calls[0][1]["json"]["text"]
+        slack_calls = _calls_to(mock_httpx_post, "hooks.slack.com")
+        slack_text = slack_calls[0].kwargs["json"]["text"]
         assert "blocked" in slack_text.lower()
         assert "lint-errors" in slack_text
 
-    def test_blocked_with_escalation_flag_uses_escalation_messaging(
+    async def test_blocked_with_escalation_flag_uses_escalation_messaging(
         self,
-        client: TestClient,
+        aclient: httpx.AsyncClient,
         env_vars: dict[str, str],
         mock_httpx_post: AsyncMock,
     ) -> None:
         """Escalation=true triggers remediation-limit-reached messaging."""
-        resp = client.post(
+        resp = await aclient.post(
             "/callbacks/blocked",
             json={
                 "pr_url": "https://github.com/org/repo/pull/17",
@@ -440,25 +490,22 @@ class TestBlocked:
                 "reason": "blocking-findings",
                 "escalation": True,
             },
-            headers=self._headers(env_vars),
+            headers=_headers(env_vars),
         )
         assert resp.status_code == 200
-        slack_calls = [
-            c for c in mock_httpx_post.post.call_args_list
-            if "slack" in str(c)
-        ]
-        slack_text = slack_calls[0][1]["json"]["text"]
+        slack_calls = _calls_to(mock_httpx_post, "hooks.slack.com")
+        slack_text = slack_calls[0].kwargs["json"]["text"]
         assert "remediation limit" in slack_text.lower()
         assert "human review" in slack_text.lower()
 
-    def test_blocked_with_max_remediation_reason_triggers_escalation(
+    async def test_blocked_with_max_remediation_reason_triggers_escalation(
         self,
-        client: TestClient,
+        aclient: httpx.AsyncClient,
         env_vars: dict[str, str],
         mock_httpx_post: AsyncMock,
     ) -> None:
         """reason='max-remediation-rounds' triggers escalation even without escalation=true."""
-        resp = client.post(
+        resp = await aclient.post(
             "/callbacks/blocked",
             json={
                 "pr_url": "https://github.com/org/repo/pull/18",
@@ -467,24 +514,21 @@ class TestBlocked:
                 "reason": "max-remediation-rounds",
                 "escalation": False,
             },
-            headers=self._headers(env_vars),
+            headers=_headers(env_vars),
         )
         assert resp.status_code == 200
-        slack_calls = [
-            c for c in mock_httpx_post.post.call_args_list
-            if "slack" in str(c)
-        ]
-        slack_text = slack_calls[0][1]["json"]["text"]
+        slack_calls = _calls_to(mock_httpx_post, "hooks.slack.com")
+        slack_text = slack_calls[0].kwargs["json"]["text"]
         assert "remediation limit" in slack_text.lower()
 
-    def test_blocked_escalation_clickup_mentions_manual_fix(
+    async def test_blocked_escalation_clickup_mentions_manual_fix(
         self,
-        client: TestClient,
+        aclient: httpx.AsyncClient,
         env_vars: dict[str, str],
         mock_httpx_post: AsyncMock,
     ) -> None:
         """Escalation ClickUp comment should tell the human to fix manually."""
-        resp = client.post(
+        resp = await aclient.post(
             "/callbacks/blocked",
             json={
                 "pr_url": "https://github.com/org/repo/pull/19",
@@ -493,26 +537,23 @@ class TestBlocked:
                 "reason": "max-remediation-rounds",
                 "escalation": True,
             },
-            headers=self._headers(env_vars),
+            headers=_headers(env_vars),
         )
         assert resp.status_code == 200
-        clickup_calls = [
-            c for c in mock_httpx_post.post.call_args_list
-            if "clickup.com" in str(c)
-        ]
+        clickup_calls = _calls_to(mock_httpx_post, "api.clickup.com")
         assert len(clickup_calls) == 1
-        clickup_body = clickup_calls[0][1]["json"]["comment_text"]
+        clickup_body = clickup_calls[0].kwargs["json"]["comment_text"]
         assert "fix manually" in clickup_body.lower()
         assert "2 rounds" in clickup_body
 
-    def test_blocked_without_task_id_skips_clickup(
+    async def test_blocked_without_task_id_skips_clickup(
         self,
-        client: TestClient,
+        aclient: httpx.AsyncClient,
         env_vars: dict[str, str],
         mock_httpx_post: AsyncMock,
     ) -> None:
         """When branch doesn't contain a task ID, ClickUp comment is skipped."""
-        resp = client.post(
+        resp = await aclient.post(
             "/callbacks/blocked",
             json={
                 "pr_url": "https://github.com/org/repo/pull/21",
@@ -520,12 +561,12 @@ class TestBlocked:
                 "branch": "feature/something",
                 "reason": "lint-errors",
             },
-            headers=self._headers(env_vars),
+            headers=_headers(env_vars),
         )
         assert resp.status_code == 200
         # Only Slack
         assert mock_httpx_post.post.call_count == 1
-        assert "slack" in str(mock_httpx_post.post.call_args_list[0]).lower()
+        assert len(_calls_to(mock_httpx_post, "hooks.slack.com")) == 1
 
 
 # ── _post_slack ───────────────────────────────────────────────────────────────
@@ -534,20 +575,18 @@ class TestBlocked:
 class TestPostSlack:
     """Tests for the _post_slack notification helper."""
 
-    @pytest.mark.asyncio
     async def test_post_slack_succeeds(
-        self, env_vars: dict[str, str], mock_httpx_post: AsyncMock
+        self, env_vars: dict[str, str], routes: _Routes
     ) -> None:
         """A successful Slack post should not raise any exception."""
         await _post_slack("test message")
-        mock_httpx_post.post.assert_called_once()
-        call_args = mock_httpx_post.post.call_args
-        assert call_args[0][0] == env_vars["SLACK_WEBHOOK_URL"]
-        payload = call_args[1]["json"]
+        assert len(routes.calls) == 1
+        request = routes.calls[0]
+        assert str(request.url) == env_vars["SLACK_WEBHOOK_URL"]
+        payload = json.loads(request.content)
         assert payload["text"] == "test message"
         assert payload["channel"] == env_vars["SLACK_CHANNEL"]
 
-    @pytest.mark.asyncio
     async def test_post_slack_skipped_when_url_not_configured(
         self, monkeypatch: pytest.MonkeyPatch
     ) -> None:
@@ -556,99 +595,49 @@ class TestPostSlack:
         # Should not raise
         await _post_slack("test message")
 
-    @pytest.mark.asyncio
     async def test_post_slack_http_error_does_not_raise(
-        self, env_vars: dict[str, str]
+        self, env_vars: dict[str, str], routes: _Routes
     ) -> None:
         """HTTP errors from Slack are logged and swallowed, never raised."""
-        mock_response = AsyncMock()
-        mock_response.status_code = 500
-        mock_response.text = "server error"
-        mock_response.raise_for_status = MagicMock(
-            side_effect=httpx.HTTPStatusError(
-                "Server Error",
-                request=httpx.Request("POST", "https://hooks.slack.com/test"),
-                response=httpx.Response(500, text="server error"),
-            )
-        )
-        mock_client = AsyncMock()
-        mock_client.post = AsyncMock(return_value=mock_response)
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=None)
-
-        with patch("httpx.AsyncClient", return_value=mock_client):
-            with patch("asyncio.sleep"):
-                # Must not raise
-                await _post_slack("test message")
+        routes.handlers["hooks.slack.com"] = _status(500)
+        with patch("asyncio.sleep"):
+            # Must not raise
+            await _post_slack("test message")
 
-    @pytest.mark.asyncio
     async def test_post_slack_request_error_does_not_raise(
-        self, env_vars: dict[str, str]
+        self, env_vars: dict[str, str], routes: _Routes
     ) -> None:
         """Network/connection errors from Slack are logged and swallowed."""
-        mock_client = AsyncMock()
-        mock_client.post = AsyncMock(
-            side_effect=httpx.RequestError(
-                "Connection refused",
-                request=httpx.Request("POST", "https://hooks.slack.com/test"),
-            )
-        )
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=None)
-
-        with patch("httpx.AsyncClient", return_value=mock_client):
-            with patch("asyncio.sleep"):
-                # Must not raise
-                await _post_slack("test message")
+        routes.handlers["hooks.slack.com"] = _raise_request_error
+        with patch("asyncio.sleep"):
+            # Must not raise
+            await _post_slack("test message")
 
-    @pytest.mark.asyncio
     async def test_post_slack_http_error_logs_at_warning_not_error(
-        self, env_vars: dict[str, str]
+        self, env_vars: dict[str, str], routes: _Routes
     ) -> None:
         """HTTP errors from Slack are logged at warning level, not error."""
         import structlog.testing
 
-        mock_client = AsyncMock()
-        mock_client.post = AsyncMock(
-            side_effect=httpx.HTTPStatusError(
-                "Server Error",
-                request=httpx.Request("POST", "https://hooks.slack.com/test"),
-                response=httpx.Response(500, text="server error"),
-            )
-        )
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=None)
-
-        with patch("httpx.AsyncClient", return_value=mock_client):
-            with patch("asyncio.sleep"):
-                with structlog.testing.capture_logs() as logs:
-                    await _post_slack("test message")
+        routes.handlers["hooks.slack.com"] = _status(500)
+        with patch("asyncio.sleep"):
+            with structlog.testing.capture_logs() as logs:
+                await _post_slack("test message")
 
         failure_logs = [lg for lg in logs if lg.get("event") == "slack_post_failed"]
         assert len(failure_logs) == 1
         assert failure_logs[0]["log_level"] == "warning"
 
-    @pytest.mark.asyncio
     async def test_post_slack_request_error_logs_at_warning_not_error(
-        self, env_vars: dict[str, str]
+        self, env_vars: dict[str, str], routes: _Routes
     ) -> None:
         """Network/connection errors from Slack are logged at warning level, not error."""
         import structlog.testing
 
-        mock_client = AsyncMock()
-        mock_client.post = AsyncMock(
-            side_effect=httpx.RequestError(
-                "Connection refused",
-                request=httpx.Request("POST", "https://hooks.slack.com/test"),
-            )
-        )
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=None)
-
-        with patch("httpx.AsyncClient", return_value=mock_client):
-            with patch("asyncio.sleep"):
-                with structlog.testing.capture_logs() as logs:
-                    await _post_slack("test message")
+        routes.handlers["hooks.slack.com"] = _raise_request_error
+        with patch("asyncio.sleep"):
+            with structlog.testing.capture_logs() as logs:
+                await _post_slack("test message")
 
         request_error_logs = [lg for lg in logs if lg.get("event") == "slack_request_error"]
         assert len(request_error_logs) == 1
@@ -661,19 +650,17 @@ class TestPostSlack:
 class TestPostClickUpComment:
     """Tests for the _post_clickup_comment notification helper."""
 
-    @pytest.mark.asyncio
     async def test_post_clickup_comment_succeeds(
-        self, env_vars: dict[str, str], mock_httpx_post: AsyncMock
+        self, env_vars: dict[str, str], routes: _Routes
     ) -> None:
         """A successful ClickUp comment should not raise any exception."""
         await _post_clickup_comment("task123", "Hello from agent")
-        mock_httpx_post.post.assert_called_once()
-        call_args = mock_httpx_post.post.call_args
-        assert "task123" in call_args[0][0]
-        assert call_args[1]["json"]["comment_text"] == "Hello from agent"
-        assert call_args[1]["headers"]["Authorization"] == env_vars["CLICKUP_API_TOKEN"]
+        assert len(routes.calls) == 1
+        request = routes.calls[0]
+        assert "task123" in request.url.path
+        assert json.loads(request.content)["comment_text"] == "Hello from agent"
+        assert request.headers["Authorization"] == env_vars["CLICKUP_API_TOKEN"]
 
-    @pytest.mark.asyncio
     async def test_post_clickup_comment_skipped_when_token_not_configured(
         self, monkeypatch: pytest.MonkeyPatch
     ) -> None:
@@ -682,105 +669,47 @@ class TestPostClickUpComment:
         # Should not raise
         await _post_clickup_comment("task123", "Hello")
 
-    @pytest.mark.asyncio
     async def test_post_clickup_comment_http_error_does_not_raise(
-        self, env_vars: dict[str, str]
+        self, env_vars: dict[str, str], routes: _Routes
     ) -> None:
         """HTTP errors from ClickUp are logged and swallowed, never raised."""
-        mock_response = AsyncMock()
-        mock_response.status_code = 403
-        mock_response.text = "forbidden"
-        mock_response.raise_for_status = MagicMock(
-            side_effect=httpx.HTTPStatusError(
-                "Forbidden",
-                request=httpx.Request(
-                    "POST", "https://api.clickup.com/api/v2/task/t/comment"
-                ),
-                response=httpx.Response(403, text="forbidden"),
-            )
-        )
-        mock_client = AsyncMock()
-        mock_client.post = AsyncMock(return_value=mock_response)
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=None)
-
-        with patch("httpx.AsyncClient", return_value=mock_client):
-            # Must not raise
-            await _post_clickup_comment("task123", "Hello")
+        routes.handlers["api.clickup.com"] = _status(403)
+        # Must not raise
+        await _post_clickup_comment("task123", "Hello")
 
-    @pytest.mark.asyncio
     async def test_post_clickup_comment_request_error_does_not_raise(
-        self, env_vars: dict[str, str]
+        self, env_vars: dict[str, str], routes: _Routes
     ) -> None:
         """Network/connection errors to ClickUp are logged and swallowed."""
-        mock_client = AsyncMock()
-        mock_client.post = AsyncMock(
-            side_effect=httpx.RequestError(
-                "DNS resolution failed",
-                request=httpx.Request(
-                    "POST", "https://api.clickup.com/api/v2/task/t/comment"
-                ),
-            )
-        )
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=None)
-
-        with patch("httpx.AsyncClient", return_value=mock_client):
-            with patch("asyncio.sleep"):
-                # Must not raise
-                await _post_clickup_comment("task123", "Hello")
+        routes.handlers["api.clickup.com"] = _raise_request_error
+        with patch("asyncio.sleep"):
+            # Must not raise
+            await _post_clickup_comment("task123", "Hello")
 
-    @pytest.mark.asyncio
     async def test_post_clickup_comment_http_error_logs_at_warning_not_error(
-        self, env_vars: dict[str, str]
+        self, env_vars: dict[str, str], routes: _Routes
     ) -> None:
         """HTTP errors from ClickUp are logged at warning level, not error."""
         import structlog.testing
 
-        mock_client = AsyncMock()
-        mock_client.post = AsyncMock(
-            side_effect=httpx.HTTPStatusError(
-                "Forbidden",
-                request=httpx.Request(
-                    "POST", "https://api.clickup.com/api/v2/task/t/comment"
-                ),
-                response=httpx.Response(403, text="forbidden"),
-            )
-        )
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=None)
-
-        with patch("httpx.AsyncClient", return_value=mock_client):
-            with structlog.testing.capture_logs() as logs:
-                await _post_clickup_comment("task123", "Hello")
+        routes.handlers["api.clickup.com"] = _status(403)
+        with structlog.testing.capture_logs() as logs:
+            await _post_clickup_comment("task123", "Hello")
 
         failure_logs = [lg for lg in logs if lg.get("event") == "clickup_comment_failed"]
         assert len(failure_logs) == 1
         assert failure_logs[0]["log_level"] == "warning"
 
-    @pytest.mark.asyncio
     async def test_post_clickup_comment_request_error_logs_at_warning_not_error(
-        self, env_vars: dict[str, str]
+        self, env_vars: dict[str, str], routes: _Routes
     ) -> None:
         """Network/connection errors to ClickUp are logged at warning level, not error."""
         import structlog.testing
 
-        mock_client = AsyncMock()
-        mock_client.post = AsyncMock(
-            side_effect=httpx.RequestError(
-                "DNS resolution failed",
-                request=httpx.Request(
-                    "POST", "https://api.clickup.com/api/v2/task/t/comment"
-                ),
-            )
-        )
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=None)
-
-        with patch("httpx.AsyncClient", return_value=mock_client):
-            with patch("asyncio.sleep"):
-                with structlog.testing.capture_logs() as logs:
-                    await _post_clickup_comment("task123", "Hello")
+        routes.handlers["api.clickup.com"] = _raise_request_error
+        with patch("asyncio.sleep"):
+            with structlog.testing.capture_logs() as logs:
+                await _post_clickup_comment("task123", "Hello")
 
         request_error_logs = [lg for lg in logs if lg.get("event") == "clickup_request_error"]
         assert len(request_error_logs) == 1
@@ -791,43 +720,27 @@ class TestPostClickUpComment:
 
 
 class TestExtractTaskIdFromBranch:
-    """Tests for branch-name-to-ClickUp-task-ID extraction."""
-
-    def test_standard_agent_branch(self) -> None:
-        """agent/cu-{id} is the expected format."""
-        assert _extract_task_id_from_branch("agent/cu-abc123def") == "abc123def"
-
-    def test_short_task_id(self) -> None:
-        """Short alphanumeric IDs should still be extracted."""
-        assert _extract_task_id_from_branch("agent/cu-86bx3m") == "86bx3m"
-
-    def test_main_branch_returns_empty(self) -> None:
-        """Non-agent branches should return empty string."""
-        assert _extract_task_id_from_branch("main") == ""
-
-    def test_empty_string_returns_empty(self) -> None:
-        """Empty branch name should return empty string."""
-        assert _extract_task_id_from_branch("") == ""
-
-    def test_feature_branch_returns_empty(self) -> None:
-        """Feature branches without cu- prefix return empty string."""
-        assert _extract_task_id_from_branch("feature/add-login") == ""
-
-    def test_branch_with_nested_slashes(self) -> None:
-        """Only the last segment after / is checked for cu- prefix."""
-        assert _extract_task_id_from_branch("refs/heads/agent/cu-task789") == "task789"
-
-    def test_branch_with_cu_prefix_no_slash(self) -> None:
-        """A branch like 'cu-xyz' (no slash) should still extract the ID."""
-        assert _extract_task_id_from_branch("cu-xyz") == "xyz"
-
-    def test_branch_with_cu_but_not_prefix(self) -> None:
-        """A segment containing 'cu-' but not starting with it returns empty."""
-        assert _extract_task_id_from_branch("agent/mycu-task") == ""
-
-    def test_branch_cu_with_empty_id(self) -> None:
-        """'cu-' with nothing after it returns empty string (the ID portion is empty)."""
-        assert _extract_task_id_from_branch("agent/cu-") == ""
+    """Tests for branch-name-to-ClickUp-task-ID extraction.
+
+    Only the last path segment is inspected, and it must start with ``cu-``.
+    """
+
+    @pytest.mark.parametrize(
+        ("branch", "expected"),
+        [
+            pytest.param("agent/cu-abc123def", "abc123def", id="standard_agent_branch"),
+            pytest.param("agent/cu-86bx3m", "86bx3m", id="short_task_id"),
+            pytest.param("main", "", id="main_branch"),
+            pytest.param("", "", id="empty_string"),
+            pytest.param("feature/add-login", "", id="feature_branch"),
+            pytest.param("refs/heads/agent/cu-task789", "task789", id="nested_slashes"),
+            pytest.param("cu-xyz", "xyz", id="cu_prefix_no_slash"),
+            pytest.param("agent/mycu-task", "", id="cu_not_prefix"),
+            pytest.param("agent/cu-", "", id="cu_with_empty_id"),
+        ],
+    )
+    def test_extract(self, branch: str, expected: str) -> None:
+        assert _extract_task_id_from_branch(branch) == expected
 
 
 # ── Pydantic model validation ─────────────────────────────────────────────────
@@ -859,11 +772,11 @@ class TestAgentCompletePayloadValidation:
         assert p.clickup_task_id == "t1"
         assert p.status == "success"
 
-    def test_valid_status_values(self) -> None:
+    @pytest.mark.parametrize("status", ["success", "failure", "cancelled", "unknown"])
+    def test_valid_status_values(self, status: str) -> None:
         """All four valid status values should be accepted."""
-        for s in ("success", "failure", "cancelled", "unknown"):
-            p = AgentCompletePayload(clickup_task_id="t", status=s)
-            assert p.status == s
+        p = AgentCompletePayload(clickup_task_id="t", status=status)
+        assert p.status == status
 
     def test_invalid_status_rejected(self) -> None:
         """An invalid status value should raise a validation error."""
@@ -958,72 +871,41 @@ class TestRetryBehavior:
 
     # ── _post_slack retry tests ────────────────────────────────────────────────
 
-    @pytest.mark.asyncio
     async def test_slack_succeeds_on_first_attempt_no_retry(
-        self, env_vars: dict[str, str]
+        self, env_vars: dict[str, str], routes: _Routes
     ) -> None:
         """No sleep occurs when the first Slack attempt succeeds."""
-        success_response = MagicMock()
-        success_response.raise_for_status = MagicMock()
+        with patch("asyncio.sleep") as mock_sleep:
+            await _post_slack("hello")
 
-        mock_client = AsyncMock()
-        mock_client.post = AsyncMock(return_value=success_response)
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=None)
-
-        with patch("httpx.AsyncClient", return_value=mock_client):
-            with patch("asyncio.sleep") as mock_sleep:
-                await _post_slack("hello")
-
-        mock_client.post.assert_called_once()
+        assert len(routes.calls) == 1
         mock_sleep.assert_not_called()
 
-    @pytest.mark.asyncio
     async def test_slack_succeeds_on_second_attempt_after_network_error(
-        self, env_vars: dict[str, str]
+        self, env_vars: dict[str, str], routes: _Routes
     ) -> None:
         """Slack retries once after a network error and succeeds on the second attempt."""
-        request_error = httpx.RequestError(
-            "connection refused",
-            request=httpx.Request("POST", "https://hooks.slack.com/test"),
-        )
-        success_response = MagicMock()
-        success_response.raise_for_status = MagicMock()
-
-        mock_client = AsyncMock()
-        mock_client.post = AsyncMock(side_effect=[request_error, success_response])
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=None)
+        routes.handlers["hooks.slack.com"] = _sequence(_raise_request_error, _ok)
 
-        with patch("httpx.AsyncClient", return_value=mock_client):
-            with patch("asyncio.sleep") as mock_sleep:
-                await _post_slack("hello")
+        with patch("asyncio.sleep") as mock_sleep:
+            await _post_slack("hello")
 
-        assert mock_client.post.call_count == 2
+        assert len(routes.calls) == 2
         mock_sleep.assert_called_once_with(1.0)
 
-    @pytest.mark.asyncio
     async def test_slack_all_retries_exhausted_logs_warning(
-        self, env_vars: dict[str, str]
+        self, env_vars: dict[str, str], routes: _Routes
     ) -> None:
         """After 3 failed Slack attempts, a warning is logged and no exception is raised."""
         import structlog.testing
 
-        request_error = httpx.RequestError(
-            "connection refused",
-            request=httpx.Request("POST", "https://hooks.slack.com/test"),
-        )
-        mock_client = AsyncMock()
-        mock_client.post = AsyncMock(side_effect=request_error)
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=None)
+        routes.handlers["hooks.slack.com"] = _raise_request_error
 
-        with patch("httpx.AsyncClient", return_value=mock_client):
-            with patch("asyncio.sleep") as mock_sleep:
-                with structlog.testing.capture_logs() as logs:
-                    await _post_slack("hello")
+        with patch("asyncio.sleep") as mock_sleep:
+            with structlog.testing.capture_logs() as logs:
+                await _post_slack("hello")
 
-        assert mock_client.post.call_count == 3
+        assert len(routes.calls) == 3
         assert mock_sleep.call_count == 2
         mock_sleep.assert_any_call(1.0)
         mock_sleep.assert_any_call(2.0)
@@ -1031,132 +913,67 @@ class TestRetryBehavior:
         assert len(warning_logs) == 1
         assert warning_logs[0]["event"] == "slack_request_error"
 
-    @pytest.mark.asyncio
     async def test_slack_retries_on_429_then_succeeds(
-        self, env_vars: dict[str, str]
+        self, env_vars: dict[str, str], routes: _Routes
     ) -> None:
         """A 429 rate-limit response triggers a retry and the second attempt succeeds."""
-        rate_limit_response = MagicMock()
-        rate_limit_response.raise_for_status = MagicMock(
-            side_effect=httpx.HTTPStatusError(
-                "Rate Limited",
-                request=httpx.Request("POST", "https://hooks.slack.com/test"),
-                response=httpx.Response(429, text="rate limited"),
-            )
-        )
-        success_response = MagicMock()
-        success_response.raise_for_status = MagicMock()
+        routes.handlers["hooks.slack.com"] = _sequence(_status(429), _ok)
 
-        mock_client = AsyncMock()
-        mock_client.post = AsyncMock(side_effect=[rate_limit_response, success_response])
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=None)
+        with patch("asyncio.sleep") as mock_sleep:
+            await _post_slack("hello")
 
-        with patch("httpx.AsyncClient", return_value=mock_client):
-            with patch("asyncio.sleep") as mock_sleep:
-                await _post_slack("hello")
-
-        assert mock_client.post.call_count == 2
+        assert len(routes.calls) == 2
         mock_sleep.assert_called_once_with(1.0)
 
-    @pytest.mark.asyncio
     async def test_slack_does_not_retry_on_4xx_client_error(
-        self, env_vars: dict[str, str]
+        self, env_vars: dict[str, str], routes: _Routes
     ) -> None:
         """4xx responses other than 429 are not retried — only the single attempt is made."""
-        forbidden_response = MagicMock()
-        forbidden_response.raise_for_status = MagicMock(
-            side_effect=httpx.HTTPStatusError(
-                "Forbidden",
-                request=httpx.Request("POST", "https://hooks.slack.com/test"),
-                response=httpx.Response(403, text="forbidden"),
-            )
-        )
-        mock_client = AsyncMock()
-        mock_client.post = AsyncMock(return_value=forbidden_response)
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=None)
+        routes.handlers["hooks.slack.com"] = _status(403)
 
-        with patch("httpx.AsyncClient", return_value=mock_client):
-            with patch("asyncio.sleep") as mock_sleep:
-                await _post_slack("hello")
+        with patch("asyncio.sleep") as mock_sleep:
+            await _post_slack("hello")
 
-        mock_client.post.assert_called_once()
+        assert len(routes.calls) == 1
         mock_sleep.assert_not_called()
 
     # ── _post_clickup_comment retry tests ─────────────────────────────────────
 
-    @pytest.mark.asyncio
     async def test_clickup_succeeds_on_first_attempt_no_retry(
-        self, env_vars: dict[str, str]
+        self, env_vars: dict[str, str], routes: _Routes
     ) -> None:
         """No sleep occurs when the first ClickUp attempt succeeds."""
-        success_response = MagicMock()
-        success_response.raise_for_status = MagicMock()
-
-        mock_client = AsyncMock()
-        mock_client.post = AsyncMock(return_value=success_response)
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=None)
+        with patch("asyncio.sleep") as mock_sleep:
+            await _post_clickup_comment("task123", "hello")
 
-        with patch("httpx.AsyncClient", return_value=mock_client):
-            with patch("asyncio.sleep") as mock_sleep:
-                await _post_clickup_comment("task123", "hello")
-
-        mock_client.post.assert_called_once()
+        assert len(routes.calls) == 1
         mock_sleep.assert_not_called()
 
-    @pytest.mark.asyncio
     async def test_clickup_succeeds_on_second_attempt_after_network_error(
-        self, env_vars: dict[str, str]
+        self, env_vars: dict[str, str], routes: _Routes
     ) -> None:
         """ClickUp retries once after a network error and succeeds on the second attempt."""
-        request_error = httpx.RequestError(
-            "DNS resolution failed",
-            request=httpx.Request(
-                "POST", "https://api.clickup.com/api/v2/task/task123/comment"
-            ),
-        )
-        success_response = MagicMock()
-        success_response.raise_for_status = MagicMock()
-
-        mock_client = AsyncMock()
-        mock_client.post = AsyncMock(side_effect=[request_error, success_response])
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=None)
+        routes.handlers["api.clickup.com"] = _sequence(_raise_request_error, _ok)
 
-        with patch("httpx.AsyncClient", return_value=mock_client):
-            with patch("asyncio.sleep") as mock_sleep:
-                await _post_clickup_comment("task123", "hello")
+        with patch("asyncio.sleep") as mock_sleep:
+            await _post_clickup_comment("task123", "hello")
 
-        assert mock_client.post.call_count == 2
+        assert len(routes.calls) == 2
         mock_sleep.assert_called_once_with(1.0)
 
-    @pytest.mark.asyncio
     async def test_clickup_all_retries_exhausted_logs_warning(
-        self, env_vars: dict[str, str]
+        self, env_vars: dict[str, str], routes: _Routes
     ) -> None:
         """After 3 failed ClickUp attempts, a warning is logged and no exception is raised."""
         import structlog.testing
 
-        server_error = httpx.HTTPStatusError(
-            "Internal Server Error",
-            request=httpx.Request(
-                "POST", "https://api.clickup.com/api/v2/task/task123/comment"
-            ),
-            response=httpx.Response(500, text="server error"),
-        )
-        mock_client = AsyncMock()
-        mock_client.post = AsyncMock(side_effect=server_error)
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=None)
+        routes.handlers["api.clickup.com"] = _status(500)
 
-        with patch("httpx.AsyncClient", return_value=mock_client):
-            with patch("asyncio.sleep") as mock_sleep:
-                with structlog.testing.capture_logs() as logs:
-                    await _post_clickup_comment("task123", "hello")
+        with patch("asyncio.sleep") as mock_sleep:
+            with structlog.testing.capture_logs() as logs:
+                await _post_clickup_comment("task123", "hello")
 
-        assert mock_client.post.call_count == 3
+        assert len(routes.calls) == 3
         assert mock_sleep.call_count == 2
         mock_sleep.assert_any_call(1.0)
         mock_sleep.assert_any_call(2.0)
@@ -14,7 +14,7 @@ from __future__ import annotations
 import hashlib
 import hmac
 import json
-import time
+from collections.abc import Callable
 from typing import Any
 
 import pytest
@@ -22,6 +22,22 @@ from fastapi.testclient import TestClient
 
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
+_NS = 1_000_000_000  # _DedupeCache keeps monotonic_ns ticks; tests fake whole seconds
+
+
+class _FakeClock:
+    """Manually advanced stand-in for time.monotonic_ns, injected into _DedupeCache."""
+
+    def __init__(self, start_seconds: int = 1000) -> None:
+        self.now = start_seconds * _NS
+
+    def __call__(self) -> int:
+        return self.now
+
+    def advance(self, seconds: int) -> None:
+        self.now += seconds * _NS
+
+
 def _compute_hmac(body: bytes, secret: str) -> str:
     """Compute HMAC-SHA256 hex digest matching ClickUp's webhook signature format."""
     return hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
@@ -105,51 +121,39 @@ class TestValidWebhook:
 # ── 2. Invalid HMAC signature returns 401 ────────────────────────────────────
 
 class TestInvalidSignature:
-    """Requests with wrong or tampered signatures are rejected."""
+    """Requests with wrong, tampered or missing signatures are rejected."""
 
-    def test_wrong_secret_returns_401(
-        self, client: TestClient, env_vars: dict[str, str]
+    @pytest.mark.parametrize(
+        "make_headers",
+        [
+            pytest.param(
+                lambda body, secret: {"X-Signature": _compute_hmac(body, "wrong-secret-value")},
+                id="wrong_secret",
+            ),
+            pytest.param(
+                # Signature computed for one body, but a different body is sent
+                lambda body, secret: {"X-Signature": _compute_hmac(b"{}", secret)},
+                id="tampered_body",
+            ),
+            pytest.param(lambda body, secret: {}, id="missing_x_signature_header"),
+        ],
+    )
+    def test_rejected_with_401(
+        self,
+        client: TestClient,
+        env_vars: dict[str, str],
+        make_headers: Callable[[bytes, str], dict[str, str]],
     ) -> None:
-        payload = _make_tag_updated_payload()
-        resp = _post_clickup(client, payload, secret="wrong-secret-value")
+        body = json.dumps(_make_tag_updated_payload(task_id="tampered")).encode()
+        headers = {
+            "Content-Type": "application/json",
+            **make_headers(body, env_vars["CLICKUP_WEBHOOK_SECRET"]),
+        }
+        resp = client.post("/webhooks/clickup", content=body, headers=headers)
 
         assert resp.status_code == 401
         assert "Invalid webhook signature" in resp.json()["detail"]
 
-    def test_tampered_body_returns_401(
-        self, client: TestClient, env_vars: dict[str, str]
-    ) -> None:
-        """Signature computed for one body, but a different body is sent."""
-        payload = _make_tag_updated_payload(task_id="original")
-        original_body = json.dumps(payload).encode()
-        signature = _compute_hmac(original_body, env_vars["CLICKUP_WEBHOOK_SECRET"])
-
-        tampered_payload = _make_tag_updated_payload(task_id="tampered")
-        tampered_body = json.dumps(tampered_payload).encode()
-
-        resp = client.post(
-            "/webhooks/clickup",
-            content=tampered_body,
-            headers={
-                "Content-Type": "application/json",
-                "X-Signature": signature,
-            },
-        )
-        assert resp.status_code == 401
-
-    def test_missing_x_signature_header_returns_401(
-        self, client: TestClient, env_vars: dict[str, str]
-    ) -> None:
-        """When CLICKUP_WEBHOOK_SECRET is set but no X-Signature header is provided."""
-        payload = _make_tag_updated_payload()
-        body = json.dumps(payload).encode()
-        resp = client.post(
-            "/webhooks/clickup",
-            content=body,
-            headers={"Content-Type": "application/json"},
-        )
-        assert resp.status_code == 401
-
 
 # ── 3. Missing CLICKUP_WEBHOOK_SECRET allows request (logs warning) ──────────
 
@@ -250,10 +254,26 @@ class TestEventFiltering:
 class TestTagFiltering:
     """taskTagUpdated events are only dispatched if the ai-agent tag was added."""
 
-    def test_different_tag_is_ignored(
-        self, client: TestClient, env_vars: dict[str, str]
+    @pytest.mark.parametrize(
+        "history_items",
+        [
+            pytest.param([{"field": "tag", "after": {"name": "urgent"}}], id="different_tag"),
+            pytest.param([], id="empty_history_items"),
+            pytest.param(
+                [{"field": "tag", "before": {"name": "ai-agent"}}], id="no_after_field"
+            ),
+            # after is a string instead of a dict — should not match
+            pytest.param([{"field": "tag", "after": "ai-agent"}], id="after_not_dict"),
+        ],
+    )
+    def test_without_ai_agent_tag_is_ignored(
+        self,
+        client: TestClient,
+        env_vars: dict[str, str],
+        history_items: list[dict[str, Any]],
     ) -> None:
-        payload = _make_tag_updated_payload(tag_name="urgent")
+        payload = _make_tag_updated_payload(task_id="task-no-ai-agent")
+        payload["history_items"] = history_items
         resp = _post_clickup(client, payload, secret=env_vars["CLICKUP_WEBHOOK_SECRET"])
 
         assert resp.status_code == 200
@@ -261,53 +281,6 @@ class TestTagFiltering:
         assert data["action"] == "ignored"
         assert data["reason"] == "ai_agent_tag_not_added"
 
-    def test_empty_history_items_is_ignored(
-        self, client: TestClient, env_vars: dict[str, str]
-    ) -> None:
-        payload = {
-            "event": "taskTagUpdated",
-            "webhook_id": "wh-test-002",
-            "task_id": "task-no-history",
-            "history_items": [],
-        }
-        resp = _post_clickup(client, payload, secret=env_vars["CLICKUP_WEBHOOK_SECRET"])
-
-        assert resp.status_code == 200
-        assert resp.json()["reason"] == "ai_agent_tag_not_added"
-
-    def test_history_item_with_no_after_field_is_ignored(
-        self, client: TestClient, env_vars: dict[str, str]
-    ) -> None:
-        payload = {
-            "event": "taskTagUpdated",
-            "webhook_id": "wh-test-003",
-            "task_id": "task-no-after",
-            "history_items": [
-                {"field": "tag", "before": {"name": "ai-agent"}},
-            ],
-        }
-        resp = _post_clickup(client, payload, secret=env_vars["CLICKUP_WEBHOOK_SECRET"])
-
-        assert resp.status_code == 200
-        assert resp.json()["reason"] == "ai_agent_tag_not_added"
-
-    def test_history_item_with_after_not_dict_is_ignored(
-        self, client: TestClient, env_vars: dict[str, str]
-    ) -> None:
-        """after field is a string instead of a dict — should not match."""
-        payload = {
-            "event": "taskTagUpdated",
-            "webhook_id": "wh-test-004",
-            "task_id": "task-after-string",
-            "history_items": [
-                {"field": "tag", "after": "ai-agent"},
-            ],
-        }
-        resp = _post_clickup(client, payload, secret=env_vars["CLICKUP_WEBHOOK_SECRET"])
-
-        assert resp.status_code == 200
-        assert resp.json()["reason"] == "ai_agent_tag_not_added"
-
 
 # ── 6. Duplicate webhook (same task_id sent twice) returns ignored ───────────
 
@@ -424,16 +397,53 @@ class TestVerifyClickupSignature:
 
         assert _verify_clickup_signature(body, signature, wrong_secret) is False
 
-    def test_signature_is_case_sensitive_hex(self) -> None:
+    def test_rotated_secret_takes_effect_immediately(self) -> None:
+        """The pre-keyed HMAC cache is keyed by secret, so rotation needs no cache clear."""
+        from apps.orchestrator.routers.clickup import _verify_clickup_signature
+
+        body = b'{"event":"test"}'
+        old_signature = _compute_hmac(body, "old-secret")
+        assert _verify_clickup_signature(body, old_signature, "old-secret") is True
+
+        new_signature = _compute_hmac(body, "new-secret")
+        assert _verify_clickup_signature(body, new_signature, "new-secret") is True
+        assert _verify_clickup_signature(body, old_signature, "new-secret") is False
+
+    def test_uppercase_hex_signature_matches(self) -> None:
+        """The header is decoded to raw digest bytes, so hex case does not matter."""
+        from apps.orchestrator.routers.clickup import _verify_clickup_signature
+
+        body = b'{"event":"test"}'
+        secret = "secret"
+        signature = _compute_hmac(body, secret)
+
+        assert _verify_clickup_signature(body, signature.upper(), secret) is True
+
+    def test_truncated_signature_returns_false(self) -> None:
         from apps.orchestrator.routers.clickup import _verify_clickup_signature
 
         body = b'{"event":"test"}'
         secret = "secret"
         signature = _compute_hmac(body, secret)
 
-        # HMAC hexdigest is lowercase — uppercase should still match via compare_digest
-        # since hexdigest() always returns lowercase, an uppercase version should not match
-        assert _verify_clickup_signature(body, signature.upper(), secret) is False
+        assert _verify_clickup_signature(body, signature[:32], secret) is False
+
+    def test_non_ascii_signature_returns_false(self) -> None:
+        from apps.orchestrator.routers.clickup import _verify_clickup_signature
+
+        assert _verify_clickup_signature(b"{}", "\u00e9" * 64, "secret") is False
+
+    def test_signature_with_whitespace_returns_false(self) -> None:
+        """bytes.fromhex() skips spaces; the verifier must not."""
+        from apps.orchestrator.routers.clickup import _verify_clickup_signature
+
+        body = b'{"event":"test"}'
+        secret = "secret"
+        signature = _compute_hmac(body, secret)
+        spaced = " ".join(signature[i : i + 2] for i in range(0, len(signature), 2))
+
+        assert _verify_clickup_signature(body, spaced, secret) is False
+        assert _verify_clickup_signature(body, f" {signature}", secret) is False
 
 
 # ── 9. _DedupeCache: unit tests ─────────────────────────────────────────────
@@ -493,76 +503,83 @@ class TestDedupeCache:
         assert cache.is_duplicate("third") is True
         assert cache.is_duplicate("fourth") is True
 
-    def test_ttl_expiry_makes_key_not_duplicate(self, monkeypatch: pytest.MonkeyPatch) -> None:
+    def test_duplicate_hit_protects_key_from_eviction(self) -> None:
+        """A key seen again moves to the recent end, so the next eviction skips it."""
         from apps.orchestrator.routers.clickup import _DedupeCache
 
-        cache = _DedupeCache(max_size=100, ttl_seconds=60)
+        cache = _DedupeCache(max_size=2, ttl_seconds=3600)
+        cache.mark_seen("retried")
+        cache.mark_seen("other")
+        assert cache.is_duplicate("retried") is True  # promotes "retried"
+        cache.mark_seen("new")  # evicts "other", the least recently used
+
+        assert cache.is_duplicate("retried") is True
+        assert cache.is_duplicate("other") is False
+        assert cache.is_duplicate("new") is True
+
+    def test_ttl_expiry_makes_key_not_duplicate(self) -> None:
+        from apps.orchestrator.routers.clickup import _DedupeCache
+
+        clock = _FakeClock()
+        cache = _DedupeCache(max_size=100, ttl_seconds=60, clock=clock)
 
-        # Mark seen at time T
-        fake_time = 1000.0
-        monkeypatch.setattr(time, "time", lambda: fake_time)
         cache.mark_seen("expiring-key")
         assert cache.is_duplicate("expiring-key") is True
 
-        # Advance past TTL
-        fake_time = 1061.0  # 61 seconds later, past the 60s TTL
-        monkeypatch.setattr(time, "time", lambda: fake_time)
+        clock.advance(61)  # past the 60s TTL
         assert cache.is_duplicate("expiring-key") is False
 
-    def test_ttl_not_yet_expired_is_still_duplicate(self, monkeypatch: pytest.MonkeyPatch) -> None:
+    def test_ttl_not_yet_expired_is_still_duplicate(self) -> None:
         from apps.orchestrator.routers.clickup import _DedupeCache
 
-        cache = _DedupeCache(max_size=100, ttl_seconds=60)
-
-        fake_time = 1000.0
-        monkeypatch.setattr(time, "time", lambda: fake_time)
+        clock = _FakeClock()
+        cache = _DedupeCache(max_size=100, ttl_seconds=60, clock=clock)
         cache.mark_seen("key")
 
-        # Advance but NOT past TTL
-        fake_time = 1059.0  # 59 seconds later, still within 60s TTL
-        monkeypatch.setattr(time, "time", lambda: fake_time)
+        clock.advance(59)  # still within the 60s TTL
         assert cache.is_duplicate("key") is True
 
-    def test_expired_entry_is_removed_from_cache(self, monkeypatch: pytest.MonkeyPatch) -> None:
+    def test_expired_entry_is_removed_from_cache(self) -> None:
         """After TTL expiry, is_duplicate removes the expired entry from the internal dict."""
         from apps.orchestrator.routers.clickup import _DedupeCache
 
-        cache = _DedupeCache(max_size=100, ttl_seconds=10)
-
-        fake_time = 1000.0
-        monkeypatch.setattr(time, "time", lambda: fake_time)
+        clock = _FakeClock()
+        cache = _DedupeCache(max_size=100, ttl_seconds=10, clock=clock)
         cache.mark_seen("cleanup-key")
         assert "cleanup-key" in cache._cache
 
-        fake_time = 1011.0
-        monkeypatch.setattr(time, "time", lambda: fake_time)
+        clock.advance(11)
         cache.is_duplicate("cleanup-key")  # triggers removal
         assert "cleanup-key" not in cache._cache
 
-    def test_re_marking_after_expiry_refreshes_entry(self, monkeypatch: pytest.MonkeyPatch) -> None:
+    def test_re_marking_after_expiry_refreshes_entry(self) -> None:
         from apps.orchestrator.routers.clickup import _DedupeCache
 
-        cache = _DedupeCache(max_size=100, ttl_seconds=60)
-
-        # Mark at T=1000
-        fake_time = 1000.0
-        monkeypatch.setattr(time, "time", lambda: fake_time)
+        clock = _FakeClock()
+        cache = _DedupeCache(max_size=100, ttl_seconds=60, clock=clock)
         cache.mark_seen("refresh-key")
 
-        # Expire at T=1061
-        fake_time = 1061.0
-        monkeypatch.setattr(time, "time", lambda: fake_time)
+        clock.advance(61)  # expired
         assert cache.is_duplicate("refresh-key") is False
 
-        # Re-mark at T=1061
         cache.mark_seen("refresh-key")
         assert cache.is_duplicate("refresh-key") is True
 
-        # Still valid at T=1120 (59s after re-mark)
-        fake_time = 1120.0
-        monkeypatch.setattr(time, "time", lambda: fake_time)
+        clock.advance(59)  # 59s after the re-mark
         assert cache.is_duplicate("refresh-key") is True
 
+    def test_default_clock_tracks_ttl(self) -> None:
+        """Without an injected clock, TTLs are still honoured against real time."""
+        from apps.orchestrator.routers.clickup import _DedupeCache
+
+        live = _DedupeCache(ttl_seconds=3600)
+        live.mark_seen("live-key")
+        assert live.is_duplicate("live-key") is True
+
+        expired = _DedupeCache(ttl_seconds=0)
+        expired.mark_seen("expired-key")
+        assert expired.is_duplicate("expired-key") is False
+
 
 # ── 10. _extract_task_id_from_branch ─────────────────────────────────────────
 
@@ -628,7 +645,7 @@ class TestDedupeCacheConfiguration:
 
         monkeypatch.setenv("DEDUP_CACHE_TTL_SECONDS", "120")
         cache = clickup_module._get_dedupe_cache()
-        assert cache._ttl == 120
+        assert cache._ttl_ns == 120 * _NS
 
     def test_default_max_size_when_env_not_set(self, monkeypatch: pytest.MonkeyPatch) -> None:
         import apps.orchestrator.routers.clickup as clickup_module
@@ -642,7 +659,7 @@ class TestDedupeCacheConfiguration:
 
         monkeypatch.delenv("DEDUP_CACHE_TTL_SECONDS", raising=False)
         cache = clickup_module._get_dedupe_cache()
-        assert cache._ttl == 3600
+        assert cache._ttl_ns == 3600 * _NS
 
     def test_invalid_max_size_falls_back_to_default(self, monkeypatch: pytest.MonkeyPatch) -> None:
         import apps.orchestrator.routers.clickup as clickup_module
@@ -656,7 +673,7 @@ class TestDedupeCacheConfiguration:
 
         monkeypatch.setenv("DEDUP_CACHE_TTL_SECONDS", "abc")
         cache = clickup_module._get_dedupe_cache()
-        assert cache._ttl == 3600
+        assert cache._ttl_ns == 3600 * _NS
 
     def test_empty_max_size_uses_default(self, monkeypatch: pytest.MonkeyPatch) -> None:
         import apps.orchestrator.routers.clickup as clickup_module
@@ -670,7 +687,7 @@ class TestDedupeCacheConfiguration:
 
         monkeypatch.setenv("DEDUP_CACHE_TTL_SECONDS", "")
         cache = clickup_module._get_dedupe_cache()
-        assert cache._ttl == 3600
+        assert cache._ttl_ns == 3600 * _NS
 
     def test_configured_max_size_enforced_on_eviction(
         self, monkeypatch: pytest.MonkeyPatch
@@ -689,19 +706,24 @@ class TestDedupeCacheConfiguration:
         assert cache.is_duplicate("y") is True
         assert cache.is_duplicate("z") is True
 
-    def test_configured_ttl_enforced(self, monkeypatch: pytest.MonkeyPatch) -> None:
-        """A cache initialized with TTL=10 expires keys after 10 seconds."""
+    def test_configured_ttl_read_from_env(self, monkeypatch: pytest.MonkeyPatch) -> None:
         import apps.orchestrator.routers.clickup as clickup_module
 
         monkeypatch.setenv("DEDUP_CACHE_TTL_SECONDS", "10")
         cache = clickup_module._get_dedupe_cache()
+        assert cache._ttl_ns == 10 * _NS
+
+    def test_configured_ttl_enforced(self) -> None:
+        """A cache built with TTL=10 expires keys after 10 seconds."""
+        from apps.orchestrator.routers.clickup import _DedupeCache
+
+        clock = _FakeClock(start_seconds=2000)
+        cache = _DedupeCache(ttl_seconds=10, clock=clock)
 
-        fake_time = 2000.0
-        monkeypatch.setattr(time, "time", lambda: fake_time)
         cache.mark_seen("ttl-test-key")
         assert cache.is_duplicate("ttl-test-key") is True
 
-        fake_time = 2011.0  # 11 seconds later, past the 10s TTL
+        clock.advance(11)  # past the 10s TTL
         assert cache.is_duplicate("ttl-test-key") is False
 
 
@@ -2,14 +2,22 @@
 
 from __future__ import annotations
 
+import json
+from collections.abc import Callable, Iterator
 from pathlib import Path
+from typing import Any
 from unittest.mock import AsyncMock
 
+import httpx
 import pytest
 
 from apps.runner.main import _execute_task, _tasks, audit_log, reset_breakers
 from apps.runner.models import RunnerResult, RunnerTask, TaskState
 
+# asyncio_mode = "auto" collects the async tests; one event loop serves the whole
+# module since none of these tests do real I/O or leave tasks behind.
+pytestmark = pytest.mark.asyncio(loop_scope="module")
+
 
 @pytest.fixture(autouse=True)
 def _clear() -> None:
@@ -30,11 +38,27 @@ def _make_task(callback_url: str | None = None, task_id: str = "cb-test-001") ->
     )
 
 
-def _setup_mocks(monkeypatch: pytest.MonkeyPatch) -> AsyncMock:
-    """Patch workspace + engine to avoid real git/CLI calls. Returns the fake engine."""
-    async def fake_create_workspace(*args: object, **kwargs: object) -> Path:
-        return Path("/tmp/fake")  # noqa: S108
+async def _fake_create_workspace(*args: object, **kwargs: object) -> Path:
+    return Path("/tmp/fake")  # noqa: S108
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _patch_workspace() -> Iterator[None]:
+    """Stub out git/workspace/error-router calls once for the whole module.
 
+    These stubs are identical for every test; only the engine varies (see _setup_mocks).
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("apps.runner.main.create_workspace", _fake_create_workspace)
+        mp.setattr("apps.runner.main.cleanup_workspace", AsyncMock())
+        mp.setattr("apps.runner.main.commit_changes", AsyncMock(return_value=None))
+        mp.setattr("apps.runner.main.list_changed_files", AsyncMock(return_value=[]))
+        mp.setattr("apps.runner.main._error_router.handle", AsyncMock())
+        yield
+
+
+def _setup_mocks(monkeypatch: pytest.MonkeyPatch) -> AsyncMock:
+    """Install a fresh fake engine to avoid real CLI calls. Returns the fake engine."""
     fake_engine = AsyncMock()
     fake_engine.name = "claude-code"
     fake_engine.run.return_value = RunnerResult(
@@ -46,66 +70,68 @@ def _setup_mocks(monkeypatch: pytest.MonkeyPatch) -> AsyncMock:
         duration_ms=1000,
     )
 
-    monkeypatch.setattr("apps.runner.main.create_workspace", fake_create_workspace)
-    monkeypatch.setattr("apps.runner.main.cleanup_workspace", AsyncMock())
-    monkeypatch.setattr("apps.runner.main.commit_changes", AsyncMock(return_value=None))
-    monkeypatch.setattr("apps.runner.main.list_changed_files", AsyncMock(return_value=[]))
     monkeypatch.setattr("apps.runner.main.select_engine", lambda **kw: fake_engine)
-    monkeypatch.setattr("apps.runner.main._error_router.handle", AsyncMock())
 
     return fake_engine
 
 
-@pytest.mark.asyncio
-async def test_callback_posts_lifecycle_events(monkeypatch: pytest.MonkeyPatch) -> None:
-    """When callback_url is set, runner POSTs lifecycle events."""
-    collected: list[dict] = []
+# Captured before any test swaps httpx.AsyncClient for a MockTransport-backed factory.
+_RealAsyncClient = httpx.AsyncClient
+
+
+def _install_transport(
+    monkeypatch: pytest.MonkeyPatch, handler: Callable[[httpx.Request], httpx.Response]
+) -> None:
+    """Route every httpx.AsyncClient the runner opens through an in-process MockTransport."""
+    transport = httpx.MockTransport(handler)
+
+    def _client(**kwargs: Any) -> httpx.AsyncClient:
+        return _RealAsyncClient(transport=transport, **kwargs)
+
+    monkeypatch.setattr("httpx.AsyncClient", _client)
+
+
+@pytest.fixture
+def callbacks(monkeypatch: pytest.MonkeyPatch) -> list[dict[str, Any]]:
+    """Fake engine plus a recording webhook; returns the decoded callback payloads in order."""
+    collected: list[dict[str, Any]] = []
 
-    async def fake_post(self: object, url: str, *, json: dict, **kwargs: object) -> object:
-        collected.append(json)
-        mock_resp = AsyncMock()
-        mock_resp.status_code = 200
-        return mock_resp
+    def record(request: httpx.Request) -> httpx.Response:
+        collected.append(json.loads(request.content))
+        return httpx.Response(200)
 
-    monkeypatch.setattr("httpx.AsyncClient.post", fake_post)
+    _install_transport(monkeypatch, record)
     _setup_mocks(monkeypatch)
+    return collected
 
+
+async def test_callback_posts_lifecycle_events(callbacks: list[dict[str, Any]]) -> None:
+    """When callback_url is set, runner POSTs lifecycle events."""
     task = _make_task(callback_url="http://localhost:3000/api/tasks/cb-test-001/webhook")
     state = TaskState(task=task)
 
     await _execute_task(state)
 
-    types = [c["type"] for c in collected]
+    types = [c["type"] for c in callbacks]
     assert "status" in types, f"Expected 'status' callback, got: {types}"
     assert "complete" in types or "failed" in types, f"Expected terminal callback, got: {types}"
 
 
-@pytest.mark.asyncio
-async def test_no_callback_when_url_not_set(monkeypatch: pytest.MonkeyPatch) -> None:
+async def test_no_callback_when_url_not_set(callbacks: list[dict[str, Any]]) -> None:
     """When callback_url is None, no HTTP posts are made."""
-    post_called = False
-
-    async def spy_post(self: object, url: str, *, json: dict, **kwargs: object) -> None:
-        nonlocal post_called
-        post_called = True
-
-    monkeypatch.setattr("httpx.AsyncClient.post", spy_post)
-    _setup_mocks(monkeypatch)
-
     task = _make_task(callback_url=None)
     state = TaskState(task=task)
     await _execute_task(state)
 
-    assert not post_called, "Should not POST when callback_url is None"
+    assert callbacks == [], "Should not POST when callback_url is None"
 
 
-@pytest.mark.asyncio
 async def test_callback_failure_does_not_block_task(monkeypatch: pytest.MonkeyPatch) -> None:
     """If callback POST fails, task execution continues to completion."""
-    async def failing_post(self: object, url: str, *, json: dict, **kwargs: object) -> None:
-        raise ConnectionError("webhook down")
+    def webhook_down(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("webhook down", request=request)
 
-    monkeypatch.setattr("httpx.AsyncClient.post", failing_post)
+    _install_transport(monkeypatch, webhook_down)
     _setup_mocks(monkeypatch)
 
     task = _make_task(callback_url="http://localhost:3000/api/tasks/cb-test-003/webhook")
@@ -115,42 +141,21 @@ async def test_callback_failure_does_not_block_task(monkeypatch: pytest.MonkeyPa
     assert state.status.value == "complete"
 
 
-@pytest.mark.asyncio
-async def test_callback_sends_engine_selected_message(monkeypatch: pytest.MonkeyPatch) -> None:
+async def test_callback_sends_engine_selected_message(callbacks: list[dict[str, Any]]) -> None:
     """Callback includes engine selection as a system message."""
-    collected: list[dict] = []
-
-    async def fake_post(self: object, url: str, *, json: dict, **kwargs: object) -> object:
-        collected.append(json)
-        mock_resp = AsyncMock()
-        mock_resp.status_code = 200
-        return mock_resp
-
-    monkeypatch.setattr("httpx.AsyncClient.post", fake_post)
-    _setup_mocks(monkeypatch)
-
     task = _make_task(callback_url="http://localhost:3000/webhook")
     state = TaskState(task=task)
     await _execute_task(state)
 
-    messages = [c for c in collected if c.get("type") == "message"]
+    messages = [c for c in callbacks if c.get("type") == "message"]
     assert len(messages) >= 1
     assert "claude-code" in messages[0]["content"]
 
 
-@pytest.mark.asyncio
-async def test_callback_on_failure(monkeypatch: pytest.MonkeyPatch) -> None:
+async def test_callback_on_failure(
+    monkeypatch: pytest.MonkeyPatch, callbacks: list[dict[str, Any]]
+) -> None:
     """Failed tasks send a 'failed' callback."""
-    collected: list[dict] = []
-
-    async def fake_post(self: object, url: str, *, json: dict, **kwargs: object) -> object:
-        collected.append(json)
-        mock_resp = AsyncMock()
-        mock_resp.status_code = 200
-        return mock_resp
-
-    monkeypatch.setattr("httpx.AsyncClient.post", fake_post)
-
     fake_engine = _setup_mocks(monkeypatch)
     fake_engine.run.return_value = RunnerResult(
         task_id="cb-test-fail",
@@ -166,5 +171,5 @@ async def test_callback_on_failure(monkeypatch: pytest.MonkeyPatch) -> None:
 
     # Terminal callback should be "complete" with failed status (engine returned failure,
     # but task execution itself succeeded)
-    types = [c["type"] for c in collected]
+    types = [c["type"] for c in callbacks]
     assert "complete" in types or "failed" in types
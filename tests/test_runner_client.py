@@ -1,16 +1,21 @@
 """Tests for apps.orchestrator.runner_client — orchestrator → runner bridge."""
 
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock
 
 import httpx
 import pytest
 
+from apps.orchestrator import runner_client
 from apps.orchestrator.models import AgentTask
-from apps.orchestrator.providers import PipelineStage
+from apps.orchestrator.providers import PipelineStage, get_model_for_stage
 from apps.orchestrator.runner_client import RunnerClient, RunnerError
 
 # ── Helpers ──────────────────────────────────────────────────────────────────
 
+# asyncio_mode = "auto" collects the async tests; they share one module-wide event
+# loop since none of them do real I/O or leave tasks behind.
+_module_loop = pytest.mark.asyncio(loop_scope="module")
+
 
 def _make_task(**overrides):
     defaults = {
@@ -21,10 +26,31 @@ def _make_task(**overrides):
     return AgentTask.from_clickup_payload(**defaults)
 
 
-def _mock_response(status_code=200, json_data=None):
+_ACCEPTED = {"task_id": "cu-abc123", "status": "pending"}
+
+# Dummy requests attached to mock responses (raise_for_status needs one); never sent.
+_REQUESTS = {
+    "POST": httpx.Request("POST", "http://localhost:8001/tasks"),
+    "GET": httpx.Request("GET", "http://localhost:8001/tasks"),
+}
+
+
+def _mock_response(status_code=200, json_data=None, method="POST"):
     """Build an httpx.Response with a dummy request (needed for raise_for_status)."""
-    request = httpx.Request("POST", "http://localhost:8001/tasks")
-    return httpx.Response(status_code, json=json_data or {}, request=request)
+    return httpx.Response(status_code, json=json_data or {}, request=_REQUESTS[method])
+
+
+@pytest.fixture
+def mock_client(monkeypatch):
+    """Stand-in for the client yielded by ``async with httpx.AsyncClient(...)``.
+
+    Tests assign ``mock_client.post`` / ``mock_client.get`` for the call under test.
+    """
+    client = AsyncMock(spec=httpx.AsyncClient)
+    client.__aenter__.return_value = client
+    client.__aexit__.return_value = False
+    monkeypatch.setattr(runner_client.httpx, "AsyncClient", lambda *args, **kwargs: client)
+    return client
 
 
 # ── RunnerClient basics ──────────────────────────────────────────────────────
@@ -52,29 +78,22 @@ class TestRunnerClientConfig:
 # ── submit_task ──────────────────────────────────────────────────────────────
 
 
+@_module_loop
 class TestSubmitTask:
     """Tests for RunnerClient.submit_task."""
 
-    @pytest.mark.asyncio
-    async def test_submit_success(self, monkeypatch):
+    async def test_submit_success(self, monkeypatch, mock_client):
         monkeypatch.setenv("GITHUB_REPO", "org/repo")
         monkeypatch.setenv("GITHUB_APP_TOKEN", "ghp_test")
         monkeypatch.delenv("RUNNER_API_KEY", raising=False)
 
-        mock_post = AsyncMock(return_value=_mock_response(
-            202, {"task_id": "cu-abc123", "status": "pending"}
-        ))
+        mock_post = AsyncMock(return_value=_mock_response(202, _ACCEPTED))
 
-        with patch("apps.orchestrator.runner_client.httpx.AsyncClient") as mock_cls:
-            mock_client = AsyncMock()
-            mock_client.post = mock_post
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=False)
-            mock_cls.return_value = mock_client
+        mock_client.post = mock_post
 
-            client = RunnerClient()
-            task = _make_task()
-            result = await client.submit_task(task)
+        client = RunnerClient()
+        task = _make_task()
+        result = await client.submit_task(task)
 
         assert result["task_id"] == "cu-abc123"
         assert result["status"] == "pending"
@@ -88,58 +107,27 @@ class TestSubmitTask:
         assert payload["branch"] == "agent/cu-abc123"
         assert payload["title"] == "Fix login bug"
 
-    @pytest.mark.asyncio
-    async def test_submit_with_api_key(self, monkeypatch):
-        monkeypatch.setenv("GITHUB_REPO", "org/repo")
-        monkeypatch.setenv("GITHUB_APP_TOKEN", "ghp_test")
-        monkeypatch.setenv("RUNNER_API_KEY", "secret-key")
-
-        mock_post = AsyncMock(return_value=_mock_response(
-            202, {"task_id": "cu-abc123", "status": "pending"}
-        ))
-
-        with patch("apps.orchestrator.runner_client.httpx.AsyncClient") as mock_cls:
-            mock_client = AsyncMock()
-            mock_client.post = mock_post
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=False)
-            mock_cls.return_value = mock_client
-
-            client = RunnerClient()
-            task = _make_task()
-            await client.submit_task(task)
-
-        headers = mock_post.call_args.kwargs["headers"]
-        assert headers["Authorization"] == "Bearer secret-key"
-
-    @pytest.mark.asyncio
-    async def test_submit_http_error(self, monkeypatch):
+    async def test_submit_http_error(self, monkeypatch, mock_client):
         monkeypatch.setenv("GITHUB_REPO", "org/repo")
         monkeypatch.setenv("GITHUB_APP_TOKEN", "ghp_test")
 
         error_resp = httpx.Response(
             409,
             json={"detail": "Task already exists"},
-            request=httpx.Request("POST", "http://localhost:8001/tasks"),
+            request=_REQUESTS["POST"],
         )
         mock_post = AsyncMock(side_effect=httpx.HTTPStatusError(
             "409", request=error_resp.request, response=error_resp
         ))
 
-        with patch("apps.orchestrator.runner_client.httpx.AsyncClient") as mock_cls:
-            mock_client = AsyncMock()
-            mock_client.post = mock_post
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=False)
-            mock_cls.return_value = mock_client
+        mock_client.post = mock_post
 
-            client = RunnerClient()
-            task = _make_task()
-            with pytest.raises(RunnerError, match="HTTP 409"):
-                await client.submit_task(task)
+        client = RunnerClient()
+        task = _make_task()
+        with pytest.raises(RunnerError, match="HTTP 409"):
+            await client.submit_task(task)
 
-    @pytest.mark.asyncio
-    async def test_submit_connection_error(self, monkeypatch):
+    async def test_submit_connection_error(self, monkeypatch, mock_client):
         monkeypatch.setenv("GITHUB_REPO", "org/repo")
         monkeypatch.setenv("GITHUB_APP_TOKEN", "ghp_test")
 
@@ -147,72 +135,59 @@ class TestSubmitTask:
             side_effect=httpx.ConnectError("Connection refused")
         )
 
-        with patch("apps.orchestrator.runner_client.httpx.AsyncClient") as mock_cls:
-            mock_client = AsyncMock()
-            mock_client.post = mock_post
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=False)
-            mock_cls.return_value = mock_client
+        mock_client.post = mock_post
 
-            client = RunnerClient()
-            task = _make_task()
-            with pytest.raises(RunnerError, match="unreachable"):
-                await client.submit_task(task)
+        client = RunnerClient()
+        task = _make_task()
+        with pytest.raises(RunnerError, match="unreachable"):
+            await client.submit_task(task)
 
-    @pytest.mark.asyncio
-    async def test_submit_with_stage(self, monkeypatch):
+    @pytest.mark.parametrize(
+        ("env", "submit_kwargs", "sent", "key", "expected"),
+        [
+            pytest.param(
+                {"RUNNER_API_KEY": "secret-key"}, {},
+                "headers", "Authorization", "Bearer secret-key",
+                id="api_key",
+            ),
+            pytest.param(
+                {}, {"stage": PipelineStage.TRIAGE},
+                "json", "model",
+                get_model_for_stage(PipelineStage.TRIAGE, risk_tier=_make_task().risk_tier),
+                id="stage",
+            ),
+            pytest.param(
+                {}, {"github_token": "custom-token"},
+                "json", "github_token", "custom-token",
+                id="custom_token",
+            ),
+        ],
+    )
+    async def test_submit_variants(
+        self, monkeypatch, mock_client, env, submit_kwargs, sent, key, expected
+    ):
+        """Env and call kwargs end up in the request the runner receives."""
         monkeypatch.setenv("GITHUB_REPO", "org/repo")
         monkeypatch.setenv("GITHUB_APP_TOKEN", "ghp_test")
-
-        mock_post = AsyncMock(return_value=_mock_response(
-            202, {"task_id": "cu-abc123", "status": "pending"}
-        ))
-
-        with patch("apps.orchestrator.runner_client.httpx.AsyncClient") as mock_cls:
-            mock_client = AsyncMock()
-            mock_client.post = mock_post
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=False)
-            mock_cls.return_value = mock_client
-
-            client = RunnerClient()
-            task = _make_task()
-            result = await client.submit_task(task, stage=PipelineStage.TRIAGE)
-
-        assert result["task_id"] == "cu-abc123"
-
-    @pytest.mark.asyncio
-    async def test_submit_with_custom_token(self, monkeypatch):
-        monkeypatch.setenv("GITHUB_REPO", "org/repo")
         monkeypatch.delenv("RUNNER_API_KEY", raising=False)
+        for name, value in env.items():
+            monkeypatch.setenv(name, value)
+        mock_client.post = AsyncMock(return_value=_mock_response(202, _ACCEPTED))
 
-        mock_post = AsyncMock(return_value=_mock_response(
-            202, {"task_id": "cu-abc123", "status": "pending"}
-        ))
-
-        with patch("apps.orchestrator.runner_client.httpx.AsyncClient") as mock_cls:
-            mock_client = AsyncMock()
-            mock_client.post = mock_post
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=False)
-            mock_cls.return_value = mock_client
-
-            client = RunnerClient()
-            task = _make_task()
-            await client.submit_task(task, github_token="custom-token")
+        result = await RunnerClient().submit_task(_make_task(), **submit_kwargs)
 
-        payload = mock_post.call_args.kwargs["json"]
-        assert payload["github_token"] == "custom-token"
+        assert result == _ACCEPTED
+        assert mock_client.post.call_args.kwargs[sent][key] == expected
 
 
 # ── get_task_status ──────────────────────────────────────────────────────────
 
 
+@_module_loop
 class TestGetTaskStatus:
     """Tests for RunnerClient.get_task_status."""
 
-    @pytest.mark.asyncio
-    async def test_get_status_success(self, monkeypatch):
+    async def test_get_status_success(self, monkeypatch, mock_client):
         monkeypatch.delenv("RUNNER_API_KEY", raising=False)
 
         mock_get = AsyncMock(return_value=_mock_response(200, {
@@ -220,23 +195,17 @@ class TestGetTaskStatus:
             "status": "complete",
             "engine": "claude-code",
             "cost_usd": 0.15,
-        }))
+        }, method="GET"))
 
-        with patch("apps.orchestrator.runner_client.httpx.AsyncClient") as mock_cls:
-            mock_client = AsyncMock()
-            mock_client.get = mock_get
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=False)
-            mock_cls.return_value = mock_client
+        mock_client.get = mock_get
 
-            client = RunnerClient()
-            result = await client.get_task_status("cu-abc123")
+        client = RunnerClient()
+        result = await client.get_task_status("cu-abc123")
 
         assert result["status"] == "complete"
         assert result["cost_usd"] == 0.15
 
-    @pytest.mark.asyncio
-    async def test_get_status_not_found(self, monkeypatch):
+    async def test_get_status_not_found(self, monkeypatch, mock_client):
         monkeypatch.delenv("RUNNER_API_KEY", raising=False)
 
         error_resp = httpx.Response(
@@ -248,35 +217,24 @@ class TestGetTaskStatus:
             "404", request=error_resp.request, response=error_resp
         ))
 
-        with patch("apps.orchestrator.runner_client.httpx.AsyncClient") as mock_cls:
-            mock_client = AsyncMock()
-            mock_client.get = mock_get
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=False)
-            mock_cls.return_value = mock_client
+        mock_client.get = mock_get
 
-            client = RunnerClient()
-            with pytest.raises(RunnerError, match="HTTP 404"):
-                await client.get_task_status("missing")
+        client = RunnerClient()
+        with pytest.raises(RunnerError, match="HTTP 404"):
+            await client.get_task_status("missing")
 
-    @pytest.mark.asyncio
-    async def test_get_status_with_api_key(self, monkeypatch):
+    async def test_get_status_with_api_key(self, monkeypatch, mock_client):
         monkeypatch.setenv("RUNNER_API_KEY", "my-key")
 
         mock_get = AsyncMock(return_value=_mock_response(200, {
             "task_id": "cu-abc123",
             "status": "running",
-        }))
+        }, method="GET"))
 
-        with patch("apps.orchestrator.runner_client.httpx.AsyncClient") as mock_cls:
-            mock_client = AsyncMock()
-            mock_client.get = mock_get
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=False)
-            mock_cls.return_value = mock_client
+        mock_client.get = mock_get
 
-            client = RunnerClient()
-            await client.get_task_status("cu-abc123")
+        client = RunnerClient()
+        await client.get_task_status("cu-abc123")
 
         headers = mock_get.call_args.kwargs.get("headers", {})
         assert headers.get("Authorization") == "Bearer my-key"
@@ -285,47 +243,30 @@ class TestGetTaskStatus:
 # ── health_check ─────────────────────────────────────────────────────────────
 
 
+@_module_loop
 class TestHealthCheck:
     """Tests for RunnerClient.health_check."""
 
-    @pytest.mark.asyncio
-    async def test_healthy(self):
-        mock_get = AsyncMock(return_value=_mock_response(200, {"status": "ok"}))
+    async def test_healthy(self, mock_client):
+        mock_get = AsyncMock(return_value=_mock_response(200, {"status": "ok"}, method="GET"))
 
-        with patch("apps.orchestrator.runner_client.httpx.AsyncClient") as mock_cls:
-            mock_client = AsyncMock()
-            mock_client.get = mock_get
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=False)
-            mock_cls.return_value = mock_client
+        mock_client.get = mock_get
 
-            client = RunnerClient()
-            assert await client.health_check() is True
+        client = RunnerClient()
+        assert await client.health_check() is True
 
-    @pytest.mark.asyncio
-    async def test_unhealthy_status(self):
-        mock_get = AsyncMock(return_value=_mock_response(503))
+    async def test_unhealthy_status(self, mock_client):
+        mock_get = AsyncMock(return_value=_mock_response(503, method="GET"))
 
-        with patch("apps.orchestrator.runner_client.httpx.AsyncClient") as mock_cls:
-            mock_client = AsyncMock()
-            mock_client.get = mock_get
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=False)
-            mock_cls.return_value = mock_client
+        mock_client.get = mock_get
 
-            client = RunnerClient()
-            assert await client.health_check() is False
+        client = RunnerClient()
+        assert await client.health_check() is False
 
-    @pytest.mark.asyncio
-    async def test_unreachable(self):
+    async def test_unreachable(self, mock_client):
         mock_get = AsyncMock(side_effect=httpx.ConnectError("Connection refused"))
 
-        with patch("apps.orchestrator.runner_client.httpx.AsyncClient") as mock_cls:
-            mock_client = AsyncMock()
-            mock_client.get = mock_get
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=False)
-            mock_cls.return_value = mock_client
+        mock_client.get = mock_get
 
-            client = RunnerClient()
-            assert await client.health_check() is False
+        client = RunnerClient()
+        assert await client.health_check() is False
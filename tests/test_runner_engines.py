@@ -2,10 +2,11 @@
 
 import json
 from pathlib import Path
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock
 
 import pytest
 
+from apps.runner.engines import aider, claude_code
 from apps.runner.engines.aider import AiderAdapter, _parse_aider_cost
 from apps.runner.engines.claude_code import (
     ClaudeCodeAdapter,
@@ -30,12 +31,33 @@ def _make_task(**overrides):
         "branch": "agent/test-1",
         "base_branch": "main",
         "description": "Fix the bug",
+        "workspace_path": Path("/tmp/fake-workspace"),
     }
     defaults.update(overrides)
-    task = RunnerTask(**defaults)
-    # Set workspace_path for engine tests
-    object.__setattr__(task, "workspace_path", Path("/tmp/fake-workspace"))
-    return task
+    return RunnerTask(**defaults)
+
+
+# Successful claude run for tests that only inspect how the CLI was invoked.
+_CLAUDE_OK = SubprocessResult(
+    return_code=0,
+    stdout=json.dumps({"cost_usd": 0.1, "num_turns": 5}),
+    stderr="",
+    duration_ms=10000,
+    timed_out=False,
+)
+
+
+@pytest.fixture
+def mock_run_subproc(monkeypatch):
+    """AsyncMock run_engine_subprocess installed in each adapter module, keyed by module.
+
+    Tests set ``.return_value`` on the entry for the adapter under test.
+    """
+    mocks = {}
+    for module in (claude_code, aider):
+        mocks[module] = AsyncMock()
+        monkeypatch.setattr(module, "run_engine_subprocess", mocks[module])
+    return mocks
 
 
 # ── Protocol conformance ─────────────────────────────────────────────────────
@@ -53,45 +75,27 @@ class TestAgentEngineProtocol:
         assert isinstance(adapter, AgentEngine)
 
 
-class TestClaudeCodeAdapter:
-    """Tests for ClaudeCodeAdapter."""
+# ── Behaviour shared by the subprocess adapters ──────────────────────────────
 
-    def test_name(self):
-        assert ClaudeCodeAdapter().name == "claude-code"
 
-    def test_supported_models(self):
-        models = ClaudeCodeAdapter().supported_models
-        assert "claude-sonnet-4-6" in models
-        assert "claude-opus-4-6" in models
-
-    @pytest.mark.asyncio
-    async def test_run_success(self):
-        task = _make_task()
-        mock_result = SubprocessResult(
-            return_code=0,
-            stdout=json.dumps({"cost_usd": 0.12, "num_turns": 8}),
-            stderr="",
-            duration_ms=30000,
-            timed_out=False,
-        )
+@pytest.fixture(
+    params=[
+        (ClaudeCodeAdapter, claude_code),
+        (AiderAdapter, aider),
+    ],
+    ids=["claude", "aider"],
+)
+def adapter_case(request):
+    """(adapter class, the engine module whose run_engine_subprocess it calls)."""
+    return request.param
 
-        with patch(
-            "apps.runner.engines.claude_code.run_engine_subprocess",
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ):
-            adapter = ClaudeCodeAdapter()
-            result = await adapter.run(task)
 
-        assert result.status == "success"
-        assert result.cost_usd == 0.12
-        assert result.num_turns == 8
-        assert result.duration_ms == 30000
-        assert result.engine == "claude-code"
+class TestSubprocessAdapters:
+    """Failure, timeout, missing-workspace and availability paths common to both adapters."""
 
     @pytest.mark.asyncio
-    async def test_run_failure(self):
-        task = _make_task()
+    async def test_run_failure(self, adapter_case, mock_run_subproc):
+        adapter_cls, adapter_mod = adapter_case
         mock_result = SubprocessResult(
             return_code=1,
             stdout="",
@@ -100,20 +104,16 @@ class TestClaudeCodeAdapter:
             timed_out=False,
         )
 
-        with patch(
-            "apps.runner.engines.claude_code.run_engine_subprocess",
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ):
-            adapter = ClaudeCodeAdapter()
-            result = await adapter.run(task)
+        mock_run_subproc[adapter_mod].return_value = mock_result
+
+        result = await adapter_cls().run(_make_task())
 
         assert result.status == "failure"
         assert "API key invalid" in result.error_message
 
     @pytest.mark.asyncio
-    async def test_run_timeout(self):
-        task = _make_task()
+    async def test_run_timeout(self, adapter_case, mock_run_subproc):
+        adapter_cls, adapter_mod = adapter_case
         mock_result = SubprocessResult(
             return_code=-1,
             stdout="",
@@ -122,18 +122,16 @@ class TestClaudeCodeAdapter:
             timed_out=True,
         )
 
-        with patch(
-            "apps.runner.engines.claude_code.run_engine_subprocess",
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ):
-            adapter = ClaudeCodeAdapter()
-            result = await adapter.run(task)
+        mock_run_subproc[adapter_mod].return_value = mock_result
+
+        result = await adapter_cls().run(_make_task())
 
         assert result.status == "timeout"
+        assert result.duration_ms == 3600000
 
     @pytest.mark.asyncio
-    async def test_run_no_workspace(self):
+    async def test_run_no_workspace(self, adapter_case):
+        adapter_cls, _ = adapter_case
         task = RunnerTask(
             task_id="t1",
             repo_url="https://github.com/org/repo",
@@ -141,139 +139,116 @@ class TestClaudeCodeAdapter:
             base_branch="main",
             description="desc",
         )
-        adapter = ClaudeCodeAdapter()
-        result = await adapter.run(task)
+        result = await adapter_cls().run(task)
         assert result.status == "failure"
         assert "workspace" in result.error_message.lower()
 
+    @pytest.mark.parametrize(
+        ("return_code", "expected"),
+        [(0, True), (127, False)],
+        ids=["found", "not_found"],
+    )
+    @pytest.mark.asyncio
+    async def test_check_available(self, adapter_case, return_code, expected, mock_run_subproc):
+        adapter_cls, adapter_mod = adapter_case
+        mock_result = SubprocessResult(
+            return_code=return_code,
+            stdout="v1.0.0" if return_code == 0 else "",
+            stderr="" if return_code == 0 else "command not found",
+            duration_ms=100,
+            timed_out=False,
+        )
 
-class TestClaudeCodeAdapterEdgeCases:
-    """Additional tests for ClaudeCodeAdapter env var injection and check_available."""
+        mock_run_subproc[adapter_mod].return_value = mock_result
+
+        assert await adapter_cls().check_available() is expected
+
+
+class TestClaudeCodeAdapter:
+    """Tests for ClaudeCodeAdapter."""
+
+    def test_name(self):
+        assert ClaudeCodeAdapter().name == "claude-code"
+
+    def test_supported_models(self):
+        models = ClaudeCodeAdapter().supported_models
+        assert "claude-sonnet-4-6" in models
+        assert "claude-opus-4-6" in models
 
     @pytest.mark.asyncio
-    async def test_run_injects_anthropic_api_key(self, monkeypatch):
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "sk-ant-test")
-        monkeypatch.delenv("ANTHROPIC_BASE_URL", raising=False)
+    async def test_run_success(self, mock_run_subproc):
         task = _make_task()
         mock_result = SubprocessResult(
             return_code=0,
-            stdout=json.dumps({"cost_usd": 0.05, "num_turns": 3}),
+            stdout=json.dumps({"cost_usd": 0.12, "num_turns": 8}),
             stderr="",
-            duration_ms=10000,
+            duration_ms=30000,
             timed_out=False,
         )
 
-        with patch(
-            "apps.runner.engines.claude_code.run_engine_subprocess",
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            adapter = ClaudeCodeAdapter()
-            await adapter.run(task)
+        mock_run_subproc[claude_code].return_value = mock_result
+
+        adapter = ClaudeCodeAdapter()
+        result = await adapter.run(task)
+
+        assert result.status == "success"
+        assert result.cost_usd == 0.12
+        assert result.num_turns == 8
+        assert result.duration_ms == 30000
+        assert result.engine == "claude-code"
+
+
+class TestClaudeCodeAdapterEdgeCases:
+    """Additional tests for ClaudeCodeAdapter env var injection, stdin and default model."""
+
+    @pytest.mark.asyncio
+    async def test_run_injects_anthropic_api_key(self, monkeypatch, mock_run_subproc):
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "sk-ant-test")
+        monkeypatch.delenv("ANTHROPIC_BASE_URL", raising=False)
+        task = _make_task()
+        mock_run = mock_run_subproc[claude_code]
+        mock_run.return_value = _CLAUDE_OK
+
+        adapter = ClaudeCodeAdapter()
+        await adapter.run(task)
 
         env_overrides = mock_run.call_args.kwargs["env_overrides"]
         assert env_overrides["ANTHROPIC_API_KEY"] == "sk-ant-test"
 
     @pytest.mark.asyncio
-    async def test_run_injects_base_url(self, monkeypatch):
+    async def test_run_injects_base_url(self, monkeypatch, mock_run_subproc):
         monkeypatch.setenv("ANTHROPIC_API_KEY", "sk-test")
         monkeypatch.setenv("ANTHROPIC_BASE_URL", "https://openrouter.ai/api")
         task = _make_task()
-        mock_result = SubprocessResult(
-            return_code=0,
-            stdout=json.dumps({"cost_usd": 0.0, "num_turns": 1}),
-            stderr="",
-            duration_ms=5000,
-            timed_out=False,
-        )
+        mock_run = mock_run_subproc[claude_code]
+        mock_run.return_value = _CLAUDE_OK
 
-        with patch(
-            "apps.runner.engines.claude_code.run_engine_subprocess",
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            adapter = ClaudeCodeAdapter()
-            await adapter.run(task)
+        adapter = ClaudeCodeAdapter()
+        await adapter.run(task)
 
         env_overrides = mock_run.call_args.kwargs["env_overrides"]
         assert env_overrides["ANTHROPIC_BASE_URL"] == "https://openrouter.ai/api"
 
     @pytest.mark.asyncio
-    async def test_run_passes_stdin_text(self):
+    async def test_run_passes_stdin_text(self, mock_run_subproc):
         task = _make_task(description="Fix the login form")
-        mock_result = SubprocessResult(
-            return_code=0,
-            stdout=json.dumps({"cost_usd": 0.1, "num_turns": 5}),
-            stderr="",
-            duration_ms=15000,
-            timed_out=False,
-        )
+        mock_run = mock_run_subproc[claude_code]
+        mock_run.return_value = _CLAUDE_OK
 
-        with patch(
-            "apps.runner.engines.claude_code.run_engine_subprocess",
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            adapter = ClaudeCodeAdapter()
-            await adapter.run(task)
+        adapter = ClaudeCodeAdapter()
+        await adapter.run(task)
 
         assert mock_run.call_args.kwargs["stdin_text"] == "Fix the login form"
 
     @pytest.mark.asyncio
-    async def test_check_available_success(self):
-        mock_result = SubprocessResult(
-            return_code=0,
-            stdout="claude-code v1.0.0",
-            stderr="",
-            duration_ms=300,
-            timed_out=False,
-        )
-
-        with patch(
-            "apps.runner.engines.claude_code.run_engine_subprocess",
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ):
-            adapter = ClaudeCodeAdapter()
-            assert await adapter.check_available() is True
-
-    @pytest.mark.asyncio
-    async def test_check_available_not_found(self):
-        mock_result = SubprocessResult(
-            return_code=127,
-            stdout="",
-            stderr="command not found: claude",
-            duration_ms=100,
-            timed_out=False,
-        )
-
-        with patch(
-            "apps.runner.engines.claude_code.run_engine_subprocess",
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ):
-            adapter = ClaudeCodeAdapter()
-            assert await adapter.check_available() is False
-
-    @pytest.mark.asyncio
-    async def test_run_default_model(self):
+    async def test_run_default_model(self, mock_run_subproc):
         """When no model is set, defaults to claude-sonnet-4-6."""
         task = _make_task(model="")
-        mock_result = SubprocessResult(
-            return_code=0,
-            stdout=json.dumps({"cost_usd": 0.1, "num_turns": 5}),
-            stderr="",
-            duration_ms=10000,
-            timed_out=False,
-        )
+        mock_run = mock_run_subproc[claude_code]
+        mock_run.return_value = _CLAUDE_OK
 
-        with patch(
-            "apps.runner.engines.claude_code.run_engine_subprocess",
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            adapter = ClaudeCodeAdapter()
-            result = await adapter.run(task)
+        adapter = ClaudeCodeAdapter()
+        result = await adapter.run(task)
 
         assert result.model == "claude-sonnet-4-6"
         cmd = mock_run.call_args.args[0]
@@ -328,7 +303,7 @@ class TestAiderAdapter:
         assert AiderAdapter().supported_models == ["*"]
 
     @pytest.mark.asyncio
-    async def test_run_success(self):
+    async def test_run_success(self, mock_run_subproc):
         task = _make_task(model="deepseek/deepseek-chat")
         mock_result = SubprocessResult(
             return_code=0,
@@ -338,13 +313,10 @@ class TestAiderAdapter:
             timed_out=False,
         )
 
-        with patch(
-            "apps.runner.engines.aider.run_engine_subprocess",
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ):
-            adapter = AiderAdapter()
-            result = await adapter.run(task)
+        mock_run_subproc[aider].return_value = mock_result
+
+        adapter = AiderAdapter()
+        result = await adapter.run(task)
 
         assert result.status == "success"
         assert result.cost_usd == 0.03
@@ -355,65 +327,7 @@ class TestAiderAdapterEdgeCases:
     """Additional edge-case tests for AiderAdapter."""
 
     @pytest.mark.asyncio
-    async def test_run_failure(self):
-        task = _make_task(model="gpt-4.1")
-        mock_result = SubprocessResult(
-            return_code=1,
-            stdout="",
-            stderr="Error: Model not available",
-            duration_ms=5000,
-            timed_out=False,
-        )
-
-        with patch(
-            "apps.runner.engines.aider.run_engine_subprocess",
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ):
-            adapter = AiderAdapter()
-            result = await adapter.run(task)
-
-        assert result.status == "failure"
-        assert "Model not available" in result.error_message
-
-    @pytest.mark.asyncio
-    async def test_run_timeout(self):
-        task = _make_task(model="deepseek-chat")
-        mock_result = SubprocessResult(
-            return_code=-1,
-            stdout="",
-            stderr="Process killed: timeout exceeded",
-            duration_ms=3600000,
-            timed_out=True,
-        )
-
-        with patch(
-            "apps.runner.engines.aider.run_engine_subprocess",
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ):
-            adapter = AiderAdapter()
-            result = await adapter.run(task)
-
-        assert result.status == "timeout"
-        assert result.duration_ms == 3600000
-
-    @pytest.mark.asyncio
-    async def test_run_no_workspace(self):
-        task = RunnerTask(
-            task_id="t1",
-            repo_url="https://github.com/org/repo",
-            branch="b",
-            base_branch="main",
-            description="desc",
-        )
-        adapter = AiderAdapter()
-        result = await adapter.run(task)
-        assert result.status == "failure"
-        assert "workspace" in result.error_message.lower()
-
-    @pytest.mark.asyncio
-    async def test_run_default_model(self):
+    async def test_run_default_model(self, mock_run_subproc):
         """When no model is set, aider defaults to claude-sonnet-4-6."""
         task = _make_task(model="")
         mock_result = SubprocessResult(
@@ -424,13 +338,11 @@ class TestAiderAdapterEdgeCases:
             timed_out=False,
         )
 
-        with patch(
-            "apps.runner.engines.aider.run_engine_subprocess",
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            adapter = AiderAdapter()
-            result = await adapter.run(task)
+        mock_run = mock_run_subproc[aider]
+        mock_run.return_value = mock_result
+
+        adapter = AiderAdapter()
+        result = await adapter.run(task)
 
         assert result.status == "success"
         # Check the command included the default model
@@ -439,7 +351,7 @@ class TestAiderAdapterEdgeCases:
         assert cmd[model_idx] == "claude-sonnet-4-6"
 
     @pytest.mark.asyncio
-    async def test_run_injects_api_key_for_openai_model(self, monkeypatch):
+    async def test_run_injects_api_key_for_openai_model(self, monkeypatch, mock_run_subproc):
         """GPT models should have OPENAI_API_KEY injected."""
         monkeypatch.setenv("OPENAI_API_KEY", "sk-test-key")
         task = _make_task(model="gpt-4.1-mini")
@@ -451,72 +363,35 @@ class TestAiderAdapterEdgeCases:
             timed_out=False,
         )
 
-        with patch(
-            "apps.runner.engines.aider.run_engine_subprocess",
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ) as mock_run:
-            adapter = AiderAdapter()
-            await adapter.run(task)
+        mock_run = mock_run_subproc[aider]
+        mock_run.return_value = mock_result
+
+        adapter = AiderAdapter()
+        await adapter.run(task)
 
         env_overrides = mock_run.call_args.kwargs["env_overrides"]
         assert env_overrides["OPENAI_API_KEY"] == "sk-test-key"
 
-    @pytest.mark.asyncio
-    async def test_check_available_success(self):
-        mock_result = SubprocessResult(
-            return_code=0,
-            stdout="aider v0.50.0",
-            stderr="",
-            duration_ms=500,
-            timed_out=False,
-        )
-
-        with patch(
-            "apps.runner.engines.aider.run_engine_subprocess",
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ):
-            adapter = AiderAdapter()
-            assert await adapter.check_available() is True
-
-    @pytest.mark.asyncio
-    async def test_check_available_not_found(self):
-        mock_result = SubprocessResult(
-            return_code=127,
-            stdout="",
-            stderr="command not found: aider",
-            duration_ms=100,
-            timed_out=False,
-        )
-
-        with patch(
-            "apps.runner.engines.aider.run_engine_subprocess",
-            new_callable=AsyncMock,
-            return_value=mock_result,
-        ):
-            adapter = AiderAdapter()
-            assert await adapter.check_available() is False
-
 
 class TestParseAiderCost:
     """Tests for aider cost extraction."""
 
-    def test_with_cost(self):
-        assert _parse_aider_cost("Tokens: 12.3k sent. Cost: $0.05") == 0.05
-
-    def test_without_cost(self):
-        assert _parse_aider_cost("Done!") == 0.0
-
-    def test_integer_cost(self):
-        assert _parse_aider_cost("Cost: $2") == 2.0
-
-    def test_empty_string(self):
-        assert _parse_aider_cost("") == 0.0
-
-    def test_multiline_with_cost_on_last_line(self):
-        stdout = "Editing file.py\nApplied changes\nTokens: 5k sent. Cost: $0.12"
-        assert _parse_aider_cost(stdout) == 0.12
+    @pytest.mark.parametrize(
+        ("stdout", "expected"),
+        [
+            pytest.param("Tokens: 12.3k sent. Cost: $0.05", 0.05, id="with_cost"),
+            pytest.param("Done!", 0.0, id="without_cost"),
+            pytest.param("Cost: $2", 2.0, id="integer_cost"),
+            pytest.param("", 0.0, id="empty_string"),
+            pytest.param(
+                "Editing file.py\nApplied changes\nTokens: 5k sent. Cost: $0.12",
+                0.12,
+                id="multiline_with_cost_on_last_line",
+            ),
+        ],
+    )
+    def test_parse(self, stdout, expected):
+        assert _parse_aider_cost(stdout) == expected
 
 
 class TestEngineRegistry:
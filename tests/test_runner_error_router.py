@@ -1,17 +1,14 @@
 """Tests for ErrorRouter integration in the Runner."""
 from __future__ import annotations
 
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock
 
 import pytest
 
+from apps.runner import main
 from apps.runner.main import _execute_task
 from apps.runner.models import RunnerTask, TaskState, TaskStatus
 
-_WS = "apps.runner.main.create_workspace"
-_ROUTER = "apps.runner.main._error_router"
-_CLEANUP = "apps.runner.main.cleanup_workspace"
-
 
 @pytest.fixture
 def runner_task() -> RunnerTask:
@@ -24,75 +21,66 @@ def runner_task() -> RunnerTask:
     )
 
 
+@pytest.fixture
+def mock_ws(monkeypatch: pytest.MonkeyPatch) -> AsyncMock:
+    """Stub workspace setup/cleanup; tests set ``side_effect`` to the failure."""
+    ws = AsyncMock()
+    monkeypatch.setattr(main, "create_workspace", ws)
+    monkeypatch.setattr(main, "cleanup_workspace", AsyncMock())
+    return ws
+
+
+@pytest.fixture
+def mock_handle(monkeypatch: pytest.MonkeyPatch) -> AsyncMock:
+    """Stub ErrorRouter.handle on the runner's router."""
+    handle = AsyncMock()
+    monkeypatch.setattr(main._error_router, "handle", handle)
+    return handle
+
+
 @pytest.fixture
 def task_state(runner_task: RunnerTask) -> TaskState:
     return TaskState(task=runner_task)
 
 
 class TestRunnerErrorRouterIntegration:
-    @pytest.mark.asyncio
     async def test_error_router_called_on_generic_failure(
-        self, task_state: TaskState,
+        self, task_state: TaskState, mock_ws: AsyncMock, mock_handle: AsyncMock,
     ) -> None:
         """When _execute_task hits a generic Exception, ErrorRouter.handle() is called."""
-        mock_handle = AsyncMock()
-        err = RuntimeError("boom")
-
-        with (
-            patch(_WS, new_callable=AsyncMock, side_effect=err),
-            patch(_ROUTER) as mock_router,
-            patch(_CLEANUP, new_callable=AsyncMock),
-        ):
-            mock_router.handle = mock_handle
-            await _execute_task(task_state)
+        mock_ws.side_effect = RuntimeError("boom")
+        await _execute_task(task_state)
 
         assert task_state.status == TaskStatus.FAILED
         mock_handle.assert_called_once()
         args = mock_handle.call_args[0]
         assert isinstance(args[0], RuntimeError)
 
-    @pytest.mark.asyncio
     async def test_error_router_failure_doesnt_crash_task(
-        self, task_state: TaskState,
+        self, task_state: TaskState, mock_ws: AsyncMock, mock_handle: AsyncMock,
     ) -> None:
         """If ErrorRouter.handle() raises, the task still completes as FAILED."""
-        mock_handle = AsyncMock(
-            side_effect=RuntimeError("router broken"),
-        )
-
-        with (
-            patch(_WS, new_callable=AsyncMock, side_effect=ValueError("bad")),
-            patch(_ROUTER) as mock_router,
-            patch(_CLEANUP, new_callable=AsyncMock),
-        ):
-            mock_router.handle = mock_handle
-            await _execute_task(task_state)
+        mock_handle.side_effect = RuntimeError("router broken")
+        mock_ws.side_effect = ValueError("bad")
+        await _execute_task(task_state)
 
         assert task_state.status == TaskStatus.FAILED
         assert "bad" in task_state.result.error_message
 
-    @pytest.mark.asyncio
     async def test_error_router_receives_correct_context(
-        self, task_state: TaskState,
+        self, task_state: TaskState, mock_ws: AsyncMock, mock_handle: AsyncMock,
     ) -> None:
         """ErrorRouter.handle() receives an ErrorContext with correct fields."""
-        mock_handle = AsyncMock()
-        err = RuntimeError("test error")
-
-        with (
-            patch(_WS, new_callable=AsyncMock, side_effect=err),
-            patch(_ROUTER) as mock_router,
-            patch(_CLEANUP, new_callable=AsyncMock),
-        ):
-            mock_router.handle = mock_handle
-            await _execute_task(task_state)
+        mock_ws.side_effect = RuntimeError("test error")
+        await _execute_task(task_state)
 
         ctx = mock_handle.call_args[0][1]
         assert ctx.component == "runner"
         assert ctx.task_id == "test-err-1"
 
-    @pytest.mark.asyncio
-    async def test_error_router_called_on_circuit_open(self) -> None:
+    async def test_error_router_called_on_circuit_open(
+        self, mock_ws: AsyncMock, mock_handle: AsyncMock,
+    ) -> None:
         """When a CircuitOpenError occurs, ErrorRouter.handle() is called."""
         from apps.runner.circuit_breaker import CircuitOpenError
 
@@ -104,24 +92,17 @@ class TestRunnerErrorRouterIntegration:
             description="test task",
         )
         state = TaskState(task=task)
-        mock_handle = AsyncMock()
-        err = CircuitOpenError("claude-code", 30.0)
-
-        with (
-            patch(_WS, new_callable=AsyncMock, side_effect=err),
-            patch(_ROUTER) as mock_router,
-            patch(_CLEANUP, new_callable=AsyncMock),
-        ):
-            mock_router.handle = mock_handle
-            await _execute_task(state)
+        mock_ws.side_effect = CircuitOpenError("claude-code", 30.0)
+        await _execute_task(state)
 
         assert state.status == TaskStatus.FAILED
         mock_handle.assert_called_once()
         exc_arg = mock_handle.call_args[0][0]
         assert isinstance(exc_arg, CircuitOpenError)
 
-    @pytest.mark.asyncio
-    async def test_error_router_called_on_budget_exceeded(self) -> None:
+    async def test_error_router_called_on_budget_exceeded(
+        self, mock_ws: AsyncMock, mock_handle: AsyncMock,
+    ) -> None:
         """When a BudgetExceededError occurs, ErrorRouter.handle() is called."""
         from apps.runner.budget import BudgetExceededError
 
@@ -133,16 +114,8 @@ class TestRunnerErrorRouterIntegration:
             description="test task",
         )
         state = TaskState(task=task)
-        mock_handle = AsyncMock()
-        err = BudgetExceededError(spent=15.0, limit=10.0)
-
-        with (
-            patch(_WS, new_callable=AsyncMock, side_effect=err),
-            patch(_ROUTER) as mock_router,
-            patch(_CLEANUP, new_callable=AsyncMock),
-        ):
-            mock_router.handle = mock_handle
-            await _execute_task(state)
+        mock_ws.side_effect = BudgetExceededError(spent=15.0, limit=10.0)
+        await _execute_task(state)
 
         assert state.status == TaskStatus.FAILED
         mock_handle.assert_called_once()
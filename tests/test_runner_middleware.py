@@ -1,8 +1,11 @@
 """Tests for apps.runner.middleware — API key authentication."""
 
+from unittest.mock import AsyncMock
+
 import pytest
 from fastapi.testclient import TestClient
 
+from apps.runner import main
 from apps.runner.main import _tasks, app
 from apps.runner.models import RunnerTask, TaskState, TaskStatus
 
@@ -15,40 +18,48 @@ def _clear_tasks():
     _tasks.clear()
 
 
-client = TestClient(app)
+@pytest.fixture(scope="module")
+def client():
+    """One TestClient (one portal thread and lifespan) for the whole module.
+
+    The middleware reads RUNNER_API_KEY per request, so tests can keep
+    switching it with monkeypatch while sharing the client.
+    """
+    with TestClient(app) as c:
+        yield c
 
 
 class TestAPIKeyMiddleware:
     """Tests for APIKeyMiddleware."""
 
-    def test_open_mode_no_key_configured(self, monkeypatch):
+    def test_open_mode_no_key_configured(self, client, monkeypatch):
         """When RUNNER_API_KEY is not set, all requests are allowed."""
         monkeypatch.delenv("RUNNER_API_KEY", raising=False)
         resp = client.get("/tasks/nonexistent")
         # Should reach the endpoint (404 = endpoint logic, not auth)
         assert resp.status_code == 404
 
-    def test_health_always_public(self, monkeypatch):
+    def test_health_always_public(self, client, monkeypatch):
         """Health endpoint is accessible even with auth enabled."""
         monkeypatch.setenv("RUNNER_API_KEY", "secret-key-123")
         resp = client.get("/health")
         assert resp.status_code == 200
         assert resp.json()["status"] == "ok"
 
-    def test_docs_always_public(self, monkeypatch):
+    def test_docs_always_public(self, client, monkeypatch):
         """OpenAPI docs are accessible even with auth enabled."""
         monkeypatch.setenv("RUNNER_API_KEY", "secret-key-123")
         resp = client.get("/openapi.json")
         assert resp.status_code == 200
 
-    def test_missing_auth_header_returns_401(self, monkeypatch):
+    def test_missing_auth_header_returns_401(self, client, monkeypatch):
         """Requests without Authorization header get 401."""
         monkeypatch.setenv("RUNNER_API_KEY", "secret-key-123")
         resp = client.get("/tasks/some-id")
         assert resp.status_code == 401
         assert "Missing" in resp.json()["error"]
 
-    def test_invalid_token_returns_401(self, monkeypatch):
+    def test_invalid_token_returns_401(self, client, monkeypatch):
         """Requests with wrong token get 401."""
         monkeypatch.setenv("RUNNER_API_KEY", "secret-key-123")
         resp = client.get(
@@ -58,7 +69,7 @@ class TestAPIKeyMiddleware:
         assert resp.status_code == 401
         assert "Invalid" in resp.json()["error"]
 
-    def test_valid_token_passes_through(self, monkeypatch):
+    def test_valid_token_passes_through(self, client, monkeypatch):
         """Requests with correct token reach the endpoint."""
         monkeypatch.setenv("RUNNER_API_KEY", "secret-key-123")
         # 404 = endpoint reached (no task exists), not auth failure
@@ -68,7 +79,7 @@ class TestAPIKeyMiddleware:
         )
         assert resp.status_code == 404
 
-    def test_non_bearer_scheme_returns_401(self, monkeypatch):
+    def test_non_bearer_scheme_returns_401(self, client, monkeypatch):
         """Non-Bearer auth schemes are rejected."""
         monkeypatch.setenv("RUNNER_API_KEY", "secret-key-123")
         resp = client.get(
@@ -77,7 +88,7 @@ class TestAPIKeyMiddleware:
         )
         assert resp.status_code == 401
 
-    def test_submit_task_requires_auth(self, monkeypatch):
+    def test_submit_task_requires_auth(self, client, monkeypatch):
         """POST /tasks is protected."""
         monkeypatch.setenv("RUNNER_API_KEY", "secret-key-123")
         resp = client.post("/tasks", json={
@@ -88,9 +99,11 @@ class TestAPIKeyMiddleware:
         })
         assert resp.status_code == 401
 
-    def test_submit_task_with_auth(self, monkeypatch):
+    def test_submit_task_with_auth(self, client, monkeypatch):
         """POST /tasks works with valid auth."""
         monkeypatch.setenv("RUNNER_API_KEY", "secret-key-123")
+        # The shared client's loop outlives the request: don't start a real clone
+        monkeypatch.setattr(main, "_execute_task", AsyncMock())
         resp = client.post(
             "/tasks",
             json={
@@ -103,7 +116,7 @@ class TestAPIKeyMiddleware:
         )
         assert resp.status_code == 202
 
-    def test_cancel_requires_auth(self, monkeypatch):
+    def test_cancel_requires_auth(self, client, monkeypatch):
         """POST /tasks/{id}/cancel is protected."""
         monkeypatch.setenv("RUNNER_API_KEY", "secret-key-123")
         task = RunnerTask(
@@ -1,5 +1,8 @@
 """Tests for apps.runner.models — domain types for the Agent Runner."""
 
+from dataclasses import replace
+from pathlib import Path
+
 import pytest
 
 from apps.runner.models import (
@@ -11,6 +14,18 @@ from apps.runner.models import (
 )
 
 
+@pytest.fixture(scope="module")
+def minimal_task():
+    """A valid minimal RunnerTask; frozen, so one instance serves every test."""
+    return RunnerTask(
+        task_id="t1",
+        repo_url="https://github.com/org/repo",
+        branch="b",
+        base_branch="main",
+        description="desc",
+    )
+
+
 class TestRunnerTask:
     """Tests for RunnerTask dataclass."""
 
@@ -28,6 +43,7 @@ class TestRunnerTask:
         assert task.complexity == "standard"
         assert task.max_turns == 40
         assert task.timeout_seconds == 3600
+        assert task.workspace_path is None
 
     def test_create_with_all_fields(self):
         task = RunnerTask(
@@ -51,6 +67,12 @@ class TestRunnerTask:
         assert task.engine == "claude-code"
         assert task.env_vars == {"EXTRA": "val"}
 
+    def test_replace_sets_workspace_path(self, minimal_task):
+        located = replace(minimal_task, workspace_path=Path("/tmp/ws/repo"))
+        assert located.workspace_path == Path("/tmp/ws/repo")
+        assert located.task_id == "t1"
+        assert minimal_task.workspace_path is None
+
     def test_empty_task_id_raises(self):
         with pytest.raises(ValueError, match="task_id is required"):
             RunnerTask(
@@ -81,16 +103,9 @@ class TestRunnerTask:
                 description="",
             )
 
-    def test_frozen(self):
-        task = RunnerTask(
-            task_id="t1",
-            repo_url="https://github.com/org/repo",
-            branch="b",
-            base_branch="main",
-            description="desc",
-        )
+    def test_frozen(self, minimal_task):
         with pytest.raises(AttributeError):
-            task.task_id = "changed"
+            minimal_task.task_id = "changed"
 
 
 class TestRunnerResult:
@@ -140,28 +155,14 @@ class TestRunnerResult:
 class TestTaskState:
     """Tests for TaskState mutable state tracker."""
 
-    def test_initial_state(self):
-        task = RunnerTask(
-            task_id="t1",
-            repo_url="https://github.com/org/repo",
-            branch="b",
-            base_branch="main",
-            description="desc",
-        )
-        state = TaskState(task=task)
+    def test_initial_state(self, minimal_task):
+        state = TaskState(task=minimal_task)
         assert state.status == TaskStatus.PENDING
         assert state.result is None
         assert state.workspace_path is None
 
-    def test_mutable(self):
-        task = RunnerTask(
-            task_id="t1",
-            repo_url="https://github.com/org/repo",
-            branch="b",
-            base_branch="main",
-            description="desc",
-        )
-        state = TaskState(task=task)
+    def test_mutable(self, minimal_task):
+        state = TaskState(task=minimal_task)
         state.status = TaskStatus.RUNNING
         assert state.status == TaskStatus.RUNNING
 
@@ -188,5 +189,8 @@ class TestGenerateTaskId:
         assert len(tid) == 16  # "run-" + 12 hex chars
 
     def test_unique(self):
-        ids = {generate_task_id() for _ in range(100)}
-        assert len(ids) == 100
+        seen = set()
+        for _ in range(100):
+            tid = generate_task_id()
+            assert tid not in seen, f"Duplicate task id {tid}"
+            seen.add(tid)
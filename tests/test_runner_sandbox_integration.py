@@ -8,55 +8,116 @@ directly when ``sandbox_mode`` is False.
 from __future__ import annotations
 
 import json
+from collections.abc import Iterator
 from pathlib import Path
-from unittest.mock import AsyncMock, patch
+from types import ModuleType
+from unittest.mock import AsyncMock
 
 import pytest
+import pytest_asyncio
 
+from apps.runner.engines import aider, claude_code
 from apps.runner.engines.aider import AiderAdapter
 from apps.runner.engines.claude_code import ClaudeCodeAdapter
 from apps.runner.engines.subprocess_util import SubprocessResult
-from apps.runner.models import RunnerTask
+from apps.runner.models import RunnerResult, RunnerTask
 
 # ── Helpers ──────────────────────────────────────────────────────────────────
 
 
+_FAKE_WS = Path("/tmp/fake-workspace")
+
+
+_TASK_DEFAULTS: dict[str, object] = {
+    "task_id": "sandbox-test-1",
+    "repo_url": "https://github.com/org/repo",
+    "branch": "agent/sandbox-test",
+    "base_branch": "main",
+    "description": "Fix the bug in sandbox",
+    "workspace_path": _FAKE_WS,
+}
+
+
 def _make_task(**overrides: object) -> RunnerTask:
     """Create a RunnerTask with workspace_path set for engine tests."""
-    defaults: dict[str, object] = {
-        "task_id": "sandbox-test-1",
-        "repo_url": "https://github.com/org/repo",
-        "branch": "agent/sandbox-test",
-        "base_branch": "main",
-        "description": "Fix the bug in sandbox",
+    return RunnerTask(**{**_TASK_DEFAULTS, **overrides})  # type: ignore[arg-type]
+
+
+def _flag_values(cmd: list[str], flag: str) -> list[str]:
+    """Values following each occurrence of ``flag`` (e.g. every ``-e KEY=VAL``) in cmd."""
+    return [value for arg, value in zip(cmd, cmd[1:], strict=False) if arg == flag]
+
+
+# Standard success subprocess results (SubprocessResult is frozen, so shared).
+_CLAUDE_SUCCESS = SubprocessResult(
+    return_code=0,
+    stdout=json.dumps({"cost_usd": 0.05, "num_turns": 3}),
+    stderr="",
+    duration_ms=10000,
+    timed_out=False,
+)
+_AIDER_SUCCESS = SubprocessResult(
+    return_code=0,
+    stdout="Tokens: 5k sent. Cost: $0.02\nDone!",
+    stderr="",
+    duration_ms=8000,
+    timed_out=False,
+)
+
+
+@pytest.fixture(scope="module")
+def _subproc_mocks() -> Iterator[dict[ModuleType, AsyncMock]]:
+    """One run_engine_subprocess AsyncMock per engine module, kept for the module."""
+    mocks = {
+        claude_code: AsyncMock(return_value=_CLAUDE_SUCCESS),
+        aider: AsyncMock(return_value=_AIDER_SUCCESS),
     }
-    defaults.update(overrides)
-    task = RunnerTask(**defaults)  # type: ignore[arg-type]
-    # RunnerTask is frozen, so we use object.__setattr__ to set workspace_path
-    object.__setattr__(task, "workspace_path", Path("/tmp/fake-workspace"))
-    return task
-
-
-def _success_result() -> SubprocessResult:
-    """Standard success subprocess result."""
-    return SubprocessResult(
-        return_code=0,
-        stdout=json.dumps({"cost_usd": 0.05, "num_turns": 3}),
-        stderr="",
-        duration_ms=10000,
-        timed_out=False,
-    )
-
-
-def _aider_success_result() -> SubprocessResult:
-    """Standard success subprocess result for aider."""
-    return SubprocessResult(
-        return_code=0,
-        stdout="Tokens: 5k sent. Cost: $0.02\nDone!",
-        stderr="",
-        duration_ms=8000,
-        timed_out=False,
-    )
+    with pytest.MonkeyPatch.context() as mp:
+        for module, mock in mocks.items():
+            mp.setattr(module, "run_engine_subprocess", mock)
+        yield mocks
+
+
+@pytest.fixture
+def mock_claude_run(_subproc_mocks: dict[ModuleType, AsyncMock]) -> AsyncMock:
+    """The shared claude_code subprocess mock, with calls from earlier tests cleared."""
+    mock = _subproc_mocks[claude_code]
+    mock.reset_mock()
+    return mock
+
+
+@pytest.fixture
+def mock_aider_run(_subproc_mocks: dict[ModuleType, AsyncMock]) -> AsyncMock:
+    """The shared aider subprocess mock, with calls from earlier tests cleared."""
+    mock = _subproc_mocks[aider]
+    mock.reset_mock()
+    return mock
+
+
+# (docker cmd, run_engine_subprocess kwargs, adapter result) of one sandboxed run.
+_SandboxRun = tuple[list[str], dict[str, object], RunnerResult]
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def claude_sandbox_run(
+    _subproc_mocks: dict[ModuleType, AsyncMock],
+) -> _SandboxRun:
+    """Run ClaudeCodeAdapter once on the default sandbox task for the module's tests."""
+    mock = _subproc_mocks[claude_code]
+    mock.reset_mock()
+    result = await ClaudeCodeAdapter().run(_make_task(sandbox_mode=True))
+    return mock.call_args.args[0], mock.call_args.kwargs, result
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def aider_sandbox_run(
+    _subproc_mocks: dict[ModuleType, AsyncMock],
+) -> _SandboxRun:
+    """Run AiderAdapter once on the default sandbox task for the module's tests."""
+    mock = _subproc_mocks[aider]
+    mock.reset_mock()
+    result = await AiderAdapter().run(_make_task(sandbox_mode=True))
+    return mock.call_args.args[0], mock.call_args.kwargs, result
 
 
 # ── ClaudeCodeAdapter sandbox integration ────────────────────────────────────
@@ -66,36 +127,20 @@ class TestClaudeCodeSandboxIntegration:
     """Verify ClaudeCodeAdapter wraps commands with Docker when sandbox_mode=True."""
 
     @pytest.mark.asyncio
-    async def test_sandbox_disabled_passes_cmd_directly(self) -> None:
+    async def test_sandbox_disabled_passes_cmd_directly(self, mock_claude_run: AsyncMock) -> None:
         """When sandbox_mode=False, cmd should NOT be wrapped in Docker."""
         task = _make_task(sandbox_mode=False)
 
-        with patch(
-            "apps.runner.engines.claude_code.run_engine_subprocess",
-            new_callable=AsyncMock,
-            return_value=_success_result(),
-        ) as mock_run:
-            adapter = ClaudeCodeAdapter()
-            await adapter.run(task)
+        adapter = ClaudeCodeAdapter()
+        await adapter.run(task)
 
-        cmd = mock_run.call_args.args[0]
+        cmd = mock_claude_run.call_args.args[0]
         assert cmd[0] == "claude", "Command should start with 'claude', not 'docker'"
         assert "docker" not in cmd
 
-    @pytest.mark.asyncio
-    async def test_sandbox_enabled_wraps_with_docker(self) -> None:
+    def test_sandbox_enabled_wraps_with_docker(self, claude_sandbox_run: _SandboxRun) -> None:
         """When sandbox_mode=True, cmd should be wrapped in Docker."""
-        task = _make_task(sandbox_mode=True)
-
-        with patch(
-            "apps.runner.engines.claude_code.run_engine_subprocess",
-            new_callable=AsyncMock,
-            return_value=_success_result(),
-        ) as mock_run:
-            adapter = ClaudeCodeAdapter()
-            await adapter.run(task)
-
-        cmd = mock_run.call_args.args[0]
+        cmd, _, _ = claude_sandbox_run
         assert cmd[0] == "docker", "Command should start with 'docker'"
         assert "run" in cmd
         assert "--rm" in cmd
@@ -104,115 +149,60 @@ class TestClaudeCodeSandboxIntegration:
         assert "--print" in cmd
 
     @pytest.mark.asyncio
-    async def test_sandbox_uses_task_image(self) -> None:
+    async def test_sandbox_uses_task_image(self, mock_claude_run: AsyncMock) -> None:
         """Custom sandbox_image from task should be used in Docker command."""
         custom_image = "custom/sandbox:v2"
         task = _make_task(sandbox_mode=True, sandbox_image=custom_image)
 
-        with patch(
-            "apps.runner.engines.claude_code.run_engine_subprocess",
-            new_callable=AsyncMock,
-            return_value=_success_result(),
-        ) as mock_run:
-            adapter = ClaudeCodeAdapter()
-            await adapter.run(task)
+        adapter = ClaudeCodeAdapter()
+        await adapter.run(task)
 
-        cmd = mock_run.call_args.args[0]
+        cmd = mock_claude_run.call_args.args[0]
         assert custom_image in cmd, f"Custom image '{custom_image}' not found in cmd"
 
-    @pytest.mark.asyncio
-    async def test_sandbox_mounts_workspace(self) -> None:
+    def test_sandbox_mounts_workspace(self, claude_sandbox_run: _SandboxRun) -> None:
         """Docker command should mount the workspace directory."""
-        task = _make_task(sandbox_mode=True)
-
-        with patch(
-            "apps.runner.engines.claude_code.run_engine_subprocess",
-            new_callable=AsyncMock,
-            return_value=_success_result(),
-        ) as mock_run:
-            adapter = ClaudeCodeAdapter()
-            await adapter.run(task)
-
-        cmd = mock_run.call_args.args[0]
-        v_idx = cmd.index("-v")
-        mount_arg = cmd[v_idx + 1]
-        assert "/tmp/fake-workspace" in mount_arg
+        cmd, _, _ = claude_sandbox_run
+        mount_arg = _flag_values(cmd, "-v")[0]
+        assert str(_FAKE_WS) in mount_arg
         assert ":/workspace" in mount_arg
 
     @pytest.mark.asyncio
-    async def test_sandbox_passes_env_vars(self, monkeypatch: pytest.MonkeyPatch) -> None:
+    async def test_sandbox_passes_env_vars(
+        self, mock_claude_run: AsyncMock, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """Environment variables should be passed as -e flags in Docker cmd."""
         monkeypatch.setenv("ANTHROPIC_API_KEY", "sk-ant-sandbox-test")
         monkeypatch.delenv("ANTHROPIC_BASE_URL", raising=False)
         task = _make_task(sandbox_mode=True)
 
-        with patch(
-            "apps.runner.engines.claude_code.run_engine_subprocess",
-            new_callable=AsyncMock,
-            return_value=_success_result(),
-        ) as mock_run:
-            adapter = ClaudeCodeAdapter()
-            await adapter.run(task)
-
-        cmd = mock_run.call_args.args[0]
-        # Find all -e flags
-        env_flags = []
-        for i, arg in enumerate(cmd):
-            if arg == "-e" and i + 1 < len(cmd):
-                env_flags.append(cmd[i + 1])
+        adapter = ClaudeCodeAdapter()
+        await adapter.run(task)
+
+        cmd = mock_claude_run.call_args.args[0]
+        env_flags = _flag_values(cmd, "-e")
 
         # At least the API key should be passed via -e
         api_key_flags = [f for f in env_flags if f.startswith("ANTHROPIC_API_KEY=")]
         assert len(api_key_flags) == 1, "ANTHROPIC_API_KEY should be passed via -e"
         assert api_key_flags[0] == "ANTHROPIC_API_KEY=sk-ant-sandbox-test"
 
-    @pytest.mark.asyncio
-    async def test_sandbox_cwd_remains_host_path(self) -> None:
+    def test_sandbox_cwd_remains_host_path(self, claude_sandbox_run: _SandboxRun) -> None:
         """Even in sandbox mode, subprocess cwd should be the host workspace path."""
-        task = _make_task(sandbox_mode=True)
+        _, kwargs, _ = claude_sandbox_run
+        cwd = kwargs["cwd"]
+        assert cwd == _FAKE_WS
 
-        with patch(
-            "apps.runner.engines.claude_code.run_engine_subprocess",
-            new_callable=AsyncMock,
-            return_value=_success_result(),
-        ) as mock_run:
-            adapter = ClaudeCodeAdapter()
-            await adapter.run(task)
-
-        cwd = mock_run.call_args.kwargs["cwd"]
-        assert cwd == Path("/tmp/fake-workspace")
-
-    @pytest.mark.asyncio
-    async def test_sandbox_result_still_parsed(self) -> None:
+    def test_sandbox_result_still_parsed(self, claude_sandbox_run: _SandboxRun) -> None:
         """Even with sandbox wrapping, the result should be parsed correctly."""
-        task = _make_task(sandbox_mode=True)
-
-        with patch(
-            "apps.runner.engines.claude_code.run_engine_subprocess",
-            new_callable=AsyncMock,
-            return_value=_success_result(),
-        ):
-            adapter = ClaudeCodeAdapter()
-            result = await adapter.run(task)
-
+        _, _, result = claude_sandbox_run
         assert result.status == "success"
         assert result.cost_usd == 0.05
         assert result.num_turns == 3
 
-    @pytest.mark.asyncio
-    async def test_sandbox_network_isolation(self) -> None:
+    def test_sandbox_network_isolation(self, claude_sandbox_run: _SandboxRun) -> None:
         """Docker command should include network=none for isolation."""
-        task = _make_task(sandbox_mode=True)
-
-        with patch(
-            "apps.runner.engines.claude_code.run_engine_subprocess",
-            new_callable=AsyncMock,
-            return_value=_success_result(),
-        ) as mock_run:
-            adapter = ClaudeCodeAdapter()
-            await adapter.run(task)
-
-        cmd = mock_run.call_args.args[0]
+        cmd, _, _ = claude_sandbox_run
         assert "--network=none" in cmd
 
 
@@ -223,36 +213,20 @@ class TestAiderSandboxIntegration:
     """Verify AiderAdapter wraps commands with Docker when sandbox_mode=True."""
 
     @pytest.mark.asyncio
-    async def test_sandbox_disabled_passes_cmd_directly(self) -> None:
+    async def test_sandbox_disabled_passes_cmd_directly(self, mock_aider_run: AsyncMock) -> None:
         """When sandbox_mode=False, cmd should NOT be wrapped in Docker."""
         task = _make_task(sandbox_mode=False)
 
-        with patch(
-            "apps.runner.engines.aider.run_engine_subprocess",
-            new_callable=AsyncMock,
-            return_value=_aider_success_result(),
-        ) as mock_run:
-            adapter = AiderAdapter()
-            await adapter.run(task)
+        adapter = AiderAdapter()
+        await adapter.run(task)
 
-        cmd = mock_run.call_args.args[0]
+        cmd = mock_aider_run.call_args.args[0]
         assert cmd[0] == "aider", "Command should start with 'aider', not 'docker'"
         assert "docker" not in cmd
 
-    @pytest.mark.asyncio
-    async def test_sandbox_enabled_wraps_with_docker(self) -> None:
+    def test_sandbox_enabled_wraps_with_docker(self, aider_sandbox_run: _SandboxRun) -> None:
         """When sandbox_mode=True, cmd should be wrapped in Docker."""
-        task = _make_task(sandbox_mode=True)
-
-        with patch(
-            "apps.runner.engines.aider.run_engine_subprocess",
-            new_callable=AsyncMock,
-            return_value=_aider_success_result(),
-        ) as mock_run:
-            adapter = AiderAdapter()
-            await adapter.run(task)
-
-        cmd = mock_run.call_args.args[0]
+        cmd, _, _ = aider_sandbox_run
         assert cmd[0] == "docker", "Command should start with 'docker'"
         assert "run" in cmd
         assert "--rm" in cmd
@@ -261,43 +235,28 @@ class TestAiderSandboxIntegration:
         assert "--yes-always" in cmd
 
     @pytest.mark.asyncio
-    async def test_sandbox_uses_task_image(self) -> None:
+    async def test_sandbox_uses_task_image(self, mock_aider_run: AsyncMock) -> None:
         """Custom sandbox_image from task should be used in Docker command."""
         custom_image = "lailatov/sandbox:aider-custom"
         task = _make_task(sandbox_mode=True, sandbox_image=custom_image)
 
-        with patch(
-            "apps.runner.engines.aider.run_engine_subprocess",
-            new_callable=AsyncMock,
-            return_value=_aider_success_result(),
-        ) as mock_run:
-            adapter = AiderAdapter()
-            await adapter.run(task)
+        adapter = AiderAdapter()
+        await adapter.run(task)
 
-        cmd = mock_run.call_args.args[0]
+        cmd = mock_aider_run.call_args.args[0]
         assert custom_image in cmd, f"Custom image '{custom_image}' not found in cmd"
 
-    @pytest.mark.asyncio
-    async def test_sandbox_mounts_workspace(self) -> None:
+    def test_sandbox_mounts_workspace(self, aider_sandbox_run: _SandboxRun) -> None:
         """Docker command should mount the workspace directory."""
-        task = _make_task(sandbox_mode=True)
-
-        with patch(
-            "apps.runner.engines.aider.run_engine_subprocess",
-            new_callable=AsyncMock,
-            return_value=_aider_success_result(),
-        ) as mock_run:
-            adapter = AiderAdapter()
-            await adapter.run(task)
-
-        cmd = mock_run.call_args.args[0]
-        v_idx = cmd.index("-v")
-        mount_arg = cmd[v_idx + 1]
-        assert "/tmp/fake-workspace" in mount_arg
+        cmd, _, _ = aider_sandbox_run
+        mount_arg = _flag_values(cmd, "-v")[0]
+        assert str(_FAKE_WS) in mount_arg
         assert ":/workspace" in mount_arg
 
     @pytest.mark.asyncio
-    async def test_sandbox_passes_env_vars(self, monkeypatch: pytest.MonkeyPatch) -> None:
+    async def test_sandbox_passes_env_vars(
+        self, mock_aider_run: AsyncMock, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """Task env_vars should be passed as -e flags in Docker cmd."""
         monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
         monkeypatch.setenv("OPENAI_API_KEY", "sk-openai-sandbox")
@@ -307,20 +266,11 @@ class TestAiderSandboxIntegration:
             env_vars={"CUSTOM_VAR": "custom_value"},
         )
 
-        with patch(
-            "apps.runner.engines.aider.run_engine_subprocess",
-            new_callable=AsyncMock,
-            return_value=_aider_success_result(),
-        ) as mock_run:
-            adapter = AiderAdapter()
-            await adapter.run(task)
-
-        cmd = mock_run.call_args.args[0]
-        # Find all -e flags
-        env_flags = []
-        for i, arg in enumerate(cmd):
-            if arg == "-e" and i + 1 < len(cmd):
-                env_flags.append(cmd[i + 1])
+        adapter = AiderAdapter()
+        await adapter.run(task)
+
+        cmd = mock_aider_run.call_args.args[0]
+        env_flags = _flag_values(cmd, "-e")
 
         # Custom env var should be present
         custom_flags = [f for f in env_flags if f.startswith("CUSTOM_VAR=")]
@@ -331,51 +281,19 @@ class TestAiderSandboxIntegration:
         api_flags = [f for f in env_flags if f.startswith("OPENAI_API_KEY=")]
         assert len(api_flags) == 1
 
-    @pytest.mark.asyncio
-    async def test_sandbox_cwd_remains_host_path(self) -> None:
+    def test_sandbox_cwd_remains_host_path(self, aider_sandbox_run: _SandboxRun) -> None:
         """Even in sandbox mode, subprocess cwd should be the host workspace path."""
-        task = _make_task(sandbox_mode=True)
-
-        with patch(
-            "apps.runner.engines.aider.run_engine_subprocess",
-            new_callable=AsyncMock,
-            return_value=_aider_success_result(),
-        ) as mock_run:
-            adapter = AiderAdapter()
-            await adapter.run(task)
+        _, kwargs, _ = aider_sandbox_run
+        cwd = kwargs["cwd"]
+        assert cwd == _FAKE_WS
 
-        cwd = mock_run.call_args.kwargs["cwd"]
-        assert cwd == Path("/tmp/fake-workspace")
-
-    @pytest.mark.asyncio
-    async def test_sandbox_result_still_parsed(self) -> None:
+    def test_sandbox_result_still_parsed(self, aider_sandbox_run: _SandboxRun) -> None:
         """Even with sandbox wrapping, the result should be parsed correctly."""
-        task = _make_task(sandbox_mode=True)
-
-        with patch(
-            "apps.runner.engines.aider.run_engine_subprocess",
-            new_callable=AsyncMock,
-            return_value=_aider_success_result(),
-        ):
-            adapter = AiderAdapter()
-            result = await adapter.run(task)
-
+        _, _, result = aider_sandbox_run
         assert result.status == "success"
         assert result.cost_usd == 0.02
 
-    @pytest.mark.asyncio
-    async def test_sandbox_default_image(self) -> None:
+    def test_sandbox_default_image(self, aider_sandbox_run: _SandboxRun) -> None:
         """Default sandbox_image should be 'lailatov/sandbox:python'."""
-        task = _make_task(sandbox_mode=True)
-        # Not specifying sandbox_image, so it uses the default
-
-        with patch(
-            "apps.runner.engines.aider.run_engine_subprocess",
-            new_callable=AsyncMock,
-            return_value=_aider_success_result(),
-        ) as mock_run:
-            adapter = AiderAdapter()
-            await adapter.run(task)
-
-        cmd = mock_run.call_args.args[0]
+        cmd, _, _ = aider_sandbox_run
         assert "lailatov/sandbox:python" in cmd